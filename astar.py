@@ -2,11 +2,18 @@
 astar.py - Implémentation de la recherche A* (A-Star)
 A* utilise une file de priorité et une heuristique (distance de Manhattan)
 pour trouver le chemin le plus court de manière efficace.
+La boucle est celle du moteur commun (coeur.py), avec un tas ou une file à seaux.
 """
 
 import time
 import heapq
 
+from maze import en_compact
+from reperes import heuristique_alt
+from etapes import Recherche, resoudre_instrumente
+from coeur import parcourir
+from rendu import afficher_exploration, afficher_solution, afficher_chemin
+
 
 def heuristique_manhattan(position, arrivee):
     """
@@ -21,7 +28,14 @@ def heuristique_manhattan(position, arrivee):
     return abs(position[0] - arrivee[0]) + abs(position[1] - arrivee[1])
 
 
-def astar(labyrinthe):
+# Frontières disponibles pour astar
+FRONTIERES = ('tas', 'seaux')
+
+# Heuristiques prédéfinies pour astar (une fabrique peut aussi être donnée)
+HEURISTIQUES = ('manhattan', 'alt')
+
+
+def astar(labyrinthe, frontiere='tas', heuristique='manhattan', instrumentation=False):
     """
     Recherche A* dans le labyrinthe.
     
@@ -32,118 +46,225 @@ def astar(labyrinthe):
     - h(n) : estimation du coût restant (distance de Manhattan)
     - f(n) : coût total estimé
     
+    Deux frontières (files de priorité) sont possibles :
+    - 'tas' (par défaut) : heapq, égalités départagées par ordre d'arrivée
+    - 'seaux' : file à seaux de Dial indexée par f, en O(1) par opération,
+      égalités départagées en faveur du plus grand g (voir coeur._parcours_seaux)
+    Les deux trouvent un chemin de même longueur (optimal).
+    
+    L'heuristique est au choix :
+    - 'manhattan' (par défaut) : calculée directement sur les indices plats
+    - 'alt' : bornes par repères (voir reperes.py), en cache par labyrinthe
+    - une fabrique laby -> h, où h(indice) estime la distance jusqu'à
+      laby.arrivee ; elle doit être cohérente pour garder un chemin optimal
+    La file à seaux suppose la distance de Manhattan (voir coeur._parcours_seaux).
+    
     Args:
-        labyrinthe: Matrice 2D représentant le labyrinthe
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute (liste de listes)
+        frontiere: 'tas' ou 'seaux'
+        heuristique: 'manhattan', 'alt' ou une fabrique laby -> h
+        instrumentation: Si vrai, ajoute 'instrumentation' au résultat (voir
+            dfs.py) ; 'retraits_perimes' compte les entrées déjà visitées
     
     Returns:
         Un dictionnaire contenant les résultats (comme dfs.py et bfs.py)
     """
-    taille = len(labyrinthe)
-
-    # Trouver les positions de S (départ) et G (arrivée)
-    depart = None
-    arrivee = None
-    for i in range(taille):
-        for j in range(taille):
-            if labyrinthe[i][j] == 'S':
-                depart = (i, j)
-            elif labyrinthe[i][j] == 'G':
-                arrivee = (i, j)
-
-    debut_temps = time.time()
-
-    # File de priorité : (f_score, compteur, position, chemin)
-    # Le compteur sert à départager les cas où f_score est identique
-    compteur = 0
-    file_priorite = [(heuristique_manhattan(depart, arrivee), compteur, depart, [depart])]
+    if instrumentation:
+        return resoudre_instrumente(lambda debut: astar_etapes(labyrinthe, frontiere, heuristique, debut))
 
-    # Ensemble des cases déjà visitées
-    visites = set()
+    # Le chronomètre couvre aussi la préparation (voir dfs.py)
+    debut_temps = time.perf_counter()
+    return astar_etapes(labyrinthe, frontiere, heuristique, debut_temps).resultat()
+
+
+def astar_etapes(labyrinthe, frontiere='tas', heuristique='manhattan', debut_temps=None):
+    """
+    A* pas à pas : une Recherche (voir etapes.py) à avancer par budgets.
+    
+    Args:
+        labyrinthe, frontiere, heuristique: comme pour astar
+        debut_temps: perf_counter() à compter dans 'temps' (None = maintenant)
+    """
+    if frontiere not in FRONTIERES:
+        raise ValueError(f"Frontière inconnue : {frontiere!r} (choix : {', '.join(FRONTIERES)})")
+    if isinstance(heuristique, str) and heuristique not in HEURISTIQUES:
+        raise ValueError(f"Heuristique inconnue : {heuristique!r} (choix : {', '.join(HEURISTIQUES)})")
+    if frontiere == 'seaux' and heuristique != 'manhattan':
+        raise ValueError("La frontière 'seaux' n'accepte que l'heuristique 'manhattan'")
+    if debut_temps is None:
+        debut_temps = time.perf_counter()
+
+    # Version compacte : indices plats, voisins = position + delta
+    laby = en_compact(labyrinthe)
+    if frontiere == 'seaux':
+        return Recherche(laby, parcourir(laby, 'seaux'), debut_temps)
+    if heuristique == 'manhattan':
+        h = None
+    elif heuristique == 'alt':
+        h = heuristique_alt(labyrinthe)(laby)
+    else:
+        h = heuristique(laby)
+    return Recherche(laby, parcourir(laby, 'tas', h), debut_temps)
 
-    # Ensemble de toutes les cases explorées (pour la visualisation)
-    explores = set()
 
-    # Les 4 directions : droite, bas, gauche, haut
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+def astar_jps(labyrinthe):
+    """
+    A* avec Jump Point Search (JPS) pour une grille 4-connexe.
+    
+    Au lieu de mettre chaque case dans la file de priorité, on « saute » en
+    ligne droite et on ne pousse que les points de saut :
+    - un saut horizontal s'arrête sur G ou sur une case dont un voisin du
+      dessus ou du dessous est libre alors que la case précédente en était
+      bloquée (voisin forcé : on ne peut tourner qu'ici) ;
+    - un saut vertical s'arrête sur G ou sur une case d'où un saut
+      horizontal (à droite ou à gauche) trouve un point de saut.
+    Un chemin optimal peut toujours tourner le plus tôt possible vers le
+    haut ou le bas : ces règles gardent donc un plus court chemin. Chaque
+    point de saut sorti de la file est développé dans les 4 directions, et
+    le coût d'un saut est sa longueur en pas.
+    
+    Dans les longs couloirs et les zones ouvertes, la file ne contient
+    plus que quelques points de saut au lieu de chaque case.
+    
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute (liste de listes)
+    
+    Returns:
+        Un dictionnaire contenant les résultats (comme astar), avec :
+        - 'chemin': le chemin complet case par case (afficher_solution marche)
+        - 'explores': toutes les cases parcourues par les sauts
+        - 'points_de_saut': nombre de points de saut développés
+        - 'operations_tas': nombre d'ajouts et de retraits dans le tas
+        - 'operations_evitees_estimees': estimation (calculée, pas mesurée
+          contre astar) des opérations de tas évitées : un ajout et un
+          retrait pour chaque case parcourue par un saut sans jamais entrer
+          dans la file. astar ne fait pas exactement ces opérations (ses
+          entrées périmées, les cases jamais atteintes) : pour une mesure,
+          comparer 'operations_tas' à 'ajouts' + 'retraits' de
+          astar(labyrinthe, instrumentation=True)
+    """
+    debut_temps = time.perf_counter()
+
+    laby = en_compact(labyrinthe)
+    depart = laby.depart
+    arrivee = laby.arrivee
+    cases = laby.cases
+    largeur = laby.largeur
+    ligne_arrivee, colonne_arrivee = divmod(arrivee, largeur)
+
+    # Cases parcourues par les sauts (pour la visualisation)
+    vues = bytearray(len(cases))
+    explores = []
+    explorer = explores.append
+
+    def sauter_horizontal(position, dx):
+        """Point de saut atteint en allant de dx en dx (-1 si bloqué)."""
+        while True:
+            position += dx
+            if cases[position]:
+                return -1
+            if not vues[position]:
+                vues[position] = 1
+                explorer(position)
+            if position == arrivee:
+                return position
+            # Voisin forcé au-dessus ou en dessous
+            if ((not cases[position - largeur] and cases[position - largeur - dx]) or
+                    (not cases[position + largeur] and cases[position + largeur - dx])):
+                return position
+
+    def sauter_vertical(position, dy):
+        """Point de saut atteint en allant de dy en dy (-1 si bloqué)."""
+        while True:
+            position += dy
+            if cases[position]:
+                return -1
+            if not vues[position]:
+                vues[position] = 1
+                explorer(position)
+            if position == arrivee:
+                return position
+            if sauter_horizontal(position, 1) >= 0 or sauter_horizontal(position, -1) >= 0:
+                return position
+
+    # Sauts dans les 4 directions : (direction, fonction, pas par case)
+    sauts = ((1, sauter_horizontal, 1), (largeur, sauter_vertical, largeur),
+             (-1, sauter_horizontal, 1), (-largeur, sauter_vertical, largeur))
+
+    g = laby.tableau_indices(-1)  # -1 = point de saut encore inconnu
+    fermes = bytearray(len(cases))
+    parents = laby.tableau_indices()
+    g[depart] = 0
+    vues[depart] = 1
+    explorer(depart)
+
+    # File de priorité : (f_score, compteur, position, parent)
+    compteur = 0
+    file_priorite = [(heuristique_manhattan(divmod(depart, largeur), (ligne_arrivee, colonne_arrivee)),
+                      compteur, depart, depart)]
+    pousser = heapq.heappush
+    extraire = heapq.heappop
+    ajouts = 1
+    retraits = 0
+    points_de_saut = 0
+    trouve = False
 
     while file_priorite:
-        # Extraire la case avec le plus petit f(n)
-        f_score, _, position, chemin = heapq.heappop(file_priorite)
-        
-        # Si déjà visité, on passe (on a peut-être trouvé un meilleur chemin entre-temps)
-        if position in visites:
+        _, _, position, parent = extraire(file_priorite)
+        retraits += 1
+        if fermes[position]:
             continue
-            
-        visites.add(position)
-        explores.add(position)
+        fermes[position] = 1
+        parents[position] = parent
+        points_de_saut += 1
 
-        # g(n) = longueur du chemin actuel depuis le départ
-        g_score = len(chemin) - 1
-
-        # Si on a trouvé l'arrivée
         if position == arrivee:
-            fin_temps = time.time()
-            return {
-                'chemin': chemin,
-                'explores': explores,
-                'noeuds_explores': len(explores),
-                'longueur': len(chemin),
-                'temps': (fin_temps - debut_temps) * 1000
-            }
-
-        # Explorer les voisins
-        for delta_ligne, delta_colonne in directions:
-            voisin = (position[0] + delta_ligne, position[1] + delta_colonne)
-
-            if (0 <= voisin[0] < taille and
-                    0 <= voisin[1] < taille and
-                    labyrinthe[voisin[0]][voisin[1]] != '#' and
-                    voisin not in visites):
-
-                # g(voisin) = g(position) + 1 (coût d'un pas)
-                nouveau_g = g_score + 1
-                # h(voisin) = distance de Manhattan jusqu'à l'arrivée
-                h = heuristique_manhattan(voisin, arrivee)
-                # f(voisin) = g + h
-                nouveau_f = nouveau_g + h
-
+            trouve = True
+            break
+
+        g_score = g[position]
+        for direction, sauter, pas in sauts:
+            point = sauter(position, direction)
+            if point < 0 or fermes[point]:
+                continue
+            nouveau_g = g_score + abs(point - position) // pas
+            if g[point] < 0 or nouveau_g < g[point]:
+                g[point] = nouveau_g
+                h = abs(point // largeur - ligne_arrivee) + abs(point % largeur - colonne_arrivee)
                 compteur += 1
-                heapq.heappush(file_priorite, (nouveau_f, compteur, voisin, chemin + [voisin]))
-
-    return None
-
-
-def afficher_exploration(labyrinthe, explores):
-    """Affiche le labyrinthe avec les cases explorées marquées 'p'."""
-    copie = [ligne[:] for ligne in labyrinthe]
-    for (ligne, colonne) in explores:
-        if copie[ligne][colonne] == '.':
-            copie[ligne][colonne] = 'p'
-    for ligne in copie:
-        print(' '.join(ligne))
-
-
-def afficher_solution(labyrinthe, chemin):
-    """Affiche le labyrinthe avec le chemin solution marqué '*'."""
-    copie = [ligne[:] for ligne in labyrinthe]
-    for (ligne, colonne) in chemin:
-        if copie[ligne][colonne] == '.':
-            copie[ligne][colonne] = '*'
-    for ligne in copie:
-        print(' '.join(ligne))
-
-
-def afficher_chemin(chemin):
-    """Affiche le chemin sous forme de coordonnées."""
-    parties = []
-    for i, (ligne, colonne) in enumerate(chemin):
-        if i == 0:
-            parties.append(f"S ({ligne},{colonne})")
-        elif i == len(chemin) - 1:
-            parties.append(f"G ({ligne},{colonne})")
+                ajouts += 1
+                pousser(file_priorite, (nouveau_g + h, compteur, point, position))
+
+    if not trouve:
+        return None
+
+    # Reconstruction : on remonte les points de saut et on remplit chaque
+    # segment (toujours en ligne droite) case par case
+    indices = [arrivee]
+    position = arrivee
+    while position != depart:
+        parent = parents[position]
+        if position // largeur == parent // largeur:
+            pas = 1 if parent > position else -1
         else:
-            parties.append(f"({ligne},{colonne})")
-    print("Chemin : " + " -> ".join(parties))
+            pas = largeur if parent > position else -largeur
+        while position != parent:
+            position += pas
+            indices.append(position)
+    indices.reverse()
+    chemin = [laby.coordonnees(indice) for indice in indices]
+
+    fin_temps = time.perf_counter()
+    return {
+        'chemin': chemin,
+        'explores': laby.ensemble_coordonnees(explores),
+        'noeuds_explores': len(explores),
+        'longueur': len(chemin),
+        'temps': (fin_temps - debut_temps) * 1000,
+        'points_de_saut': points_de_saut,
+        'operations_tas': ajouts + retraits,
+        'operations_evitees_estimees': 2 * max(len(explores) - ajouts, 0)
+    }
 
 
 # --- Test rapide ---
@@ -170,4 +291,10 @@ if __name__ == '__main__':
         print(f"Longueur du chemin : {resultat['longueur']}")
         print(f"Temps : {resultat['temps']:.3f} ms")
     else:
-        print("Aucun chemin trouvé !")
\ No newline at end of file
+        print("Aucun chemin trouvé !")
+
+    # G inatteignable : les deux frontières rendent None
+    ferme = [list('#####'), list('#S..#'), list('#####'), list('#.#G#'), list('#####')]
+    for nom in FRONTIERES:
+        assert astar(ferme, nom) is None, nom
+    print("G inatteignable : aucun chemin (tas et seaux)")
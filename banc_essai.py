@@ -0,0 +1,256 @@
+"""
+banc_essai.py - Banc d'essai reproductible : tailles x seeds x algorithmes
+Pour chaque taille et chaque seed, on génère le labyrinthe puis on mesure
+chaque algorithme : temps (perf_counter_ns, après échauffement, médiane et
+95e centile sur plusieurs répétitions), noeuds explorés, pic de la frontière
+et pic mémoire (tracemalloc). Les mesures sont écrites en JSON et/ou en CSV
+pour suivre les régressions d'une version à l'autre.
+
+Exemple :
+    python banc_essai.py --tailles 16 256 1024 --seeds 10 --json mesures.json
+"""
+
+import argparse
+import csv
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from maze import generer_labyrinthe
+from dfs import dfs, dfs_etapes
+from bfs import bfs, bfs_etapes
+from astar import astar, astar_etapes, astar_jps
+from bidirectionnel import bfs_bidirectionnel, astar_bidirectionnel
+from jonctions import astar_jonctions
+from hierarchique import astar_hierarchique
+import bfs_numpy
+
+TAILLES = (16, 64, 256, 1024)
+NB_SEEDS = 5
+REPETITIONS = 5
+ECHAUFFEMENT = 1
+
+# Nom -> (recherche, version pas à pas ou None). La version pas à pas sert
+# à mesurer le pic de la frontière ; les autres algorithmes n'en ont pas.
+ALGORITHMES = {
+    'dfs': (dfs, dfs_etapes),
+    'bfs': (bfs, bfs_etapes),
+    'astar': (astar, astar_etapes),
+    'astar_seaux': (lambda laby: astar(laby, 'seaux'), lambda laby: astar_etapes(laby, 'seaux')),
+    'astar_alt': (lambda laby: astar(laby, heuristique='alt'), lambda laby: astar_etapes(laby, heuristique='alt')),
+    'astar_jps': (astar_jps, None),
+    'bfs_bidir': (bfs_bidirectionnel, None),
+    'astar_bidir': (astar_bidirectionnel, None),
+    'astar_jonctions': (astar_jonctions, None),
+    'astar_hierarchique': (astar_hierarchique, None),
+}
+if bfs_numpy.DISPONIBLE:
+    ALGORITHMES['bfs_numpy'] = (bfs_numpy.bfs_numpy, None)
+
+COLONNES = ('taille', 'seed', 'algorithme', 'repetitions', 'mediane_ms', 'p95_ms', 'min_ms',
+            'noeuds_explores', 'longueur', 'pic_frontiere', 'pic_memoire_octets')
+
+
+def centile(valeurs, proportion):
+    """Centile par rang le plus proche (valeurs non vides)."""
+    triees = sorted(valeurs)
+    return triees[max(0, math.ceil(proportion * len(triees)) - 1)]
+
+
+def pic_frontiere(etapes, labyrinthe):
+    """Plus grande taille de la frontière, relevée après chaque expansion."""
+    recherche = etapes(labyrinthe)
+    recherche.instrumente = True
+    recherche.avancer()
+    return recherche.pic_frontiere
+
+
+def pic_memoire(recherche, labyrinthe):
+    """
+    Pic d'allocations Python (octets) pendant une recherche. Comme
+    etapes.resoudre_instrumente, un suivi tracemalloc déjà lancé par
+    l'appelant est gardé (pic remis à zéro, jamais arrêté).
+    """
+    deja_actif = tracemalloc.is_tracing()
+    if deja_actif:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        avant = tracemalloc.get_traced_memory()[0]
+        recherche(labyrinthe)
+        return tracemalloc.get_traced_memory()[1] - avant
+    finally:
+        if not deja_actif:
+            tracemalloc.stop()
+
+
+def mesurer(labyrinthe, recherche, etapes, repetitions, echauffement):
+    """
+    Mesures d'un algorithme sur un labyrinthe.
+
+    Les passes sont séparées pour ne pas se fausser : d'abord le temps
+    (sans tracemalloc), puis la frontière (pas à pas), puis la mémoire.
+    L'échauffement absorbe aussi les précalculs mis en cache sur le
+    labyrinthe (graphe des jonctions, carte hiérarchique, repères).
+    """
+    resultat = None
+    for _ in range(echauffement):
+        resultat = recherche(labyrinthe)
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter_ns()
+        resultat = recherche(labyrinthe)
+        durees.append((time.perf_counter_ns() - debut) / 1e6)
+
+    return {
+        'repetitions': repetitions,
+        'mediane_ms': round(statistics.median(durees), 4),
+        'p95_ms': round(centile(durees, 0.95), 4),
+        'min_ms': round(min(durees), 4),
+        'noeuds_explores': resultat['noeuds_explores'] if resultat else None,
+        'longueur': resultat['longueur'] if resultat else None,
+        'pic_frontiere': pic_frontiere(etapes, labyrinthe) if etapes is not None else None,
+        'pic_memoire_octets': pic_memoire(recherche, labyrinthe),
+    }
+
+
+def lancer(tailles=TAILLES, seeds=range(NB_SEEDS), algorithmes=None,
+           repetitions=REPETITIONS, echauffement=ECHAUFFEMENT, journal=None):
+    """
+    Lance le banc d'essai complet.
+
+    Args:
+        tailles: Tailles de labyrinthe
+        seeds: Seeds de génération (un labyrinthe par taille et par seed)
+        algorithmes: Noms d'ALGORITHMES (None = tous)
+        repetitions, echauffement: Nombre de mesures (au moins 1) et
+            d'appels ignorés
+        journal: Fichier où écrire la progression (None = silencieux)
+
+    Returns:
+        La liste des mesures (un dictionnaire par taille, seed et algorithme)
+    """
+    noms = list(ALGORITHMES) if algorithmes is None else list(algorithmes)
+    inconnus = [nom for nom in noms if nom not in ALGORITHMES]
+    if inconnus:
+        raise ValueError(f"Algorithme inconnu : {', '.join(inconnus)} (choix : {', '.join(ALGORITHMES)})")
+    # La médiane et les centiles demandent au moins une mesure
+    if repetitions < 1:
+        raise ValueError(f"repetitions doit valoir au moins 1 (reçu : {repetitions})")
+    if echauffement < 0:
+        raise ValueError(f"echauffement ne peut pas être négatif (reçu : {echauffement})")
+
+    mesures = []
+    for taille in tailles:
+        for seed in seeds:
+            laby = generer_labyrinthe(taille=taille, seed=seed)
+            for nom in noms:
+                recherche, etapes = ALGORITHMES[nom]
+                mesure = {'taille': taille, 'seed': seed, 'algorithme': nom}
+                mesure.update(mesurer(laby, recherche, etapes, repetitions, echauffement))
+                mesures.append(mesure)
+                if journal is not None:
+                    print(f"{taille:>6} seed {seed:<5} {nom:<20} {mesure['mediane_ms']:>12.3f} ms",
+                          file=journal, flush=True)
+    return mesures
+
+
+def resumer(mesures):
+    """Résumé par (taille, algorithme) : médiane des médianes, p95, noeuds, pics."""
+    groupes = {}
+    for mesure in mesures:
+        groupes.setdefault((mesure['taille'], mesure['algorithme']), []).append(mesure)
+    resume = []
+    for (taille, nom), groupe in groupes.items():
+        frontieres = [m['pic_frontiere'] for m in groupe if m['pic_frontiere'] is not None]
+        resume.append({
+            'taille': taille,
+            'algorithme': nom,
+            'seeds': len(groupe),
+            'mediane_ms': statistics.median(m['mediane_ms'] for m in groupe),
+            'p95_ms': centile([m['p95_ms'] for m in groupe], 0.95),
+            'noeuds_explores': statistics.median(m['noeuds_explores'] or 0 for m in groupe),
+            'pic_frontiere': max(frontieres) if frontieres else None,
+            'pic_memoire_octets': max(m['pic_memoire_octets'] for m in groupe),
+        })
+    return resume
+
+
+def afficher_resume(resume, fichier=sys.stdout):
+    print(f"{'Taille':>6} {'Algorithme':<20} {'Médiane (ms)':>13} {'p95 (ms)':>10} "
+          f"{'Noeuds':>10} {'Frontière':>10} {'Mémoire (Kio)':>14}", file=fichier)
+    for ligne in resume:
+        frontiere = '-' if ligne['pic_frontiere'] is None else ligne['pic_frontiere']
+        print(f"{ligne['taille']:>6} {ligne['algorithme']:<20} {ligne['mediane_ms']:>13.3f} "
+              f"{ligne['p95_ms']:>10.3f} {ligne['noeuds_explores']:>10.0f} {frontiere:>10} "
+              f"{ligne['pic_memoire_octets'] / 1024:>14.0f}", file=fichier)
+
+
+def ecrire_json(chemin, mesures, parametres):
+    """Écrit les mesures et de quoi les comparer d'une version à l'autre."""
+    document = {
+        'environnement': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'plateforme': platform.platform(),
+            'numpy': bfs_numpy.DISPONIBLE,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'parametres': parametres,
+        'mesures': mesures,
+        'resume': resumer(mesures),
+    }
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        json.dump(document, fichier, indent=2, ensure_ascii=False)
+
+
+def ecrire_csv(chemin, mesures):
+    with open(chemin, 'w', newline='', encoding='utf-8') as fichier:
+        ecrivain = csv.DictWriter(fichier, fieldnames=COLONNES)
+        ecrivain.writeheader()
+        ecrivain.writerows(mesures)
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Banc d'essai des algorithmes de recherche")
+    parseur.add_argument('--tailles', type=int, nargs='+', default=list(TAILLES),
+                         help="tailles de labyrinthe (ex. : 16 64 256 1024 4096)")
+    parseur.add_argument('--seeds', type=int, default=NB_SEEDS, help="nombre de seeds (0, 1, ...)")
+    parseur.add_argument('--premiere-seed', type=int, default=0, help="première seed")
+    parseur.add_argument('--algorithmes', nargs='+', choices=list(ALGORITHMES), default=None,
+                         help="algorithmes à mesurer (tous par défaut)")
+    parseur.add_argument('--repetitions', type=int, default=REPETITIONS)
+    parseur.add_argument('--echauffement', type=int, default=ECHAUFFEMENT)
+    parseur.add_argument('--json', help="fichier JSON de sortie")
+    parseur.add_argument('--csv', help="fichier CSV de sortie")
+    options = parseur.parse_args(arguments)
+    if options.repetitions < 1:
+        parseur.error(f"--repetitions doit valoir au moins 1 (reçu : {options.repetitions})")
+    if options.echauffement < 0:
+        parseur.error(f"--echauffement ne peut pas être négatif (reçu : {options.echauffement})")
+
+    seeds = range(options.premiere_seed, options.premiere_seed + options.seeds)
+    mesures = lancer(options.tailles, seeds, options.algorithmes,
+                     options.repetitions, options.echauffement, journal=sys.stderr)
+    afficher_resume(resumer(mesures))
+
+    parametres = {
+        'tailles': options.tailles,
+        'seeds': list(seeds),
+        'algorithmes': options.algorithmes or list(ALGORITHMES),
+        'repetitions': options.repetitions,
+        'echauffement': options.echauffement,
+    }
+    if options.json:
+        ecrire_json(options.json, mesures, parametres)
+    if options.csv:
+        ecrire_csv(options.csv, mesures)
+
+
+if __name__ == '__main__':
+    main()
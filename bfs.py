@@ -2,13 +2,18 @@
 bfs.py - Implémentation de la recherche en largeur (Breadth-First Search)
 BFS utilise une file (FIFO) pour explorer le labyrinthe.
 Il explore niveau par niveau, ce qui garantit le chemin le plus court.
+La boucle est celle du moteur commun (coeur.py), avec une file.
 """
 
 import time
-from collections import deque
 
+from maze import en_compact
+from etapes import Recherche, resoudre_instrumente
+from coeur import parcourir
+from rendu import afficher_exploration, afficher_solution, afficher_chemin
 
-def bfs(labyrinthe):
+
+def bfs(labyrinthe, instrumentation=False):
     """
     Recherche en largeur dans le labyrinthe.
     
@@ -20,102 +25,33 @@ def bfs(labyrinthe):
     le premier chemin trouvé est garanti d'être le plus court.
     
     Args:
-        labyrinthe: Matrice 2D représentant le labyrinthe
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute (liste de listes)
+        instrumentation: Si vrai, ajoute 'instrumentation' au résultat (voir dfs.py)
     
     Returns:
         Un dictionnaire contenant les résultats (comme dfs.py)
     """
-    taille = len(labyrinthe)
-
-    # Trouver les positions de S (départ) et G (arrivée)
-    depart = None
-    arrivee = None
-    for i in range(taille):
-        for j in range(taille):
-            if labyrinthe[i][j] == 'S':
-                depart = (i, j)
-            elif labyrinthe[i][j] == 'G':
-                arrivee = (i, j)
-
-    debut_temps = time.time()
-
-    # File FIFO : on utilise deque pour des opérations efficaces
-    # (popleft est O(1) avec deque, contre O(n) avec une liste)
-    file = deque([(depart, [depart])])
-
-    # Ensemble des cases déjà visitées
-    visites = set()
-    visites.add(depart)
-
-    # Ensemble de toutes les cases explorées (pour la visualisation)
-    explores = set()
-
-    # Les 4 directions : droite, bas, gauche, haut
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-
-    while file:
-        # Défiler le premier élément (FIFO = First In, First Out)
-        # C'est LA seule différence avec DFS qui fait pop() (le dernier)
-        position, chemin = file.popleft()
-        explores.add(position)
-
-        # Si on a trouvé l'arrivée
-        if position == arrivee:
-            fin_temps = time.time()
-            return {
-                'chemin': chemin,
-                'explores': explores,
-                'noeuds_explores': len(explores),
-                'longueur': len(chemin),
-                'temps': (fin_temps - debut_temps) * 1000
-            }
-
-        # Explorer les voisins
-        for delta_ligne, delta_colonne in directions:
-            voisin = (position[0] + delta_ligne, position[1] + delta_colonne)
+    if instrumentation:
+        return resoudre_instrumente(lambda debut: bfs_etapes(labyrinthe, debut))
 
-            if (0 <= voisin[0] < taille and
-                    0 <= voisin[1] < taille and
-                    labyrinthe[voisin[0]][voisin[1]] != '#' and
-                    voisin not in visites):
+    # Le chronomètre couvre aussi la préparation (voir dfs.py)
+    debut_temps = time.perf_counter()
+    return bfs_etapes(labyrinthe, debut_temps).resultat()
 
-                visites.add(voisin)
-                file.append((voisin, chemin + [voisin]))
 
-    return None
-
-
-def afficher_exploration(labyrinthe, explores):
-    """Affiche le labyrinthe avec les cases explorées marquées 'p'."""
-    copie = [ligne[:] for ligne in labyrinthe]
-    for (ligne, colonne) in explores:
-        if copie[ligne][colonne] == '.':
-            copie[ligne][colonne] = 'p'
-    for ligne in copie:
-        print(' '.join(ligne))
-
-
-def afficher_solution(labyrinthe, chemin):
-    """Affiche le labyrinthe avec le chemin solution marqué '*'."""
-    copie = [ligne[:] for ligne in labyrinthe]
-    for (ligne, colonne) in chemin:
-        if copie[ligne][colonne] == '.':
-            copie[ligne][colonne] = '*'
-    for ligne in copie:
-        print(' '.join(ligne))
-
-
-def afficher_chemin(chemin):
-    """Affiche le chemin sous forme de coordonnées."""
-    parties = []
-    for i, (ligne, colonne) in enumerate(chemin):
-        if i == 0:
-            parties.append(f"S ({ligne},{colonne})")
-        elif i == len(chemin) - 1:
-            parties.append(f"G ({ligne},{colonne})")
-        else:
-            parties.append(f"({ligne},{colonne})")
-    print("Chemin : " + " -> ".join(parties))
+def bfs_etapes(labyrinthe, debut_temps=None):
+    """
+    BFS pas à pas : une Recherche (voir etapes.py) à avancer par budgets.
+    
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+        debut_temps: perf_counter() à compter dans 'temps' (None = maintenant)
+    """
+    if debut_temps is None:
+        debut_temps = time.perf_counter()
+    # Version compacte : indices plats, voisins = position + delta
+    laby = en_compact(labyrinthe)
+    return Recherche(laby, parcourir(laby, 'file'), debut_temps)
 
 
 # --- Test rapide ---
@@ -0,0 +1,369 @@
+"""
+bfs_externe.py - BFS en mémoire externe, pour les labyrinthes plus grands que la RAM
+La grille est un fichier binaire de maze.py projeté en mémoire (lecture
+seule, pages lues à la demande). Rien de proportionnel à la surface n'est
+gardé dans la mémoire du processus :
+- l'état de chaque case (atteinte ou non, et sa distance modulo 3) tient
+  sur 2 bits dans un fichier temporaire projeté en mémoire ;
+- seule la frontière du niveau courant existe : une liste triée si elle
+  tient dans la mémoire de travail, sinon un fichier temporaire d'indices
+  triés, produit par tranches triées en mémoire puis fusionnées (tri
+  externe) ;
+- le chemin est retrouvé en remontant de G à S grâce aux distances
+  modulo 3, et écrit en flux dans un fichier.
+La mémoire de travail (tranches, tampons de lecture et d'écriture) est
+bornée par le paramètre memoire.
+
+Exemple :
+    python bfs_externe.py --taille 32769 --seed 1 --fichier grand.laby --memoire 64
+"""
+
+import argparse
+import heapq
+import itertools
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+
+from maze import charger_labyrinthe, generer_lignes_eller, sauver_lignes
+
+MEMOIRE_PAR_DEFAUT = 64 * 1024 * 1024  # 64 Mio
+
+# Coût estimé d'une entrée d'une tranche en cours de tri (pointeur de liste,
+# objet int et tampon de tri) : sert à convertir memoire en entrées
+_OCTETS_PAR_ENTREE = 40
+
+# Entrées lues ou écrites par bloc dans les fichiers d'indices
+_BLOC = 1 << 16
+
+# Niveaux entre deux lignes du journal d'avancement
+_NIVEAUX_PAR_JOURNAL = 1000
+
+
+def _milliers(nombre):
+    return f"{nombre:,.0f}".replace(',', ' ')
+
+
+def _lire_blocs(fichier, code, taille_bloc):
+    """Indices d'un fichier, par tableaux d'au plus taille_bloc entrées."""
+    with open(fichier, 'rb') as flux:
+        while True:
+            bloc = array(code)
+            try:
+                bloc.fromfile(flux, taille_bloc)
+            except EOFError:
+                pass  # dernier bloc incomplet : les entrées lues sont gardées
+            if not bloc:
+                return
+            yield bloc
+
+
+def _fusionner(sources, destination, code, taille_bloc):
+    """Fusionne des fichiers d'indices triés en un seul (puis les supprime)."""
+    flux = [itertools.chain.from_iterable(_lire_blocs(source, code, taille_bloc)) for source in sources]
+    with open(destination, 'wb') as sortie:
+        tampon = array(code)
+        for indice in heapq.merge(*flux):
+            tampon.append(indice)
+            if len(tampon) >= taille_bloc:
+                tampon.tofile(sortie)
+                tampon = array(code)
+        tampon.tofile(sortie)
+    for source in sources:
+        os.remove(source)
+
+
+class _Niveaux:
+    """
+    Niveaux de la frontière, en mémoire ou dans des fichiers temporaires.
+
+    Le niveau suivant arrive dans le désordre : il est accumulé par tranches
+    d'au plus capacite entrées. Un niveau qui tient dans une tranche reste
+    en mémoire (liste triée) : c'est le cas de la plupart des niveaux d'un
+    labyrinthe parfait, où des milliers de petits niveaux coûteraient
+    surtout des créations de fichiers. Au-delà, chaque tranche pleine est
+    triée et écrite à part, puis les tranches sont fusionnées (par paquets
+    d'au plus largeur_fusion fichiers, en plusieurs passes si besoin) en un
+    seul fichier trié.
+    """
+
+    def __init__(self, dossier, code, capacite, taille_bloc, largeur_fusion):
+        self.dossier = dossier
+        self.code = code
+        self.capacite = capacite
+        self.taille_bloc = taille_bloc
+        self.largeur_fusion = largeur_fusion
+        self._numeros = itertools.count()
+        self.tranches = []
+
+    def _nouveau(self):
+        return os.path.join(self.dossier, f'{next(self._numeros)}.bin')
+
+    def ecrire_tranche(self, entrees):
+        entrees.sort()
+        chemin = self._nouveau()
+        with open(chemin, 'wb') as sortie:
+            array(self.code, entrees).tofile(sortie)
+        self.tranches.append(chemin)
+
+    def terminer(self, tranche):
+        """
+        Niveau complet à partir de la dernière tranche : cette tranche triée
+        si rien n'a été écrit, sinon le fichier trié de toutes les tranches.
+        """
+        if not self.tranches:
+            tranche.sort()
+            return tranche
+        if tranche:
+            self.ecrire_tranche(tranche)
+        tranches, self.tranches = self.tranches, []
+        while len(tranches) > 1:
+            paquets = [tranches[i:i + self.largeur_fusion] for i in range(0, len(tranches), self.largeur_fusion)]
+            tranches = []
+            for paquet in paquets:
+                if len(paquet) == 1:
+                    tranches.append(paquet[0])
+                else:
+                    destination = self._nouveau()
+                    _fusionner(paquet, destination, self.code, self.taille_bloc)
+                    tranches.append(destination)
+        return tranches[0]
+
+    def taille(self, tranche):
+        """Entrées du niveau en cours de construction (tranches écrites et en mémoire)."""
+        taille_entree = array(self.code).itemsize
+        return len(tranche) + sum(os.path.getsize(chemin) for chemin in self.tranches) // taille_entree
+
+    def blocs(self, niveau):
+        """Entrées d'un niveau rendu par terminer, par blocs."""
+        if isinstance(niveau, list):
+            return (niveau,)
+        return _lire_blocs(niveau, self.code, self.taille_bloc)
+
+    @staticmethod
+    def liberer(niveau):
+        if not isinstance(niveau, list):
+            os.remove(niveau)
+
+
+def bfs_externe(chemin, memoire=MEMOIRE_PAR_DEFAUT, dossier=None, fichier_chemin=None, journal=None):
+    """
+    BFS niveau par niveau sur un labyrinthe binaire (sauver_labyrinthe ou
+    sauver_lignes), sans charger la grille en mémoire.
+
+    Distances modulo 3 : deux cases voisines sont à des distances qui
+    diffèrent d'au plus 1. Parmi les voisins d'une case à distance d, ceux
+    à distance d - 1 sont donc exactement ceux dont la distance vaut
+    (d - 1) modulo 3. Avec 2 bits par case (0 = non atteinte, sinon
+    1 + distance % 3), on remonte de G à S sans tableau de parents.
+
+    Une case est marquée dès qu'elle est produite pour le niveau suivant :
+    elle n'entre qu'une fois dans la frontière, les tranches n'ont pas de
+    doublons à éliminer. Les niveaux triés rendent les accès à la grille et
+    aux états presque séquentiels (voisins à ±1 et ±largeur).
+
+    Args:
+        chemin: Fichier binaire du labyrinthe (avec S et G)
+        memoire: Octets de mémoire de travail (tranches et tampons)
+        dossier: Où créer les fichiers temporaires (par défaut celui du système)
+        fichier_chemin: Si donné, le chemin y est écrit (indices plats, de S
+            à G, voir lire_chemin) au lieu d'être rendu en liste
+        journal: Flux où écrire l'avancement (niveau, frontière, cases/s)
+
+    Returns:
+        Un dictionnaire : longueur, noeuds_explores (cases développées),
+        visitees, niveaux, pic_frontiere, temps (ms), debit (cases
+        développées par seconde) et 'chemin' (liste de coordonnées) ou
+        'fichier_chemin' ; None si G n'est pas atteignable
+    """
+    debut_temps = time.perf_counter()
+    laby = charger_labyrinthe(chemin)
+    if laby.depart is None or laby.arrivee is None:
+        raise ValueError("Le labyrinthe doit contenir S et G")
+    cases = laby.cases
+    deltas = laby.deltas
+    depart = laby.depart
+    arrivee = laby.arrivee
+
+    code = 'I' if len(cases) < 2 ** 32 else 'Q'
+    taille_entree = array(code).itemsize
+    # Trois quarts de la mémoire pour deux tranches (le niveau courant s'il
+    # est resté en mémoire et la tranche du suivant), le reste pour les
+    # tampons de lecture (un par fichier fusionné, plus la sortie)
+    capacite = max(256, memoire * 3 // 8 // _OCTETS_PAR_ENTREE)
+    taille_bloc = max(64, min(_BLOC, memoire // 16 // taille_entree))
+    largeur_fusion = max(2, memoire // 4 // (taille_bloc * taille_entree) - 1)
+
+    temporaire = tempfile.mkdtemp(prefix='bfs_externe_', dir=dossier)
+    etats = None
+    try:
+        # États : 2 bits par case, fichier creux initialisé à zéro
+        fichier_etats = os.path.join(temporaire, 'etats.bin')
+        with open(fichier_etats, 'w+b') as flux:
+            flux.truncate((len(cases) + 3) // 4)
+            etats = mmap.mmap(flux.fileno(), 0)
+
+        niveaux = _Niveaux(temporaire, code, capacite, taille_bloc, largeur_fusion)
+        etats[depart >> 2] |= 1 << ((depart & 3) << 1)  # distance 0
+        niveau = niveaux.terminer([depart])
+        taille_niveau = 1
+
+        distance = 0
+        explores = 0
+        visitees = 1
+        pic_frontiere = 1
+        trouve = depart == arrivee
+
+        while not trouve and taille_niveau:
+            marque = 1 + (distance + 1) % 3
+            tranche = []
+            ajouter = tranche.append
+            for bloc in niveaux.blocs(niveau):
+                for position in bloc:
+                    for delta in deltas:
+                        voisin = position + delta
+                        if cases[voisin]:
+                            continue  # mur
+                        octet = voisin >> 2
+                        decalage = (voisin & 3) << 1
+                        etat = etats[octet]
+                        if etat >> decalage & 3:
+                            continue  # déjà atteinte
+                        etats[octet] = etat | marque << decalage
+                        ajouter(voisin)
+                        if voisin == arrivee:
+                            trouve = True
+                    explores += 1
+                    if trouve:
+                        break
+                    if len(tranche) >= capacite:
+                        niveaux.ecrire_tranche(tranche)
+                        tranche = []
+                        ajouter = tranche.append
+                if trouve:
+                    break
+
+            niveaux.liberer(niveau)
+            distance += 1
+            taille_niveau = niveaux.taille(tranche)
+            visitees += taille_niveau
+            if trouve:
+                break
+            pic_frontiere = max(pic_frontiere, taille_niveau)
+            niveau = niveaux.terminer(tranche)
+
+            if journal is not None and distance % _NIVEAUX_PAR_JOURNAL == 0:
+                duree = time.perf_counter() - debut_temps
+                print(f"niveau {distance:>9} : frontière {taille_niveau:>9}, "
+                      f"{_milliers(explores / duree)} cases/s", file=journal, flush=True)
+
+        if not trouve:
+            return None
+
+        # Remontée de G à S (chemin à l'envers), puis retournement par blocs
+        envers = os.path.join(temporaire, 'envers.bin')
+        _remonter(cases, etats, deltas, arrivee, distance, envers, code, taille_bloc)
+        destination = fichier_chemin or os.path.join(temporaire, 'chemin.bin')
+        _retourner(envers, destination, code, taille_bloc)
+
+        duree = time.perf_counter() - debut_temps
+        resultat = {
+            'longueur': distance + 1,
+            'noeuds_explores': explores,
+            'visitees': visitees,
+            'niveaux': distance,
+            'pic_frontiere': pic_frontiere,
+            'temps': duree * 1000,
+            'debit': explores / duree if duree else 0.0,
+        }
+        if fichier_chemin:
+            resultat['fichier_chemin'] = fichier_chemin
+        else:
+            resultat['chemin'] = list(lire_chemin(destination, laby))
+        return resultat
+    finally:
+        if etats is not None:
+            etats.close()
+        shutil.rmtree(temporaire, ignore_errors=True)
+
+
+def _remonter(cases, etats, deltas, arrivee, distance, destination, code, taille_bloc):
+    """Écrit le chemin de G à S : à chaque pas, le voisin à distance - 1 (modulo 3)."""
+    with open(destination, 'wb') as sortie:
+        tampon = array(code, [arrivee])
+        position = arrivee
+        while distance:
+            distance -= 1
+            attendu = 1 + distance % 3
+            for delta in deltas:
+                voisin = position + delta
+                if not cases[voisin] and etats[voisin >> 2] >> ((voisin & 3) << 1) & 3 == attendu:
+                    break
+            position = voisin
+            tampon.append(position)
+            if len(tampon) >= taille_bloc:
+                tampon.tofile(sortie)
+                tampon = array(code)
+        tampon.tofile(sortie)
+
+
+def _retourner(source, destination, code, taille_bloc):
+    """Recopie un fichier d'indices dans l'ordre inverse, bloc par bloc depuis la fin."""
+    taille_entree = array(code).itemsize
+    with open(source, 'rb') as entree, open(destination, 'wb') as sortie:
+        restant = os.path.getsize(source) // taille_entree
+        while restant:
+            nombre = min(taille_bloc, restant)
+            restant -= nombre
+            entree.seek(restant * taille_entree)
+            bloc = array(code)
+            bloc.fromfile(entree, nombre)
+            bloc.reverse()
+            bloc.tofile(sortie)
+
+
+def lire_chemin(fichier_chemin, laby):
+    """Coordonnées (ligne, colonne) d'un chemin écrit par bfs_externe, de S à G, en flux."""
+    code = 'I' if len(laby.cases) < 2 ** 32 else 'Q'
+    largeur = laby.largeur
+    for bloc in _lire_blocs(fichier_chemin, code, _BLOC):
+        for indice in bloc:
+            yield (indice // largeur - 1, indice % largeur)
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="BFS en mémoire externe sur un labyrinthe binaire")
+    parseur.add_argument('--fichier', required=True, help="labyrinthe binaire (créé s'il n'existe pas)")
+    parseur.add_argument('--taille', type=int, default=4097, help="taille si le fichier est à générer")
+    parseur.add_argument('--seed', type=int, default=1)
+    parseur.add_argument('--memoire', type=int, default=MEMOIRE_PAR_DEFAUT // (1024 * 1024),
+                         help="mémoire de travail (Mio)")
+    parseur.add_argument('--dossier', help="dossier des fichiers temporaires")
+    parseur.add_argument('--chemin', help="fichier où écrire le chemin (indices plats)")
+    options = parseur.parse_args(arguments)
+
+    if not os.path.exists(options.fichier):
+        debut = time.perf_counter()
+        sauver_lignes(generer_lignes_eller(options.taille, options.seed), options.fichier, options.seed)
+        print(f"Génération (Eller, en flux) {options.taille}x{options.taille} : "
+              f"{time.perf_counter() - debut:.1f} s -> {options.fichier}")
+
+    resultat = bfs_externe(options.fichier, options.memoire * 1024 * 1024, options.dossier,
+                           options.chemin, journal=sys.stderr)
+    if resultat is None:
+        print("Aucun chemin trouvé !")
+        return
+    print(f"BFS externe : {resultat['temps'] / 1000:.1f} s, {_milliers(resultat['noeuds_explores'])} "
+          f"cases développées, {_milliers(resultat['debit'])} cases/s")
+    print(f"Longueur du chemin : {resultat['longueur']} ({resultat['niveaux']} niveaux, "
+          f"frontière max {resultat['pic_frontiere']})")
+    if options.chemin:
+        print(f"Chemin écrit dans {options.chemin}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+bfs_numpy.py - BFS par vagues (wavefront) vectorisé avec NumPy
+Au lieu de traiter les cases une par une, on développe toute la frontière
+d'un niveau en une seule opération sur des tableaux NumPy.
+
+NumPy est optionnel : sans lui, ce module s'importe quand même (DISPONIBLE
+vaut False) et bfs.py reste la version de référence.
+"""
+
+import time
+from array import array
+
+from maze import en_compact
+
+try:
+    import numpy as np
+except ImportError:  # NumPy absent : seule la version standard est utilisable
+    np = None
+
+DISPONIBLE = np is not None
+
+# En dessous de cette taille de frontière, développer un niveau en Python pur
+# coûte moins cher que les appels NumPy (cas des couloirs étroits)
+SEUIL_VECTORISATION = 64
+
+
+def _verifier_numpy():
+    if np is None:
+        raise ImportError("bfs_numpy nécessite NumPy (pip install numpy) ; utiliser bfs.bfs sinon")
+
+
+def _vague(laby, source, cible=None, seuil=SEUIL_VECTORISATION):
+    """
+    Parcours en largeur niveau par niveau depuis source.
+
+    Chaque niveau est développé dans l'ordre exact de la file de bfs() :
+    parent par parent, et pour chaque parent dans l'ordre droite, bas,
+    gauche, haut. En vectorisé, les candidats sont rangés dans cet ordre
+    (frontiere[:, None] + deltas), puis on garde la première occurrence de
+    chaque case.
+
+    Les visites (bytearray) et les distances (array 'i') sont partagées
+    entre Python et NumPy sans copie (np.frombuffer).
+
+    Args:
+        laby: LabyrintheCompact
+        source: Indice plat de départ
+        cible: Indice plat où s'arrêter (None = tout le champ)
+        seuil: Taille de frontière à partir de laquelle on vectorise
+
+    Returns:
+        (distances, frontiere) : distances (array 'i', -1 = non atteinte) et
+        le dernier niveau développé, dans l'ordre de la file
+    """
+    deltas = laby.deltas
+    visites = bytearray(laby.cases)  # les murs comptent déjà comme visités
+    distances = array('i', [-1]) * len(laby.cases)
+    visites_np = np.frombuffer(visites, dtype=np.uint8)
+    distances_np = np.frombuffer(distances, dtype=np.intc)
+    deltas_np = np.array(deltas, dtype=np.int64)
+
+    visites[source] = 1
+    distances[source] = 0
+    frontiere = [source]
+    niveau = 0
+
+    while len(frontiere) and (cible is None or distances[cible] < 0):
+        niveau += 1
+        if len(frontiere) < seuil:
+            # Petite frontière : même développement, en Python pur
+            if not isinstance(frontiere, list):
+                frontiere = frontiere.tolist()
+            suivants = []
+            ajouter = suivants.append
+            for position in frontiere:
+                for delta in deltas:
+                    voisin = position + delta
+                    if not visites[voisin]:
+                        visites[voisin] = 1
+                        distances[voisin] = niveau
+                        ajouter(voisin)
+        else:
+            # Grande frontière : tous les voisins d'un coup
+            candidats = (np.asarray(frontiere, dtype=np.int64)[:, None] + deltas_np).ravel()
+            candidats = candidats[visites_np[candidats] == 0]
+            # Première occurrence de chaque case = premier parent dans la file
+            _, premiers = np.unique(candidats, return_index=True)
+            premiers.sort()
+            suivants = candidats[premiers]
+            visites_np[suivants] = 1
+            distances_np[suivants] = niveau
+        frontiere = suivants
+
+    return distances, frontiere
+
+
+def _descendre_gradient(laby, distances, arrivee):
+    """Chemin (coordonnées) de la source jusqu'à arrivee en suivant distances - 1."""
+    deltas = laby.deltas
+    position = arrivee
+    chemin = [laby.coordonnees(position)]
+    while distances[position]:
+        attendue = distances[position] - 1
+        for delta in deltas:
+            if distances[position + delta] == attendue:
+                position += delta
+                break
+        chemin.append(laby.coordonnees(position))
+    chemin.reverse()
+    return chemin
+
+
+def champ_distances(labyrinthe, source=None):
+    """
+    Champ des distances (en pas) depuis une case vers toutes les autres.
+
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+        source: Position (ligne, colonne) de départ (S par défaut)
+
+    Returns:
+        Un tableau NumPy (lignes, colonnes) d'entiers : la distance de
+        chaque case depuis la source, -1 pour les murs et cases non atteintes
+
+    Raises:
+        ValueError: si source est hors du labyrinthe
+    """
+    _verifier_numpy()
+    laby = en_compact(labyrinthe)
+    depart = laby.depart if source is None else laby.indice_verifie(*source)
+    distances, _ = _vague(laby, depart)
+    champ = np.frombuffer(distances, dtype=np.intc).reshape(laby.lignes + 2, laby.largeur)
+    return champ[1:-1, :laby.colonnes].copy()
+
+
+def chemin_depuis_champ(champ, arrivee):
+    """
+    Extrait un plus court chemin d'un champ de distances en descendant
+    le gradient depuis arrivee (voisins essayés dans l'ordre droite, bas,
+    gauche, haut).
+
+    Returns:
+        La liste des coordonnées de la source jusqu'à arrivee, ou None si
+        arrivee n'est pas atteinte
+    """
+    lignes, colonnes = champ.shape
+    ligne, colonne = arrivee
+    if champ[ligne, colonne] < 0:
+        return None
+    chemin = [(ligne, colonne)]
+    while champ[ligne, colonne]:
+        attendue = champ[ligne, colonne] - 1
+        for delta_ligne, delta_colonne in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            voisin_ligne = ligne + delta_ligne
+            voisin_colonne = colonne + delta_colonne
+            if (0 <= voisin_ligne < lignes and 0 <= voisin_colonne < colonnes and
+                    champ[voisin_ligne, voisin_colonne] == attendue):
+                ligne, colonne = voisin_ligne, voisin_colonne
+                break
+        chemin.append((ligne, colonne))
+    chemin.reverse()
+    return chemin
+
+
+def bfs_numpy(labyrinthe):
+    """
+    BFS vectorisé : même résultat que bfs() (voir bfs.py).
+
+    - 'explores' et 'noeuds_explores' sont identiques à bfs() : tous les
+      niveaux avant celui de G, puis les cases du niveau de G qui sortent
+      de la file avant G
+    - 'chemin' est un plus court chemin obtenu en descendant le gradient du
+      champ de distances depuis G (même longueur que bfs())
+
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+
+    Returns:
+        Un dictionnaire contenant les résultats (comme bfs.py), ou None
+    """
+    _verifier_numpy()
+    debut_temps = time.perf_counter()
+
+    laby = en_compact(labyrinthe)
+    depart = laby.depart
+    arrivee = laby.arrivee
+
+    distances, frontiere = _vague(laby, depart, arrivee)
+    niveau_arrivee = distances[arrivee]
+    if niveau_arrivee < 0:
+        return None
+
+    # Cases sorties de la file avant G (et G lui-même)
+    distances_np = np.frombuffer(distances, dtype=np.intc)
+    avant = np.flatnonzero((distances_np >= 0) & (distances_np < niveau_arrivee))
+    frontiere = np.asarray(frontiere, dtype=np.int64)
+    rang_arrivee = int(np.flatnonzero(frontiere == arrivee)[0])
+    explores = avant.tolist() + frontiere[:rang_arrivee + 1].tolist()
+
+    chemin = _descendre_gradient(laby, distances, arrivee)
+    fin_temps = time.perf_counter()
+    return {
+        'chemin': chemin,
+        'explores': laby.ensemble_coordonnees(explores),
+        'noeuds_explores': len(explores),
+        'longueur': len(chemin),
+        'temps': (fin_temps - debut_temps) * 1000
+    }
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    from maze import generer_labyrinthe
+    from bfs import bfs
+
+    if not DISPONIBLE:
+        print("NumPy n'est pas installé : bfs_numpy indisponible")
+    else:
+        for taille in (16, 256, 1024):
+            laby = generer_labyrinthe(taille=taille, seed=42)
+            reference = bfs(laby)
+            resultat = bfs_numpy(laby)
+            print(f"{taille}x{taille} : longueur {resultat['longueur']} (bfs {reference['longueur']}), "
+                  f"noeuds {resultat['noeuds_explores']} (bfs {reference['noeuds_explores']}), "
+                  f"{resultat['temps']:.1f} ms (bfs {reference['temps']:.1f} ms)")
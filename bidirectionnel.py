@@ -0,0 +1,230 @@
+"""
+bidirectionnel.py - Recherches bidirectionnelles (BFS et A*)
+On cherche en même temps depuis S et depuis G, et on s'arrête quand les deux
+recherches se rencontrent. Dans un long labyrinthe, chaque recherche n'a
+besoin d'aller qu'à peu près jusqu'au milieu du chemin.
+"""
+
+import time
+import heapq
+from collections import deque
+
+from maze import en_compact
+
+
+def _assembler_chemin(laby, parents_avant, parents_arriere, rencontre):
+    """
+    Chemin complet S -> G passant par la case de rencontre :
+    on remonte les parents de la recherche avant jusqu'à S, puis ceux de la
+    recherche arrière jusqu'à G.
+    """
+    depart = laby.depart
+    arrivee = laby.arrivee
+    indices = [rencontre]
+    position = rencontre
+    while position != depart:
+        position = parents_avant[position]
+        indices.append(position)
+    indices.reverse()
+    position = rencontre
+    while position != arrivee:
+        position = parents_arriere[position]
+        indices.append(position)
+    return [laby.coordonnees(indice) for indice in indices]
+
+
+def bfs_bidirectionnel(labyrinthe):
+    """
+    BFS bidirectionnel : un BFS depuis S et un BFS depuis G.
+
+    À chaque tour, on développe un niveau complet du côté dont la frontière
+    est la plus petite. Quand une case découverte a déjà été vue par l'autre
+    côté, on note la longueur du chemin qui passe par elle ; comme le niveau
+    est développé en entier, la meilleure rencontre du niveau donne un plus
+    court chemin (même longueur que bfs()).
+
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+
+    Returns:
+        Un dictionnaire contenant les résultats (comme bfs.py), ou None
+    """
+    debut_temps = time.perf_counter()
+
+    laby = en_compact(labyrinthe)
+    depart = laby.depart
+    arrivee = laby.arrivee
+    deltas = laby.deltas
+
+    # Un tableau de distances par côté : -1 = pas encore vue de ce côté
+    distances_avant = laby.tableau_indices(-1)
+    distances_arriere = laby.tableau_indices(-1)
+    parents_avant = laby.tableau_indices()
+    parents_arriere = laby.tableau_indices()
+    distances_avant[depart] = 0
+    distances_arriere[arrivee] = 0
+    cases = laby.cases
+
+    frontiere_avant = deque([depart])
+    frontiere_arriere = deque([arrivee])
+    explores = []
+    explorer = explores.append
+
+    meilleure = None  # (longueur en pas, case de rencontre)
+    if depart == arrivee:
+        meilleure = (0, depart)
+
+    while meilleure is None and frontiere_avant and frontiere_arriere:
+        # Développer le côté le moins coûteux
+        if len(frontiere_avant) <= len(frontiere_arriere):
+            frontiere, distances, parents, autres = frontiere_avant, distances_avant, parents_avant, distances_arriere
+        else:
+            frontiere, distances, parents, autres = frontiere_arriere, distances_arriere, parents_arriere, distances_avant
+
+        for _ in range(len(frontiere)):
+            position = frontiere.popleft()
+            explorer(position)
+            suivante = distances[position] + 1
+            for delta in deltas:
+                voisin = position + delta
+                if not cases[voisin] and distances[voisin] < 0:
+                    distances[voisin] = suivante
+                    parents[voisin] = position
+                    frontiere.append(voisin)
+                    if autres[voisin] >= 0:
+                        longueur = suivante + autres[voisin]
+                        if meilleure is None or longueur < meilleure[0]:
+                            meilleure = (longueur, voisin)
+
+    if meilleure is None:
+        return None
+
+    chemin = _assembler_chemin(laby, parents_avant, parents_arriere, meilleure[1])
+    fin_temps = time.perf_counter()
+    return {
+        'chemin': chemin,
+        'explores': laby.ensemble_coordonnees(explores),
+        'noeuds_explores': len(set(explores)),
+        'longueur': len(chemin),
+        'temps': (fin_temps - debut_temps) * 1000
+    }
+
+
+def astar_bidirectionnel(labyrinthe):
+    """
+    A* bidirectionnel : un A* de S vers G et un A* de G vers S.
+
+    Les deux côtés utilisent l'heuristique « moyennée » :
+        p(n) = (manhattan(n, G) - manhattan(n, S)) / 2
+    avec la priorité g(n) + p(n) vers l'avant et g(n) - p(n) vers l'arrière
+    (doublées ci-dessous pour rester en entiers). Comme p est cohérente des
+    deux côtés, chaque recherche est un Dijkstra sur des coûts réduits
+    positifs, et on peut s'arrêter dès que la somme des deux plus petites
+    priorités atteint la meilleure longueur connue mu d'un chemin qui relie
+    les deux côtés : le chemin rendu est optimal.
+
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+
+    Returns:
+        Un dictionnaire contenant les résultats (comme astar.py), ou None
+    """
+    debut_temps = time.perf_counter()
+
+    laby = en_compact(labyrinthe)
+    depart = laby.depart
+    arrivee = laby.arrivee
+    deltas = laby.deltas
+    largeur = laby.largeur
+    cases = laby.cases
+
+    ligne_depart, colonne_depart = divmod(depart, largeur)
+    ligne_arrivee, colonne_arrivee = divmod(arrivee, largeur)
+
+    def potentiel(position):
+        # 2 * p(position) = manhattan vers G - manhattan vers S
+        ligne, colonne = divmod(position, largeur)
+        return (abs(ligne - ligne_arrivee) + abs(colonne - colonne_arrivee)
+                - abs(ligne - ligne_depart) - abs(colonne - colonne_depart))
+
+    # g de chaque côté (-1 = inconnu), cases fermées et parents
+    g_avant = laby.tableau_indices(-1)
+    g_arriere = laby.tableau_indices(-1)
+    fermes_avant = bytearray(len(cases))
+    fermes_arriere = bytearray(len(cases))
+    parents_avant = laby.tableau_indices()
+    parents_arriere = laby.tableau_indices()
+    g_avant[depart] = 0
+    g_arriere[arrivee] = 0
+
+    # Entrées : (2 * priorité, compteur, position)
+    compteur = 0
+    file_avant = [(potentiel(depart), compteur, depart)]
+    file_arriere = [(-potentiel(arrivee), compteur, arrivee)]
+    explores = []
+    explorer = explores.append
+
+    mu = 0 if depart == arrivee else None
+    rencontre = depart
+
+    while file_avant and file_arriere:
+        # Critère d'arrêt : plus aucun chemin ne peut battre mu
+        if mu is not None and file_avant[0][0] + file_arriere[0][0] >= 2 * mu:
+            break
+
+        if file_avant[0][0] <= file_arriere[0][0]:
+            file, g, autres_g, fermes, parents, signe = (
+                file_avant, g_avant, g_arriere, fermes_avant, parents_avant, 1)
+        else:
+            file, g, autres_g, fermes, parents, signe = (
+                file_arriere, g_arriere, g_avant, fermes_arriere, parents_arriere, -1)
+
+        _, _, position = heapq.heappop(file)
+        if fermes[position]:
+            continue  # entrée périmée : la case a déjà été développée
+        fermes[position] = 1
+        explorer(position)
+
+        nouveau_g = g[position] + 1
+        for delta in deltas:
+            voisin = position + delta
+            if cases[voisin] or fermes[voisin]:
+                continue
+            if g[voisin] < 0 or nouveau_g < g[voisin]:
+                g[voisin] = nouveau_g
+                parents[voisin] = position
+                compteur += 1
+                heapq.heappush(file, (2 * nouveau_g + signe * potentiel(voisin), compteur, voisin))
+                # Chemin complet connu par cette case ?
+                if autres_g[voisin] >= 0 and (mu is None or nouveau_g + autres_g[voisin] < mu):
+                    mu = nouveau_g + autres_g[voisin]
+                    rencontre = voisin
+
+    if mu is None:
+        return None
+
+    chemin = _assembler_chemin(laby, parents_avant, parents_arriere, rencontre)
+    fin_temps = time.perf_counter()
+    return {
+        'chemin': chemin,
+        'explores': laby.ensemble_coordonnees(explores),
+        'noeuds_explores': len(set(explores)),
+        'longueur': len(chemin),
+        'temps': (fin_temps - debut_temps) * 1000
+    }
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    from maze import generer_labyrinthe
+    from bfs import bfs
+    from astar import astar
+
+    print(f"{'Taille':<10} {'Algorithme':<22} {'Noeuds':>10} {'Longueur':>10} {'Temps (ms)':>11}")
+    for taille in (16, 256, 1024):
+        laby = generer_labyrinthe(taille=taille, seed=42)
+        for nom, recherche in (('BFS', bfs), ('BFS bidirectionnel', bfs_bidirectionnel),
+                               ('A*', astar), ('A* bidirectionnel', astar_bidirectionnel)):
+            resultat = recherche(laby)
+            print(f"{taille:<10} {nom:<22} {resultat['noeuds_explores']:>10} "
+                  f"{resultat['longueur']:>10} {resultat['temps']:>11.1f}")
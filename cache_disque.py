@@ -0,0 +1,244 @@
+"""
+cache_disque.py - Cache persistant des labyrinthes générés et des résultats
+generer_labyrinthe(taille, seed) est déterministe, et chaque recherche l'est
+aussi sur un labyrinthe donné : on garde donc les deux sur disque, dans une
+base sqlite partagée entre les exécutions et entre les processus.
+
+- labyrinthes : clé (VERSION_GENERATEUR, moteur, taille, seed), valeur au
+  format binaire de maze.py (en-tête + cases), compressée avec zlib ;
+- résultats : clé (empreinte du labyrinthe, algorithme, heuristique),
+  valeur : chemin et cases explorées (indices plats compressés) et les
+  nombres du résultat.
+
+La base est bornée en octets : au-delà, les entrées les moins récemment
+lues sont supprimées. Exemple :
+    python cache_disque.py --prechauffer --tailles 16 256 1024 --seeds 5
+    python cache_disque.py --stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from array import array
+
+from maze import (VERSION_GENERATEUR, Labyrinthe, en_compact, entete_binaire,
+                  generer_labyrinthe, labyrinthe_depuis_tampon)
+
+CHEMIN_PAR_DEFAUT = os.environ.get(
+    'LABYRINTHES_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'labyrinthes.sqlite'))
+TAILLE_MAX = 1024 * 1024 * 1024  # 1 Gio
+# Attente maximale (s) quand un autre processus écrit dans la base
+ATTENTE_VERROU = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entrees (
+    cle TEXT PRIMARY KEY,
+    donnees BLOB NOT NULL,
+    taille INTEGER NOT NULL,
+    dernier_acces REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entrees_acces ON entrees (dernier_acces);
+"""
+
+
+def _indices(coordonnees, colonnes):
+    """Coordonnées -> octets compressés d'indices (ligne * colonnes + colonne)."""
+    return zlib.compress(array('i', (ligne * colonnes + colonne for ligne, colonne in coordonnees)).tobytes(), 1)
+
+
+def _coordonnees(donnees, colonnes):
+    indices = array('i')
+    indices.frombytes(zlib.decompress(donnees))
+    return [divmod(indice, colonnes) for indice in indices]
+
+
+class CacheDisque:
+    """
+    Cache sqlite des labyrinthes et des résultats.
+
+    Chaque processus ouvre sa propre connexion. La base est en mode WAL :
+    les lectures ne bloquent pas les écritures, et les écritures de
+    plusieurs processus se succèdent (attente jusqu'à ATTENTE_VERROU s).
+    Avec actif=False, le cache est contourné : tout est recalculé et rien
+    n'est écrit.
+
+    Exemple :
+        cache = CacheDisque()
+        laby = cache.labyrinthe(1024, seed=42)
+        resultat = cache.resultat(laby, 'astar', astar)
+    """
+
+    def __init__(self, chemin=CHEMIN_PAR_DEFAUT, taille_max=TAILLE_MAX, actif=True):
+        self.chemin = chemin
+        self.taille_max = taille_max
+        self.actif = actif
+        self.succes = 0
+        self.echecs = 0
+        self._connexion = None
+
+    def _base(self):
+        if self._connexion is None:
+            dossier = os.path.dirname(self.chemin)
+            if dossier:
+                os.makedirs(dossier, exist_ok=True)
+            connexion = sqlite3.connect(self.chemin, timeout=ATTENTE_VERROU, isolation_level=None)
+            connexion.execute('PRAGMA journal_mode=WAL')
+            connexion.executescript(_SCHEMA)
+            self._connexion = connexion
+        return self._connexion
+
+    def fermer(self):
+        if self._connexion is not None:
+            self._connexion.close()
+            self._connexion = None
+
+    def _lire(self, cle):
+        base = self._base()
+        ligne = base.execute('SELECT donnees FROM entrees WHERE cle = ?', (cle,)).fetchone()
+        if ligne is None:
+            self.echecs += 1
+            return None
+        self.succes += 1
+        try:
+            base.execute('UPDATE entrees SET dernier_acces = ? WHERE cle = ?', (time.time(), cle))
+        except sqlite3.OperationalError:
+            pass  # base occupée : la date d'accès n'est qu'indicative
+        return ligne[0]
+
+    def _ecrire(self, cle, donnees):
+        """Ajoute une entrée puis supprime les plus anciennes si la base dépasse taille_max."""
+        base = self._base()
+        base.execute('BEGIN IMMEDIATE')
+        try:
+            base.execute('INSERT OR REPLACE INTO entrees VALUES (?, ?, ?, ?)',
+                         (cle, donnees, len(donnees), time.time()))
+            total = base.execute('SELECT COALESCE(SUM(taille), 0) FROM entrees').fetchone()[0]
+            if total > self.taille_max:
+                for ancienne, taille in base.execute(
+                        'SELECT cle, taille FROM entrees WHERE cle != ? ORDER BY dernier_acces',
+                        (cle,)).fetchall():
+                    base.execute('DELETE FROM entrees WHERE cle = ?', (ancienne,))
+                    total -= taille
+                    if total <= self.taille_max:
+                        break
+            base.execute('COMMIT')
+        except BaseException:
+            base.execute('ROLLBACK')
+            raise
+
+    def labyrinthe(self, taille, seed, moteur='iteratif'):
+        """generer_labyrinthe(taille, seed, moteur), lu sur disque s'il y est déjà."""
+        if not self.actif or seed is None:
+            return generer_labyrinthe(taille=taille, seed=seed, moteur=moteur)
+        cle = f"labyrinthe:{VERSION_GENERATEUR}:{moteur}:{taille}:{seed}"
+        donnees = self._lire(cle)
+        if donnees is not None:
+            return Labyrinthe.depuis_compact(labyrinthe_depuis_tampon(zlib.decompress(donnees)))
+        labyrinthe = generer_labyrinthe(taille=taille, seed=seed, moteur=moteur)
+        try:
+            binaire = entete_binaire(labyrinthe) + labyrinthe.compact().cases
+        except ValueError:
+            return labyrinthe  # seed hors du format binaire : pas de mise en cache
+        self._ecrire(cle, zlib.compress(binaire, 1))
+        return labyrinthe
+
+    def resultat(self, labyrinthe, algorithme, recherche, heuristique=''):
+        """
+        recherche(labyrinthe), lu sur disque s'il y est déjà.
+
+        Args:
+            algorithme: Nom de l'algorithme (sert de clé avec l'empreinte)
+            recherche: Fonction labyrinthe -> dictionnaire habituel (ou None)
+            heuristique: Nom de l'heuristique, seulement si ce n'est pas celle
+                de l'algorithme par défaut ('' pour astar et sa distance de
+                Manhattan, comme prechauffer) : la clé doit être la même
+                partout pour un même calcul
+
+        Returns:
+            Le dictionnaire habituel ; 'temps' est celui du calcul d'origine
+        """
+        if not self.actif:
+            return recherche(labyrinthe)
+        laby = en_compact(labyrinthe)
+        cle = f"resultat:{laby.empreinte()}:{algorithme}:{heuristique}"
+        donnees = self._lire(cle)
+        if donnees is not None:
+            debut = 4 + int.from_bytes(donnees[:4], 'little')
+            valeurs = json.loads(zlib.decompress(donnees[4:debut]))
+            if valeurs is None:
+                return None
+            fin = debut + valeurs.pop('taille_chemin')
+            colonnes = laby.colonnes
+            valeurs['chemin'] = _coordonnees(donnees[debut:fin], colonnes)
+            valeurs['explores'] = set(_coordonnees(donnees[fin:], colonnes))
+            return valeurs
+
+        resultat = recherche(labyrinthe)
+        if resultat is None:
+            entete, chemin, explores = zlib.compress(b'null'), b'', b''
+        else:
+            chemin = _indices(resultat['chemin'], laby.colonnes)
+            explores = _indices(resultat['explores'], laby.colonnes)
+            valeurs = {cle_resultat: valeur for cle_resultat, valeur in resultat.items()
+                       if cle_resultat not in ('chemin', 'explores')}
+            valeurs['taille_chemin'] = len(chemin)
+            entete = zlib.compress(json.dumps(valeurs).encode('utf-8'))
+        self._ecrire(cle, len(entete).to_bytes(4, 'little') + entete + chemin + explores)
+        return resultat
+
+    def prechauffer(self, tailles, seeds, algorithmes, journal=None):
+        """Remplit le cache : labyrinthes et résultats de banc_essai.ALGORITHMES."""
+        from banc_essai import ALGORITHMES
+
+        for taille in tailles:
+            for seed in seeds:
+                labyrinthe = self.labyrinthe(taille, seed)
+                for nom in algorithmes:
+                    self.resultat(labyrinthe, nom, ALGORITHMES[nom][0])
+                if journal is not None:
+                    print(f"{taille:>6} seed {seed}", file=journal, flush=True)
+
+    def stats(self):
+        base = self._base()
+        nombre, total = base.execute('SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM entrees').fetchone()
+        labyrinthes = base.execute("SELECT COUNT(*) FROM entrees WHERE cle LIKE 'labyrinthe:%'").fetchone()[0]
+        return {'entrees': nombre, 'labyrinthes': labyrinthes, 'resultats': nombre - labyrinthes,
+                'octets': total, 'taille_max': self.taille_max}
+
+    def vider(self):
+        self._base().execute('DELETE FROM entrees')
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Cache sur disque des labyrinthes et des résultats")
+    parseur.add_argument('--chemin', default=CHEMIN_PAR_DEFAUT, help="fichier sqlite du cache")
+    parseur.add_argument('--taille-max', type=int, default=TAILLE_MAX // (1024 * 1024), help="taille maximale (Mio)")
+    parseur.add_argument('--prechauffer', action='store_true', help="générer et résoudre à l'avance")
+    parseur.add_argument('--tailles', type=int, nargs='+', default=[16, 64, 256])
+    parseur.add_argument('--seeds', type=int, default=5)
+    parseur.add_argument('--algorithmes', nargs='+', default=['dfs', 'bfs', 'astar'])
+    parseur.add_argument('--vider', action='store_true', help="supprimer toutes les entrées")
+    parseur.add_argument('--stats', action='store_true', help="afficher le contenu du cache")
+    options = parseur.parse_args(arguments)
+
+    cache = CacheDisque(options.chemin, options.taille_max * 1024 * 1024)
+    if options.vider:
+        cache.vider()
+    if options.prechauffer:
+        debut = time.perf_counter()
+        cache.prechauffer(options.tailles, range(options.seeds), options.algorithmes, journal=sys.stderr)
+        print(f"Préchauffage : {time.perf_counter() - debut:.1f} s "
+              f"({cache.succes} déjà en cache, {cache.echecs} calculés)")
+    if options.stats or not (options.vider or options.prechauffer):
+        stats = cache.stats()
+        print(f"{options.chemin} : {stats['labyrinthes']} labyrinthes, {stats['resultats']} résultats, "
+              f"{stats['octets'] / 1024 / 1024:.1f} Mio / {stats['taille_max'] / 1024 / 1024:.0f} Mio")
+    cache.fermer()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+charge.py - Client du service (serveur.py) et générateur de charge
+Client ouvre une connexion et envoie des requêtes JSON lines sans attendre
+les réponses (elles sont rapprochées par 'id'). Le générateur de charge
+lance plusieurs clients en parallèle et mesure le débit et les centiles de
+latence (p50, p99).
+
+Exemple :
+    python charge.py --requetes 5000 --connexions 16 --tailles 16 64 --seeds 200
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from banc_essai import centile
+from serveur import PORT, LIGNE_MAX
+
+
+class Client:
+    """
+    Connexion au service. Plusieurs requêtes peuvent être en cours à la
+    fois sur la même connexion.
+
+    Exemple :
+        client = await Client.connecter(port=8765)
+        reponse = await client.requete(op='resoudre', taille=64, seed=3, algorithme='astar')
+        await client.fermer()
+    """
+
+    def __init__(self, lecteur, ecrivain):
+        self._lecteur = lecteur
+        self._ecrivain = ecrivain
+        self._numeros = itertools.count()
+        self._attentes = {}  # id -> Future de la réponse
+        self._reception = asyncio.create_task(self._recevoir())
+
+    @classmethod
+    async def connecter(cls, hote='127.0.0.1', port=PORT, socket_unix=None):
+        if socket_unix:
+            lecteur, ecrivain = await asyncio.open_unix_connection(socket_unix, limit=LIGNE_MAX)
+        else:
+            lecteur, ecrivain = await asyncio.open_connection(hote, port, limit=LIGNE_MAX)
+        return cls(lecteur, ecrivain)
+
+    async def _recevoir(self):
+        try:
+            while True:
+                ligne = await self._lecteur.readline()
+                if not ligne:
+                    break
+                reponse = json.loads(ligne)
+                futur = self._attentes.pop(reponse.get('id'), None)
+                if futur is not None and not futur.done():
+                    futur.set_result(reponse)
+        finally:
+            for futur in self._attentes.values():
+                if not futur.done():
+                    futur.set_exception(ConnectionError("connexion fermée par le service"))
+
+    async def requete(self, **champs):
+        """Envoie une requête et attend sa réponse (dictionnaire)."""
+        identifiant = next(self._numeros)
+        futur = asyncio.get_running_loop().create_future()
+        self._attentes[identifiant] = futur
+        self._ecrivain.write(json.dumps(dict(champs, id=identifiant)).encode('utf-8') + b'\n')
+        await self._ecrivain.drain()
+        return await futur
+
+    async def fermer(self):
+        self._ecrivain.close()
+        await self._ecrivain.wait_closed()
+        await self._reception
+
+
+async def generer_charge(requetes, connexions, tailles, seeds, algorithmes,
+                         hote='127.0.0.1', port=PORT, socket_unix=None, graine=0):
+    """
+    Envoie requetes requêtes 'resoudre' tirées au hasard parmi
+    tailles x seeds x algorithmes, réparties sur plusieurs connexions qui
+    gardent chacune une requête en cours à la fois.
+
+    Returns:
+        Un dictionnaire : requetes, erreurs, duree (s), debit (requêtes/s),
+        p50_ms, p99_ms, max_ms et les statistiques du service
+    """
+    rng = random.Random(graine)
+    travaux = [{'op': 'resoudre', 'taille': rng.choice(tailles), 'seed': rng.randrange(seeds),
+                'algorithme': rng.choice(algorithmes)} for _ in range(requetes)]
+    restants = iter(travaux)
+    latences = []
+    erreurs = 0
+
+    async def boucle(client):
+        nonlocal erreurs
+        for travail in restants:  # itérateur partagé : chaque travail n'est pris qu'une fois
+            debut = time.perf_counter()
+            reponse = await client.requete(**travail)
+            latences.append((time.perf_counter() - debut) * 1000)
+            if not reponse.get('ok'):
+                erreurs += 1
+
+    clients = [await Client.connecter(hote, port, socket_unix) for _ in range(connexions)]
+    debut = time.perf_counter()
+    await asyncio.gather(*(boucle(client) for client in clients))
+    duree = time.perf_counter() - debut
+    stats = await clients[0].requete(op='stats')
+    for client in clients:
+        await client.fermer()
+
+    return {
+        'requetes': len(latences),
+        'erreurs': erreurs,
+        'duree': duree,
+        'debit': len(latences) / duree,
+        'p50_ms': centile(latences, 0.50),
+        'p99_ms': centile(latences, 0.99),
+        'max_ms': max(latences),
+        'service': stats,
+    }
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Générateur de charge pour serveur.py")
+    parseur.add_argument('--hote', default='127.0.0.1')
+    parseur.add_argument('--port', type=int, default=PORT)
+    parseur.add_argument('--socket', help="socket Unix du service")
+    parseur.add_argument('--requetes', type=int, default=2000)
+    parseur.add_argument('--connexions', type=int, default=8, help="clients simultanés")
+    parseur.add_argument('--tailles', type=int, nargs='+', default=[16, 64])
+    parseur.add_argument('--seeds', type=int, default=100, help="seeds tirées parmi 0..N-1")
+    parseur.add_argument('--algorithmes', nargs='+', default=['dfs', 'bfs', 'astar'])
+    options = parseur.parse_args(arguments)
+
+    mesure = asyncio.run(generer_charge(options.requetes, options.connexions, options.tailles,
+                                        options.seeds, options.algorithmes,
+                                        options.hote, options.port, options.socket))
+    service = mesure['service']
+    print(f"{mesure['requetes']} requêtes ({mesure['erreurs']} erreurs) en {mesure['duree']:.2f} s : "
+          f"{mesure['debit']:.0f} requêtes/s")
+    print(f"Latence : p50 {mesure['p50_ms']:.2f} ms, p99 {mesure['p99_ms']:.2f} ms, max {mesure['max_ms']:.2f} ms")
+    print(f"Service : {service['calculs']} calculs, {service['fusionnees']} requêtes fusionnées, "
+          f"cache des résultats {service['cache_resultats']['succes']} succès / "
+          f"{service['cache_resultats']['echecs']} échecs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+coeur.py - Moteur de recherche commun à DFS, BFS et A*
+Les trois recherches ne diffèrent que par leur frontière : une pile (DFS),
+une file (BFS), un tas ou une file à seaux (A*). Le moteur prépare une seule
+fois ce qu'elles partagent (S et G, visites, parents, cases explorées,
+deltas des voisins, protocole pas à pas de etapes.Recherche) et déroule une
+boucle serrée propre à chaque famille de frontière : variables locales,
+indices plats, aucun test de limites ni tuple par case.
+
+Deux familles :
+- ordre d'arrivée ('pile', 'file') : une case est marquée visitée dès
+  qu'elle entre dans la frontière, elle n'y entre donc qu'une fois ;
+- priorité ('tas', 'seaux') : une case n'est marquée qu'à sa sortie, car
+  une entrée ultérieure peut lui donner un meilleur g ; les entrées déjà
+  visitées sont ignorées à la sortie (retraits périmés).
+"""
+
+import heapq
+from collections import deque
+
+# Frontières du moteur
+FRONTIERES = ('pile', 'file', 'tas', 'seaux')
+
+
+def parcourir(laby, frontiere, heuristique=None):
+    """
+    Générateur de recherche (protocole de etapes.Recherche).
+
+    Args:
+        laby: LabyrintheCompact
+        frontiere: 'pile', 'file', 'tas' ou 'seaux'
+        heuristique: Pour 'tas' seulement : fonction indice -> estimation de
+            la distance jusqu'à laby.arrivee (cohérente), ou None pour la
+            distance de Manhattan calculée dans la boucle. 'seaux' suppose
+            la distance de Manhattan.
+    """
+    if frontiere == 'pile':
+        return _parcours_ordre(laby, lifo=True)
+    if frontiere == 'file':
+        return _parcours_ordre(laby, lifo=False)
+    if frontiere == 'tas':
+        return _parcours_tas(laby, heuristique)
+    if frontiere == 'seaux':
+        return _parcours_seaux(laby)
+    raise ValueError(f"Frontière inconnue : {frontiere!r} (choix : {', '.join(FRONTIERES)})")
+
+
+def _preparer(laby):
+    """
+    État partagé par toutes les boucles :
+    - visites : un octet par case, copié de la grille pour que les murs
+      comptent déjà comme visités (un seul test par voisin) ;
+    - parents : parent de chaque case (tableau d'entiers) ;
+    - explores : toutes les cases développées, dans l'ordre.
+    """
+    return bytearray(laby.cases), laby.tableau_indices(), []
+
+
+def _parcours_ordre(laby, lifo):
+    """
+    Boucle DFS (lifo) ou BFS : la frontière ne contient que des positions,
+    le parent est fixé à l'ajout. Seule la méthode de retrait change :
+    pop (dernier entré) ou popleft (premier entré).
+    """
+    depart = laby.depart
+    arrivee = laby.arrivee
+    visites, parents, explores = _preparer(laby)
+    visites[depart] = 1
+    explorer = explores.append
+    deltas = laby.deltas
+
+    # Pile : liste (pop en O(1) par la fin) ; file : deque (popleft en O(1))
+    frontiere = [depart] if lifo else deque([depart])
+    ajouter = frontiere.append
+    retirer = frontiere.pop if lifo else frontiere.popleft
+
+    # Taille du lot à développer avant de rendre la main (-1 = sans limite).
+    # Une case n'entre qu'une fois dans la frontière : aucun retrait périmé.
+    lot = yield explores, frontiere.__len__, lambda: 0
+
+    while frontiere:
+        position = retirer()
+        explorer(position)
+
+        if position == arrivee:
+            return parents
+
+        # Voisins dans l'ordre : droite, bas, gauche, haut
+        for delta in deltas:
+            voisin = position + delta
+            if not visites[voisin]:
+                visites[voisin] = 1
+                parents[voisin] = position
+                ajouter(voisin)
+
+        lot -= 1
+        if not lot:
+            lot = yield
+
+    return None
+
+
+def _parcours_tas(laby, heuristique=None):
+    """
+    Boucle A* avec heapq.
+
+    heuristique : fonction indice -> estimation, ou None pour la distance
+    de Manhattan calculée directement dans la boucle.
+
+    Les entrées restent des tuples (f, compteur, position, parent, g) :
+    des clés entières empaquetées (f, compteur et position dans un seul
+    int, g dans un tableau à part) ont été mesurées plus lentes sur les
+    labyrinthes parfaits, le cas courant (voir README).
+    """
+    depart = laby.depart
+    arrivee = laby.arrivee
+
+    # La distance de Manhattan se calcule directement sur les indices plats :
+    # ligne = indice // largeur et colonne = indice % largeur
+    largeur = laby.largeur
+    ligne_arrivee, colonne_arrivee = divmod(arrivee, largeur)
+
+    # File de priorité : (f_score, compteur, position, parent, g_score)
+    # Le compteur sert à départager les cas où f_score est identique.
+    # On ne stocke plus le chemin complet, seulement le parent et g(n).
+    compteur = 0
+    if heuristique is None:
+        h_depart = abs(depart // largeur - ligne_arrivee) + abs(depart % largeur - colonne_arrivee)
+    else:
+        h_depart = heuristique(depart)
+    file_priorite = [(h_depart, compteur, depart, depart, 0)]
+    pousser = heapq.heappush
+    extraire = heapq.heappop
+
+    # Cases déjà visitées (les murs comptent déjà comme visités)
+    visites = bytearray(laby.cases)
+
+    # Parent de chaque case visitée, fixé au moment où elle sort de la file
+    parents = laby.tableau_indices()
+
+    # Toutes les cases explorées, dans l'ordre (pour la visualisation)
+    explores = []
+    explorer = explores.append
+
+    # Les 4 directions : droite, bas, gauche, haut
+    deltas = laby.deltas
+
+    # Retraits d'entrées périmées (compteur en liste : il n'est touché que
+    # sur ce chemin rare, la boucle principale n'en paie rien)
+    perimes = [0]
+
+    # Taille du lot à développer avant de rendre la main (-1 = sans limite)
+    lot = yield explores, file_priorite.__len__, lambda: perimes[0]
+
+    while file_priorite:
+        # Extraire la case avec le plus petit f(n)
+        f_score, _, position, parent, g_score = extraire(file_priorite)
+        
+        # Si déjà visité, on passe (on a peut-être trouvé un meilleur chemin entre-temps)
+        if visites[position]:
+            perimes[0] += 1
+            continue
+            
+        visites[position] = 1
+        explorer(position)
+        parents[position] = parent
+
+        # Si on a trouvé l'arrivée
+        if position == arrivee:
+            return parents
+
+        # g(voisin) = g(position) + 1 (coût d'un pas)
+        nouveau_g = g_score + 1
+
+        # Explorer les voisins
+        for delta in deltas:
+            voisin = position + delta
+
+            if not visites[voisin]:
+                # h(voisin) = distance de Manhattan jusqu'à l'arrivée
+                if heuristique is None:
+                    h = abs(voisin // largeur - ligne_arrivee) + abs(voisin % largeur - colonne_arrivee)
+                else:
+                    h = heuristique(voisin)
+                # f(voisin) = g + h
+                nouveau_f = nouveau_g + h
+
+                compteur += 1
+                pousser(file_priorite, (nouveau_f, compteur, voisin, position, nouveau_g))
+
+        lot -= 1
+        if not lot:
+            lot = yield
+
+    return None
+
+
+def _parcours_seaux(laby):
+    """
+    Boucle A* avec une file à seaux (algorithme de Dial).
+
+    Tous les coûts valent 1 et la distance de Manhattan change exactement
+    de ±1 à chaque pas : un voisin a donc f(voisin) = f ou f + 2. Les seaux
+    sont indexés par f (seaux[k] contient les entrées de f = f_depart + 2k)
+    et on ne remplit jamais que le seau courant ou le suivant : ajout et
+    retrait sont en O(1), sans tas.
+
+    Départage en faveur du plus grand g : quand un seau devient courant, on
+    le trie une fois par g croissant et on retire par la fin. Ensuite, les
+    seules entrées ajoutées au seau courant ont g + 1 où g est le plus grand
+    g du seau : elles arrivent déjà en fin de liste, l'ordre reste trié.
+
+    La recherche s'arrête quand le seau courant est vidé et que le suivant
+    est vide : plus aucune entrée n'attend, G n'est pas atteignable (None).
+    """
+    depart = laby.depart
+    arrivee = laby.arrivee
+    visites, parents, explores = _preparer(laby)
+    explorer = explores.append
+    deltas = laby.deltas
+    largeur = laby.largeur
+    ligne_arrivee, colonne_arrivee = divmod(arrivee, largeur)
+
+    # Entrées : (g_score, position, parent)
+    f_depart = abs(depart // largeur - ligne_arrivee) + abs(depart % largeur - colonne_arrivee)
+    seaux = [[(0, depart, depart)]]
+    k = 0
+
+    # Retraits d'entrées périmées (voir _parcours_tas)
+    perimes = [0]
+
+    lot = yield explores, lambda: sum(len(seau) for seau in seaux[k:]), lambda: perimes[0]
+
+    # Entrées en attente : seul le seau suivant peut en recevoir, donc quand
+    # le seau courant est vidé il ne reste que celles du seau suivant
+    en_attente = 1
+    while en_attente:
+        seau = seaux[k]
+        seau.sort()  # par g croissant : on retire le plus grand g en premier
+        ajouter_courant = seau.append
+        retirer = seau.pop
+        if k + 1 == len(seaux):
+            seaux.append([])
+        ajouter_suivant = seaux[k + 1].append
+        f_score = f_depart + 2 * k
+
+        while seau:
+            g_score, position, parent = retirer()
+            if visites[position]:
+                perimes[0] += 1
+                continue
+            visites[position] = 1
+            explorer(position)
+            parents[position] = parent
+
+            if position == arrivee:
+                return parents
+
+            h = f_score - g_score
+            nouveau_g = g_score + 1
+            for delta in deltas:
+                voisin = position + delta
+                if not visites[voisin]:
+                    # Le voisin se rapproche de G : même f, sinon f + 2
+                    if abs(voisin // largeur - ligne_arrivee) + abs(voisin % largeur - colonne_arrivee) < h:
+                        ajouter_courant((nouveau_g, voisin, position))
+                    else:
+                        ajouter_suivant((nouveau_g, voisin, position))
+
+            lot -= 1
+            if not lot:
+                lot = yield
+
+        seaux[k] = None  # seau vidé : libérer la mémoire
+        k += 1
+        en_attente = len(seaux[k])  # 0 : G n'est pas atteignable
+
+    return None
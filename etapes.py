@@ -0,0 +1,224 @@
+"""
+etapes.py - Recherches pas à pas, avec budgets et reprise
+Chaque recherche (dfs, bfs, astar) est écrite comme un générateur qui
+développe un lot de cases puis rend la main. Recherche pilote ce générateur :
+on peut l'avancer par budgets de noeuds ou de temps, la reprendre plus tard,
+entrelacer plusieurs recherches ou suivre chaque expansion pour un affichage.
+dfs(), bfs() et astar() font simplement avancer leur recherche jusqu'au bout,
+en un seul lot.
+"""
+
+import time
+import tracemalloc
+
+# Avec un budget de temps, l'horloge n'est consultée qu'entre deux lots
+# de cette taille (consulter l'horloge à chaque case coûterait trop cher)
+LOT_TEMPS = 256
+
+
+class Recherche:
+    """
+    Recherche en cours, reprise là où elle s'est arrêtée.
+
+    Le générateur d'un algorithme suit ce protocole :
+    - il rend d'abord sa liste explores (indices plats, dans l'ordre) et
+      deux fonctions sans argument : la taille actuelle de sa frontière et
+      le nombre de retraits d'entrées périmées (déjà visitées) ;
+    - on lui envoie ensuite un nombre de cases à développer (-1 = sans
+      limite) et il rend la main une fois ce lot développé ;
+    - quand la recherche est finie, il retourne ses parents (ou None si G
+      n'est pas atteignable).
+    Le compteur de lot est le seul coût ajouté dans la boucle. Les ajouts
+    et retraits de la frontière se déduisent de ces valeurs (voir mesures) :
+    la boucle n'a aucun compteur à tenir.
+
+    Exemple :
+        recherche = bfs_etapes(laby)
+        while not recherche.avancer(budget_noeuds=1000, budget_temps=5):
+            print(recherche.noeuds_explores)  # progression
+        resultat = recherche.resultat()
+
+        for ligne, colonne in astar_etapes(laby):  # une case par expansion
+            ...
+    """
+
+    def __init__(self, laby, generateur, debut_temps=None):
+        """
+        Args:
+            laby: LabyrintheCompact parcouru
+            generateur: Générateur de l'algorithme (voir le protocole)
+            debut_temps: perf_counter() du début de la préparation, pour que
+                'temps' la compte (comme les fonctions de recherche)
+        """
+        reprise = time.perf_counter()
+        self.laby = laby
+        self.termine = False
+        self.parents = None
+        self._generateur = generateur
+        self.explores, self._taille_frontiere, self._perimes = next(generateur)
+
+        # Instrumentation (voir resoudre_instrumente) : si instrumente est
+        # vrai, la frontière est relevée après chaque expansion
+        self.instrumente = False
+        self.pic_frontiere = self._taille_frontiere()
+
+        # Durées des trois phases, en secondes
+        self._preparation = reprise - debut_temps if debut_temps is not None else 0.0
+        self._preparation += time.perf_counter() - reprise
+        self._recherche = 0.0
+        self._reconstruction = 0.0
+
+    @property
+    def noeuds_explores(self):
+        """Nombre de cases développées jusqu'ici."""
+        return len(self.explores)
+
+    @property
+    def taille_frontiere(self):
+        """Nombre d'entrées dans la frontière (pile, file ou tas) en ce moment."""
+        return self._taille_frontiere()
+
+    @property
+    def temps(self):
+        """Temps passé à chercher (en ms), pauses exclues."""
+        return (self._preparation + self._recherche + self._reconstruction) * 1000
+
+    def mesures(self):
+        """
+        Compteurs de la recherche :
+        - retraits = expansions + retraits périmés
+        - ajouts = retraits + entrées encore dans la frontière
+        - pic_frontiere (exact seulement si instrumente était vrai)
+        - durée de chaque phase en ms : préparation (conversion, tableaux),
+          recherche, reconstruction du chemin
+        """
+        retraits = len(self.explores) + self._perimes()
+        return {
+            'ajouts': retraits + self._taille_frontiere(),
+            'retraits': retraits,
+            'retraits_perimes': self._perimes(),
+            'pic_frontiere': self.pic_frontiere,
+            'temps_preparation': self._preparation * 1000,
+            'temps_recherche': self._recherche * 1000,
+            'temps_reconstruction': self._reconstruction * 1000,
+        }
+
+    def _lot(self, taille):
+        """Développe au plus taille cases (-1 = jusqu'au bout). Retourne termine."""
+        try:
+            if not self.instrumente:
+                self._generateur.send(taille)
+            else:
+                # Une expansion à la fois pour relever la frontière
+                envoyer = self._generateur.send
+                taille_frontiere = self._taille_frontiere
+                pic = self.pic_frontiere
+                while taille:
+                    envoyer(1)
+                    if taille_frontiere() > pic:
+                        pic = self.pic_frontiere = taille_frontiere()
+                    taille -= 1
+        except StopIteration as fin:
+            self.termine = True
+            self.parents = fin.value
+        return self.termine
+
+    def avancer(self, budget_noeuds=None, budget_temps=None):
+        """
+        Fait avancer la recherche.
+
+        Args:
+            budget_noeuds: Nombre maximum de cases à développer (None = sans limite)
+            budget_temps: Temps maximum en ms (None = sans limite), vérifié
+                toutes les LOT_TEMPS cases
+
+        Returns:
+            True si la recherche est terminée
+        """
+        if self.termine or budget_noeuds == 0:
+            return self.termine
+        debut = time.perf_counter()
+        if budget_temps is None:
+            self._lot(-1 if budget_noeuds is None else budget_noeuds)
+        else:
+            echeance = debut + budget_temps / 1000
+            restant = budget_noeuds
+            while restant is None or restant > 0:
+                taille = LOT_TEMPS if restant is None else min(restant, LOT_TEMPS)
+                avant = len(self.explores)
+                if self._lot(taille) or time.perf_counter() >= echeance:
+                    break
+                if restant is not None:
+                    restant -= len(self.explores) - avant
+        self._recherche += time.perf_counter() - debut
+        return self.termine
+
+    def __iter__(self):
+        """Une case (ligne, colonne) par expansion, jusqu'à la fin de la recherche."""
+        explores = self.explores
+        coordonnees = self.laby.coordonnees
+        while not self.termine:
+            avant = len(explores)
+            self.avancer(budget_noeuds=1)
+            for indice in explores[avant:]:
+                yield coordonnees(indice)
+
+    def resultat(self):
+        """
+        Termine la recherche si besoin et retourne le dictionnaire habituel
+        (chemin, explores, noeuds_explores, longueur, temps), ou None.
+        """
+        self.avancer()
+        if self.parents is None:
+            return None
+        debut = time.perf_counter()
+        laby = self.laby
+        chemin = laby.reconstruire_chemin(self.parents, laby.arrivee)
+        self._reconstruction += time.perf_counter() - debut
+        return {
+            'chemin': chemin,
+            'explores': laby.ensemble_coordonnees(self.explores),
+            'noeuds_explores': len(self.explores),
+            'longueur': len(chemin),
+            'temps': self.temps
+        }
+
+
+def resoudre_instrumente(fabrique):
+    """
+    Lance une recherche jusqu'au bout avec l'instrumentation complète.
+
+    Sans instrumentation, les recherches ne paient rien : les compteurs se
+    déduisent de l'état final. Avec, la frontière est relevée après chaque
+    expansion et tracemalloc suit les allocations : 'temps' et les durées
+    des phases incluent ce surcoût.
+
+    Args:
+        fabrique: Fonction debut_temps -> Recherche (par exemple
+            lambda debut: bfs_etapes(laby, debut))
+
+    Returns:
+        Le dictionnaire habituel avec en plus 'instrumentation' (voir
+        Recherche.mesures, plus 'octets_alloues' : pic des allocations
+        Python pendant l'appel), ou None s'il n'y a pas de chemin
+    """
+    deja_actif = tracemalloc.is_tracing()
+    if deja_actif:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        avant = tracemalloc.get_traced_memory()[0]
+        recherche = fabrique(time.perf_counter())
+        recherche.instrumente = True
+        resultat = recherche.resultat()
+        pic = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not deja_actif:
+            tracemalloc.stop()
+
+    if resultat is not None:
+        mesures = recherche.mesures()
+        mesures['octets_alloues'] = pic - avant
+        resultat['instrumentation'] = mesures
+    return resultat
@@ -0,0 +1,446 @@
+"""
+hierarchique.py - Recherche hiérarchique (HPA*) pour les très grands labyrinthes
+Le labyrinthe est découpé en blocs carrés (clusters). Une seule fois, on
+repère les passages entre blocs voisins (entrées) et on calcule les distances
+entre les entrées d'un même bloc. Une requête S -> G cherche alors un chemin
+dans ce petit graphe abstrait, puis le raffine bloc par bloc.
+"""
+
+import time
+import heapq
+from array import array
+from collections import deque
+
+from maze import LabyrintheCompact, MUR, en_compact
+
+# Côté d'un bloc par défaut, en cases
+TAILLE_CLUSTER = 16
+
+# Un passage plus long que ce seuil reçoit une entrée à chaque bout
+# au lieu d'une seule au milieu (règle habituelle de HPA*)
+LONGUEUR_PASSAGE_DOUBLE = 6
+
+
+class CarteHierarchique:
+    """
+    Abstraction HPA* d'un labyrinthe, réutilisable pour toutes les requêtes.
+
+    Chaque bloc connaît ses entrées (cases de son bord qui donnent sur une
+    case libre du bloc voisin) et la distance, à l'intérieur du bloc, entre
+    chaque paire d'entrées. Le graphe abstrait relie :
+    - deux entrées d'un même bloc, avec leur distance dans le bloc ;
+    - les deux cases d'un passage entre blocs, avec un poids de 1.
+
+    La carte garde sa propre copie de la grille : modifier_case change une
+    case et ne marque que les blocs touchés, reconstruits à la requête
+    suivante (un lot de modifications coûte une seule reconstruction).
+
+    Le chemin trouvé est très proche de l'optimal mais pas toujours optimal
+    (une seule entrée par passage court) ; dans un labyrinthe parfait, où le
+    chemin est unique, c'est exactement celui de bfs().
+
+    Exemple :
+        carte = CarteHierarchique(laby, taille_cluster=16)
+        resultat = carte.chercher()
+        carte.modifier_case(10, 12, mur=True)
+        resultat = carte.chercher((1, 1), (200, 300))
+    """
+
+    def __init__(self, labyrinthe, taille_cluster=TAILLE_CLUSTER):
+        source = en_compact(labyrinthe)
+        self.laby = LabyrintheCompact(bytearray(source.cases), source.lignes, source.colonnes,
+                                      source.depart, source.arrivee)
+        self.taille_cluster = taille_cluster
+        self.clusters_lignes = -(-source.lignes // taille_cluster)
+        self.clusters_colonnes = -(-source.colonnes // taille_cluster)
+        self.clusters_reconstruits = 0
+
+        self._entrees = {}      # bord -> liste de (case, case d'en face)
+        self._traversees = {}   # case -> cases d'en face (poids 1)
+        self._noeuds = {}       # bloc -> ensemble des entrées du bloc
+        self._intra = {}        # bloc -> {entrée: [(autre entrée, distance)]}
+        self._grilles = {}      # bloc -> grille locale (voir _grille_locale)
+        self._sales = set()     # blocs à reconstruire
+
+        debut = time.perf_counter()
+        for bord in self._tous_les_bords():
+            self._calculer_bord(bord)
+        for bloc in range(self.clusters_lignes * self.clusters_colonnes):
+            self._calculer_noeuds(bloc)
+            self._calculer_intra(bloc)
+        self.temps_construction = (time.perf_counter() - debut) * 1000
+
+    # --- Découpage ---
+
+    def bloc(self, case):
+        """Numéro du bloc qui contient la case (indice plat)."""
+        largeur = self.laby.largeur
+        taille = self.taille_cluster
+        return (case // largeur - 1) // taille * self.clusters_colonnes + case % largeur // taille
+
+    def _limites(self, bloc):
+        """(ligne_min, ligne_max, colonne_min, colonne_max) du bloc, bornes max exclues."""
+        taille = self.taille_cluster
+        i, j = divmod(bloc, self.clusters_colonnes)
+        return (i * taille, min((i + 1) * taille, self.laby.lignes),
+                j * taille, min((j + 1) * taille, self.laby.colonnes))
+
+    def _tous_les_bords(self):
+        for i in range(self.clusters_lignes):
+            for j in range(self.clusters_colonnes):
+                if j + 1 < self.clusters_colonnes:
+                    yield ('droite', i, j)
+                if i + 1 < self.clusters_lignes:
+                    yield ('bas', i, j)
+
+    def _bords_du_bloc(self, bloc):
+        """Les (au plus 4) bords du bloc."""
+        i, j = divmod(bloc, self.clusters_colonnes)
+        bords = []
+        if j + 1 < self.clusters_colonnes:
+            bords.append(('droite', i, j))
+        if j > 0:
+            bords.append(('droite', i, j - 1))
+        if i + 1 < self.clusters_lignes:
+            bords.append(('bas', i, j))
+        if i > 0:
+            bords.append(('bas', i - 1, j))
+        return bords
+
+    def _blocs_du_bord(self, bord):
+        sens, i, j = bord
+        bloc = i * self.clusters_colonnes + j
+        return bloc, bloc + (1 if sens == 'droite' else self.clusters_colonnes)
+
+    # --- Construction ---
+
+    def _calculer_bord(self, bord):
+        """Repère les passages d'un bord et met à jour les traversées."""
+        laby = self.laby
+        cases = laby.cases
+        taille = self.taille_cluster
+        sens, i, j = bord
+
+        # Paires (case, case d'en face) le long du bord
+        if sens == 'droite':
+            colonne = (j + 1) * taille - 1
+            paires = [(laby.indice(ligne, colonne), laby.indice(ligne, colonne + 1))
+                      for ligne in range(i * taille, min((i + 1) * taille, laby.lignes))]
+        else:
+            ligne = (i + 1) * taille - 1
+            paires = [(laby.indice(ligne, colonne), laby.indice(ligne + 1, colonne))
+                      for colonne in range(j * taille, min((j + 1) * taille, laby.colonnes))]
+
+        # Passages = suites maximales de paires libres des deux côtés
+        entrees = []
+        passage = []
+        for paire in paires + [None]:
+            if paire is not None and not cases[paire[0]] and not cases[paire[1]]:
+                passage.append(paire)
+                continue
+            if len(passage) >= LONGUEUR_PASSAGE_DOUBLE:
+                entrees.append(passage[0])
+                entrees.append(passage[-1])
+            elif passage:
+                entrees.append(passage[len(passage) // 2])
+            passage = []
+
+        traversees = self._traversees
+        for a, b in self._entrees.get(bord, ()):
+            traversees[a].remove(b)
+            traversees[b].remove(a)
+        for a, b in entrees:
+            traversees.setdefault(a, []).append(b)
+            traversees.setdefault(b, []).append(a)
+        self._entrees[bord] = entrees
+
+    def _calculer_noeuds(self, bloc):
+        """Entrées du bloc, d'après les passages de ses bords. Retourne True si elles ont changé."""
+        noeuds = set()
+        for bord in self._bords_du_bloc(bloc):
+            premier, _ = self._blocs_du_bord(bord)
+            cote = 0 if premier == bloc else 1
+            for paire in self._entrees[bord]:
+                noeuds.add(paire[cote])
+        change = noeuds != self._noeuds.get(bloc)
+        self._noeuds[bloc] = noeuds
+        return change
+
+    def _grille_locale(self, bloc):
+        """
+        Copie du bloc entourée de murs : (cases, largeur locale, vers_local, vers_global).
+        Les recherches locales n'ont ainsi aucun test de limites. La copie est
+        gardée jusqu'à la prochaine modification du bloc.
+        """
+        grille = self._grilles.get(bloc)
+        if grille is None:
+            grille = self._grilles[bloc] = self._copier_bloc(bloc)
+        return grille
+
+    def _copier_bloc(self, bloc):
+        laby = self.laby
+        ligne_min, ligne_max, colonne_min, colonne_max = self._limites(bloc)
+        largeur_locale = colonne_max - colonne_min + 2
+        locales = bytearray([MUR]) * (largeur_locale * (ligne_max - ligne_min + 2))
+        for ligne in range(ligne_min, ligne_max):
+            debut = laby.indice(ligne, colonne_min)
+            local = (ligne - ligne_min + 1) * largeur_locale + 1
+            locales[local:local + colonne_max - colonne_min] = laby.cases[debut:debut + colonne_max - colonne_min]
+
+        largeur = laby.largeur
+
+        def vers_local(case):
+            return (case // largeur - ligne_min) * largeur_locale + case % largeur - colonne_min + 1
+
+        def vers_global(local):
+            return (local // largeur_locale + ligne_min) * largeur + local % largeur_locale - 1 + colonne_min
+
+        return locales, largeur_locale, vers_local, vers_global
+
+    @staticmethod
+    def _bfs_local(locales, largeur_locale, source, cibles=None):
+        """
+        BFS dans une grille locale depuis source.
+
+        Returns:
+            (distances, parents) : array 'i' (-1 = non atteinte) et parents
+            locaux ; on s'arrête dès que toutes les cibles sont atteintes
+        """
+        deltas = (1, largeur_locale, -1, -largeur_locale)
+        distances = array('i', [-1]) * len(locales)
+        parents = array('i', [0]) * len(locales)
+        visites = bytearray(locales)
+        visites[source] = 1
+        distances[source] = 0
+        restantes = len(cibles) if cibles is not None else -1
+        if cibles is not None and source in cibles:
+            restantes -= 1
+        file = deque([source])
+        while file and restantes:
+            position = file.popleft()
+            suivante = distances[position] + 1
+            for delta in deltas:
+                voisin = position + delta
+                if not visites[voisin]:
+                    visites[voisin] = 1
+                    distances[voisin] = suivante
+                    parents[voisin] = position
+                    file.append(voisin)
+                    if cibles is not None and voisin in cibles:
+                        restantes -= 1
+        return distances, parents
+
+    def _distances_dans_bloc(self, bloc, source, cibles):
+        """Distances dans le bloc de source vers chaque cible atteignable : [(cible, distance)]."""
+        locales, largeur_locale, vers_local, _ = self._grille_locale(bloc)
+        cibles_locales = {vers_local(cible): cible for cible in cibles}
+        distances, _ = self._bfs_local(locales, largeur_locale, vers_local(source), set(cibles_locales))
+        return [(cible, distances[local]) for local, cible in cibles_locales.items()
+                if distances[local] >= 0 and cible != source]
+
+    def _calculer_intra(self, bloc):
+        """Distances entre toutes les paires d'entrées du bloc."""
+        noeuds = self._noeuds[bloc]
+        self._intra[bloc] = {noeud: self._distances_dans_bloc(bloc, noeud, noeuds) for noeud in noeuds}
+        self.clusters_reconstruits += 1
+
+    # --- Modifications ---
+
+    def modifier_case(self, ligne, colonne, mur):
+        """
+        Ouvre (mur=False) ou ferme (mur=True) une case. Seul son bloc est
+        marqué à reconstruire ; ses voisins le seront aussi si leurs
+        entrées changent.
+
+        Raises:
+            ValueError: si la case est hors du labyrinthe (les sentinelles
+                doivent rester des murs)
+        """
+        laby = self.laby
+        case = laby.indice_verifie(ligne, colonne)
+        laby.cases[case] = MUR if mur else 0
+        bloc = self.bloc(case)
+        self._sales.add(bloc)
+        self._grilles.pop(bloc, None)
+
+    def _reconstruire(self):
+        """Reconstruit les blocs modifiés depuis la dernière requête."""
+        if not self._sales:
+            return
+        bords = set()
+        for bloc in self._sales:
+            bords.update(self._bords_du_bloc(bloc))
+        for bord in bords:
+            self._calculer_bord(bord)
+        a_refaire = set(self._sales)
+        for bord in bords:
+            for bloc in self._blocs_du_bord(bord):
+                if self._calculer_noeuds(bloc):
+                    a_refaire.add(bloc)
+        for bloc in self._sales:
+            self._calculer_noeuds(bloc)
+        for bloc in a_refaire:
+            self._calculer_intra(bloc)
+        self._sales.clear()
+
+    # --- Requêtes ---
+
+    def _raffiner(self, a, b):
+        """Cases de a (exclue) à b (incluse), deux noeuds consécutifs du chemin abstrait."""
+        bloc = self.bloc(a)
+        if bloc != self.bloc(b):
+            return [b]  # passage entre deux blocs : un seul pas
+        locales, largeur_locale, vers_local, vers_global = self._grille_locale(bloc)
+        source = vers_local(a)
+        position = vers_local(b)
+        _, parents = self._bfs_local(locales, largeur_locale, source, {position})
+        indices = []
+        while position != source:
+            indices.append(vers_global(position))
+            position = parents[position]
+        indices.reverse()
+        return indices
+
+    def chercher(self, depart=None, arrivee=None):
+        """
+        Chemin de depart à arrivee (S et G par défaut).
+
+        Args:
+            depart, arrivee: Positions (ligne, colonne), ou None pour S et G
+
+        Returns:
+            Un dictionnaire contenant les résultats (comme astar.py), ou None
+            s'il n'y a pas de chemin ; 'explores' et 'noeuds_explores' sont
+            les noeuds développés dans le graphe abstrait (entrées des blocs,
+            S et G), pas les cases parcourues au raffinement
+
+        Raises:
+            ValueError: si depart ou arrivee est hors du labyrinthe
+        """
+        debut_temps = time.perf_counter()
+        laby = self.laby
+        largeur = laby.largeur
+        source = laby.depart if depart is None else laby.indice_verifie(*depart)
+        cible = laby.arrivee if arrivee is None else laby.indice_verifie(*arrivee)
+        self._reconstruire()
+
+        if laby.cases[source] or laby.cases[cible]:
+            return None
+
+        # Insérer S et G dans le graphe abstrait : arêtes vers les entrées
+        # de leur bloc (et entre eux s'ils partagent un bloc)
+        supplementaires = {}
+        for extremite, autre in ((source, cible), (cible, source)):
+            bloc = self.bloc(extremite)
+            cibles = set(self._noeuds[bloc])
+            if self.bloc(autre) == bloc:
+                cibles.add(autre)
+            for noeud, distance in self._distances_dans_bloc(bloc, extremite, cibles):
+                supplementaires.setdefault(extremite, []).append((noeud, distance))
+                supplementaires.setdefault(noeud, []).append((extremite, distance))
+
+        # A* sur le graphe abstrait, heuristique de Manhattan
+        ligne_cible, colonne_cible = divmod(cible, largeur)
+        intra = self._intra
+        traversees = self._traversees
+        g = {source: 0}
+        parents = {source: source}
+        fermes = set()
+        file_priorite = [(0, 0, source)]
+        explores = []
+
+        while file_priorite:
+            _, g_score, noeud = heapq.heappop(file_priorite)
+            if noeud in fermes:
+                continue
+            fermes.add(noeud)
+            explores.append(noeud)
+            if noeud == cible:
+                break
+
+            voisins = list(intra[self.bloc(noeud)].get(noeud, ()))
+            voisins.extend((autre, 1) for autre in traversees.get(noeud, ()))
+            voisins.extend(supplementaires.get(noeud, ()))
+            for voisin, poids in voisins:
+                nouveau_g = g_score + poids
+                if voisin not in fermes and nouveau_g < g.get(voisin, nouveau_g + 1):
+                    g[voisin] = nouveau_g
+                    parents[voisin] = noeud
+                    h = abs(voisin // largeur - ligne_cible) + abs(voisin % largeur - colonne_cible)
+                    heapq.heappush(file_priorite, (nouveau_g + h, nouveau_g, voisin))
+        else:
+            return None  # file vidée sans atteindre G
+
+        # Raffinement : chemin case par case entre noeuds consécutifs
+        abstrait = [cible]
+        while abstrait[-1] != source:
+            abstrait.append(parents[abstrait[-1]])
+        abstrait.reverse()
+        indices = [source]
+        for a, b in zip(abstrait, abstrait[1:]):
+            indices.extend(self._raffiner(a, b))
+        chemin = [laby.coordonnees(indice) for indice in indices]
+
+        fin_temps = time.perf_counter()
+        return {
+            'chemin': chemin,
+            'explores': laby.ensemble_coordonnees(explores),
+            'noeuds_explores': len(explores),
+            'longueur': len(chemin),
+            'temps': (fin_temps - debut_temps) * 1000
+        }
+
+
+def astar_hierarchique(labyrinthe, taille_cluster=TAILLE_CLUSTER):
+    """
+    HPA* de S à G. Pour un Labyrinthe, la carte hiérarchique est construite
+    au premier appel puis gardée en cache (le temps du premier appel comprend
+    donc la construction).
+
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+        taille_cluster: Côté d'un bloc, en cases
+
+    Returns:
+        Un dictionnaire contenant les résultats (comme astar.py), ou None
+    """
+    debut_temps = time.perf_counter()
+    if hasattr(labyrinthe, 'en_cache'):
+        carte = labyrinthe.en_cache(('hierarchie', taille_cluster),
+                                    lambda laby: CarteHierarchique(laby, taille_cluster))
+    else:
+        carte = CarteHierarchique(labyrinthe, taille_cluster)
+    resultat = carte.chercher()
+    if resultat is not None:
+        resultat['temps'] = (time.perf_counter() - debut_temps) * 1000
+    return resultat
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    import random
+
+    from maze import generer_labyrinthe
+    from astar import astar
+
+    print(f"{'Taille':<10} {'Algorithme':<22} {'Noeuds':>10} {'Longueur':>10} {'Temps (ms)':>11}")
+    for taille in (256, 1024):
+        laby = generer_labyrinthe(taille=taille, seed=42)
+        carte = CarteHierarchique(laby)
+        print(f"{taille:<10} {'(construction)':<22} {'':>10} {'':>10} {carte.temps_construction:>11.1f}")
+        resultat = astar(laby)
+        print(f"{taille:<10} {'A*':<22} {resultat['noeuds_explores']:>10} "
+              f"{resultat['longueur']:>10} {resultat['temps']:>11.1f}")
+        resultat = carte.chercher()
+        print(f"{taille:<10} {'HPA*':<22} {resultat['noeuds_explores']:>10} "
+              f"{resultat['longueur']:>10} {resultat['temps']:>11.1f}")
+
+        # Quelques cases ouvertes au hasard : seuls leurs blocs sont refaits
+        rng = random.Random(0)
+        avant = carte.clusters_reconstruits
+        for _ in range(10):
+            carte.modifier_case(rng.randrange(1, taille - 1), rng.randrange(1, taille - 1), mur=False)
+        resultat = carte.chercher()
+        print(f"{taille:<10} {'HPA* après 10 cases':<22} {resultat['noeuds_explores']:>10} "
+              f"{resultat['longueur']:>10} {resultat['temps']:>11.1f}"
+              f"  ({carte.clusters_reconstruits - avant} blocs refaits)")
@@ -0,0 +1,215 @@
+"""
+incremental.py - Replanification incrémentale (LPA*) quand des murs changent
+Quand on ouvre ou ferme quelques cases, relancer astar() refait toute la
+recherche. LPA* (Lifelong Planning A*) garde ses valeurs g et rhs d'une
+requête à l'autre et ne répare que la partie de la recherche touchée par
+les modifications.
+"""
+
+import time
+import heapq
+from array import array
+
+from astar import heuristique_manhattan
+from maze import LabyrintheCompact, MUR, LIBRE, en_compact
+
+# Distance « infinie » (case non atteinte), assez grande pour toute grille
+INFINI = 2 ** 62
+
+
+class PlanificateurIncremental:
+    """
+    Planificateur LPA* de S à G sur une grille qui change.
+
+    Pour chaque case :
+    - g : distance depuis S connue à la dernière expansion de la case
+    - rhs : meilleure distance annoncée par ses voisins (min g(voisin) + 1)
+    Une case est cohérente quand g == rhs. Seules les cases incohérentes
+    passent par la file, triées par la clé
+        (min(g, rhs) + h, min(g, rhs))
+    avec h = heuristique_manhattan vers G. Après un lot de modifications,
+    seules les cases modifiées et leurs voisines deviennent incohérentes :
+    la réparation ne touche que la partie de la recherche qui en dépend.
+
+    Le planificateur garde sa propre copie de la grille (laby) ; g et rhs
+    coûtent 8 octets par case chacun.
+
+    Exemple :
+        planificateur = PlanificateurIncremental(laby)
+        resultat = planificateur.planifier()
+        planificateur.modifier_cases([(10, 12, False), (3, 4, True)])
+        resultat = planificateur.planifier()
+    """
+
+    def __init__(self, labyrinthe):
+        source = en_compact(labyrinthe)
+        self.laby = LabyrintheCompact(bytearray(source.cases), source.lignes, source.colonnes,
+                                      source.depart, source.arrivee)
+        self.g = array('q', [INFINI]) * len(self.laby.cases)
+        self.rhs = array('q', [INFINI]) * len(self.laby.cases)
+        self.rhs[self.laby.depart] = 0
+        self._cible = self.laby.coordonnees(self.laby.arrivee)
+        self._file = [(self._cle(self.laby.depart), self.laby.depart)]
+
+    def _h(self, case):
+        return heuristique_manhattan(self.laby.coordonnees(case), self._cible)
+
+    def _cle(self, case):
+        distance = min(self.g[case], self.rhs[case])
+        return (distance + self._h(case), distance)
+
+    def _mettre_a_jour(self, case):
+        """Recalcule rhs(case) depuis ses voisins et la remet en file si elle est incohérente."""
+        laby = self.laby
+        if case != laby.depart:
+            if laby.cases[case]:
+                self.rhs[case] = INFINI
+            else:
+                g = self.g
+                self.rhs[case] = min(INFINI, min(g[case + delta] for delta in laby.deltas) + 1)
+        if self.g[case] != self.rhs[case]:
+            heapq.heappush(self._file, (self._cle(case), case))
+
+    def modifier_cases(self, modifications):
+        """
+        Applique un lot de modifications, sans replanifier.
+
+        Args:
+            modifications: Suite de (ligne, colonne, mur) ; mur=True ferme la
+                case, mur=False l'ouvre. S et G ne peuvent pas être fermés.
+
+        Raises:
+            ValueError: si une case est hors du labyrinthe ou si S ou G
+                serait fermé ; tout le lot est vérifié avant la première
+                écriture, la grille reste donc intacte
+        """
+        laby = self.laby
+        cases = []
+        for ligne, colonne, mur in modifications:
+            case = laby.indice_verifie(ligne, colonne)
+            if mur and case in (laby.depart, laby.arrivee):
+                raise ValueError(f"Impossible de fermer S ou G : {(ligne, colonne)}")
+            cases.append((case, mur))
+
+        touchees = set()
+        for case, mur in cases:
+            laby.cases[case] = MUR if mur else LIBRE
+            touchees.add(case)
+            touchees.update(case + delta for delta in laby.deltas)
+        for case in touchees:
+            # Les sentinelles du bord ne sont jamais mises à jour
+            ligne, colonne = laby.coordonnees(case)
+            if 0 <= ligne < laby.lignes and 0 <= colonne < laby.colonnes:
+                self._mettre_a_jour(case)
+
+    def _reparer(self):
+        """Développe les cases incohérentes jusqu'à ce que G soit cohérente. Retourne les cases développées."""
+        laby = self.laby
+        g = self.g
+        rhs = self.rhs
+        deltas = laby.deltas
+        arrivee = laby.arrivee
+        file_priorite = self._file
+        extraire = heapq.heappop
+        explores = []
+
+        while file_priorite:
+            cle, case = file_priorite[0]
+            # Entrée périmée : case redevenue cohérente ou clé changée depuis
+            if g[case] == rhs[case] or cle != self._cle(case):
+                extraire(file_priorite)
+                continue
+            if cle >= self._cle(arrivee) and g[arrivee] == rhs[arrivee]:
+                break
+            extraire(file_priorite)
+            explores.append(case)
+
+            if g[case] > rhs[case]:
+                # Sur-cohérente : sa distance baisse, on la fixe
+                g[case] = rhs[case]
+                for delta in deltas:
+                    voisin = case + delta
+                    if not laby.cases[voisin]:
+                        self._mettre_a_jour(voisin)
+            else:
+                # Sous-cohérente : sa distance n'est plus valable
+                g[case] = INFINI
+                self._mettre_a_jour(case)
+                for delta in deltas:
+                    voisin = case + delta
+                    if not laby.cases[voisin]:
+                        self._mettre_a_jour(voisin)
+        return explores
+
+    def planifier(self):
+        """
+        Remet la recherche à jour et retourne le chemin de S à G.
+
+        Returns:
+            Un dictionnaire contenant les résultats (comme astar.py), où
+            'noeuds_explores' ne compte que les expansions de cet appel,
+            ou None s'il n'y a pas de chemin
+        """
+        debut_temps = time.perf_counter()
+        explores = self._reparer()
+
+        laby = self.laby
+        g = self.g
+        position = laby.arrivee
+        if g[position] >= INFINI:
+            return None
+
+        # Descendre les g de G jusqu'à S
+        indices = [position]
+        while position != laby.depart:
+            distance = g[position]
+            for delta in laby.deltas:
+                voisin = position + delta
+                if not laby.cases[voisin] and g[voisin] == distance - 1:
+                    position = voisin
+                    break
+            indices.append(position)
+        indices.reverse()
+        chemin = [laby.coordonnees(indice) for indice in indices]
+
+        fin_temps = time.perf_counter()
+        return {
+            'chemin': chemin,
+            'explores': laby.ensemble_coordonnees(explores),
+            'noeuds_explores': len(explores),
+            'longueur': len(chemin),
+            'temps': (fin_temps - debut_temps) * 1000
+        }
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    import random
+
+    from maze import generer_labyrinthe
+    from astar import astar
+
+    # Coût d'une replanification après n murs ouverts (un labyrinthe parfait
+    # resterait souvent coupé en deux si l'on fermait des cases), comparé à
+    # un astar() complet sur la grille modifiée
+    taille = 256
+    laby = generer_labyrinthe(taille=taille, seed=42)
+    print(f"Labyrinthe {taille}x{taille}")
+    print(f"{'Modifications':>13} {'LPA* (ms)':>10} {'Noeuds':>8} {'A* (ms)':>9} {'Noeuds':>8} {'Longueur':>9}")
+    for nombre in (1, 10, 100, 1000):
+        planificateur = PlanificateurIncremental(laby)
+        planificateur.planifier()
+        rng = random.Random(nombre)
+        modifications = []
+        for _ in range(nombre):
+            ligne, colonne = rng.randrange(1, taille - 1), rng.randrange(1, taille - 1)
+            if (ligne, colonne) not in (laby.depart, laby.arrivee):
+                modifications.append((ligne, colonne, False))
+        debut = time.perf_counter()
+        planificateur.modifier_cases(modifications)
+        resultat = planificateur.planifier()
+        duree = (time.perf_counter() - debut) * 1000
+        reference = astar(planificateur.laby)
+        print(f"{nombre:>13} {duree:>10.1f} {resultat['noeuds_explores']:>8} "
+              f"{reference['temps']:>9.1f} {reference['noeuds_explores']:>8} "
+              f"{resultat['longueur']:>4} / {reference['longueur']}")
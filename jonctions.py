@@ -0,0 +1,155 @@
+"""
+jonctions.py - Recherches sur le graphe des jonctions (couloirs compressés)
+Les couloirs d'un labyrinthe sont remplacés par des arêtes pondérées entre
+carrefours, impasses, S et G (voir maze.GrapheJonctions). Dijkstra et A*
+ne paient plus une opération de file par case de couloir, seulement par
+jonction ; le chemin trouvé est ensuite redéplié case par case.
+"""
+
+import time
+import heapq
+from array import array
+
+from maze import en_jonctions
+
+
+def _recherche(labyrinthe, heuristique):
+    """
+    Dijkstra (heuristique=False) ou A* (heuristique=True, distance de
+    Manhattan jusqu'à G) sur le graphe des jonctions.
+
+    Returns:
+        Un dictionnaire contenant les résultats (comme astar.py), ou None
+    """
+    debut_temps = time.perf_counter()
+
+    graphe = en_jonctions(labyrinthe)
+    laby = graphe.laby
+    depart = graphe.depart
+    arrivee = graphe.arrivee
+    if depart is None or arrivee is None:
+        return None
+
+    cellules = graphe.cellules
+    aretes = graphe.aretes
+    largeur = laby.largeur
+    ligne_arrivee, colonne_arrivee = divmod(laby.arrivee, largeur)
+
+    def h(noeud):
+        if not heuristique:
+            return 0
+        case = cellules[noeud]
+        return abs(case // largeur - ligne_arrivee) + abs(case % largeur - colonne_arrivee)
+
+    # Par noeud : distance connue (-1 = inconnue), parent et premier pas de
+    # l'arête qui y mène depuis le parent
+    nb_noeuds = len(graphe)
+    distances = array('q', [-1]) * nb_noeuds
+    parents = array('q', [0]) * nb_noeuds
+    pas = array('q', [0]) * nb_noeuds
+    fermes = bytearray(nb_noeuds)
+    distances[depart] = 0
+
+    # File de priorité : (f, g, noeud) ; g départage les égalités
+    file_priorite = [(h(depart), 0, depart)]
+    pousser = heapq.heappush
+    extraire = heapq.heappop
+    explores = []
+    explorer = explores.append
+
+    while file_priorite:
+        _, g_score, noeud = extraire(file_priorite)
+        if fermes[noeud]:
+            continue  # entrée périmée
+        fermes[noeud] = 1
+        explorer(cellules[noeud])
+
+        if noeud == arrivee:
+            break
+
+        for voisin, poids, delta in aretes[noeud]:
+            if fermes[voisin]:
+                continue
+            nouveau_g = g_score + poids
+            if distances[voisin] < 0 or nouveau_g < distances[voisin]:
+                distances[voisin] = nouveau_g
+                parents[voisin] = noeud
+                pas[voisin] = delta
+                pousser(file_priorite, (nouveau_g + h(voisin), nouveau_g, voisin))
+    else:
+        return None  # file vidée sans atteindre G
+
+    # Redéplier le chemin : chaque arête redevient son couloir
+    troncons = []
+    noeud = arrivee
+    while noeud != depart:
+        parent = parents[noeud]
+        troncons.append(graphe.couloir(parent, pas[noeud]))
+        noeud = parent
+    indices = [cellules[depart]]
+    for troncon in reversed(troncons):
+        indices.extend(troncon)
+    chemin = [laby.coordonnees(indice) for indice in indices]
+
+    fin_temps = time.perf_counter()
+    return {
+        'chemin': chemin,
+        'explores': laby.ensemble_coordonnees(explores),
+        'noeuds_explores': len(explores),
+        'longueur': len(chemin),
+        'temps': (fin_temps - debut_temps) * 1000
+    }
+
+
+def dijkstra_jonctions(labyrinthe):
+    """
+    Dijkstra sur le graphe des jonctions.
+
+    'noeuds_explores' compte les jonctions développées (et non les cases de
+    couloir traversées). Pour un Labyrinthe, le graphe est construit au
+    premier appel puis gardé en cache : le temps du premier appel comprend
+    donc la compression.
+
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+
+    Returns:
+        Un dictionnaire contenant les résultats (comme bfs.py), ou None
+    """
+    return _recherche(labyrinthe, heuristique=False)
+
+
+def astar_jonctions(labyrinthe):
+    """
+    A* sur le graphe des jonctions, heuristique de Manhattan.
+
+    Une arête est au moins aussi longue que la distance de Manhattan entre
+    ses extrémités : l'heuristique reste cohérente et le chemin optimal.
+
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+
+    Returns:
+        Un dictionnaire contenant les résultats (comme astar.py), ou None
+    """
+    return _recherche(labyrinthe, heuristique=True)
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    from maze import generer_labyrinthe
+    from bfs import bfs
+    from astar import astar
+
+    print(f"{'Taille':<10} {'Algorithme':<20} {'Noeuds':>10} {'Longueur':>10} {'Temps (ms)':>11}")
+    for taille in (16, 256, 1024):
+        laby = generer_labyrinthe(taille=taille, seed=42)
+        debut = time.perf_counter()
+        graphe = laby.jonctions()
+        compression = (time.perf_counter() - debut) * 1000
+        print(f"{taille:<10} {'(compression)':<20} {len(graphe):>10} {'':>10} {compression:>11.1f}")
+        for nom, recherche in (('BFS', bfs), ('A*', astar),
+                               ('Dijkstra jonctions', dijkstra_jonctions), ('A* jonctions', astar_jonctions)):
+            resultat = recherche(laby)
+            print(f"{taille:<10} {nom:<20} {resultat['noeuds_explores']:>10} "
+                  f"{resultat['longueur']:>10} {resultat['temps']:>11.1f}")
@@ -0,0 +1,476 @@
+"""
+lot_numpy.py - Génération et résolution par lots avec NumPy
+Pour des dizaines de milliers de petits labyrinthes, le coût par
+labyrinthe de generer_labyrinthe et de bfs() est surtout celui de
+l'interpréteur. Ici, N labyrinthes sont traités ensemble, un tableau NumPy
+par étape au lieu d'une boucle Python par labyrinthe :
+- generer_lot : N labyrinthes (un par seed) dans un seul tableau
+  (N, taille, taille), identiques à generer_labyrinthe(taille, seed) ;
+- bfs_lot : un seul BFS par vagues sur tout le lot, mêmes longueurs, mêmes
+  noeuds explorés et mêmes chemins que bfs() labyrinthe par labyrinthe.
+
+NumPy est optionnel : sans lui, ce module s'importe quand même (DISPONIBLE
+vaut False) et generer_labyrinthe / bfs() restent la version de référence.
+"""
+
+import time
+
+from maze import MUR, LIBRE
+
+try:
+    import numpy as np
+except ImportError:  # NumPy absent : seules les versions standard sont utilisables
+    np = None
+
+DISPONIBLE = np is not None
+
+# --- Mersenne Twister (MT19937) de random.Random, une colonne par seed ---
+_N = 624
+_M = 397
+_MATRICE = 0x9908B0DF
+_BIT_HAUT = 0x80000000
+_BITS_BAS = 0x7FFFFFFF
+_MASQUE = 0xFFFFFFFF
+
+# Cases de la grille de travail (même rôle que dans maze._creuser_iteratif,
+# valeurs choisies pour que le passage vaille LIBRE et le reste MUR)
+_PASSAGE = LIBRE
+_A_CREUSER = MUR
+_BORD = 2
+
+# rng.shuffle([1, 2, 3, 4]) tire j3 dans 0..3, puis j2 dans 0..2, puis j1
+# dans 0..1 (random._randbelow : getrandbits(n.bit_length()) jusqu'à avoir
+# une valeur < n). Soit, pour chaque mot de 32 bits : j3 = ses 3 bits de
+# poids fort s'ils valent moins de 4, j2 = ses 2 bits de poids fort s'ils
+# valent moins de 3, j1 = les mêmes s'ils valent moins de 2.
+
+# Mots traités à la fois lors du tirage des mélanges (tranche de l'état)
+_TRANCHE_MOTS = 64
+
+
+def _tables_tirage():
+    """Acceptation, valeur et étape suivante (* 8) pour chaque (étape * 8 + 3 bits)."""
+    acceptation, valeur, suivante = [], [], []
+    for etape, (bits, borne) in enumerate(((3, 4), (2, 3), (2, 2))):
+        for hauts in range(8):
+            tire = hauts >> (3 - bits)
+            accepte = tire < borne
+            acceptation.append(int(accepte))
+            valeur.append(tire)
+            suivante.append(8 * ((etape + accepte) % 3))
+    return acceptation, valeur, suivante
+
+
+def _verifier_numpy():
+    if np is None:
+        raise ImportError("lot_numpy nécessite NumPy (pip install numpy) ; "
+                          "utiliser generer_labyrinthe et bfs.bfs sinon")
+
+
+def _codes_melange():
+    """
+    Entrée de pile (ordre[0] + 5 * ordre[1] + 25 * ordre[2] + 125 * ordre[3],
+    voir maze._creuser_iteratif) pour chacun des 24 triplets (j3, j2, j1),
+    indexés par j3 * 6 + j2 * 2 + j1.
+    """
+    codes = []
+    for j3 in range(4):
+        for j2 in range(3):
+            for j1 in range(2):
+                ordre = [1, 2, 3, 4]
+                for i, j in ((3, j3), (2, j2), (1, j1)):
+                    ordre[i], ordre[j] = ordre[j], ordre[i]
+                codes.append(ordre[0] + 5 * ordre[1] + 25 * ordre[2] + 125 * ordre[3])
+    return codes
+
+
+def _etats_initiaux(seeds):
+    """
+    États MT19937 de random.Random(seed), un par colonne : (624, N) en uint32.
+
+    Reproduit init_by_array de CPython : la clé est la valeur absolue de la
+    seed découpée en mots de 32 bits (poids faibles d'abord). Les deux
+    boucles de mélange sont séquentielles le long de l'état, mais chaque
+    étape est la même opération pour toutes les seeds.
+    """
+    cles = []
+    for seed in seeds:
+        valeur = abs(int(seed))
+        mots = []
+        while True:
+            mots.append(valeur & _MASQUE)
+            valeur >>= 32
+            if not valeur:
+                break
+        cles.append(mots)
+    if not cles:
+        return np.zeros((_N, 0), dtype=np.uint32)
+    longueurs = np.array([len(mots) for mots in cles], dtype=np.int64)
+    if longueurs.max() > _N:
+        raise ValueError("Seed trop grande pour generer_lot")
+    cle = np.zeros((int(longueurs.max()), len(cles)), dtype=np.uint32)
+    for colonne, mots in enumerate(cles):
+        cle[:len(mots), colonne] = mots
+    colonnes = np.arange(len(cles))
+
+    # init_genrand(19650218) : identique pour toutes les seeds
+    depart = [19650218]
+    for i in range(1, _N):
+        precedent = depart[-1]
+        depart.append((1812433253 * (precedent ^ (precedent >> 30)) + i) & _MASQUE)
+    # Arithmétique en uint32 : les débordements de NumPy bouclent modulo
+    # 2**32, comme les & 0xffffffff du code C
+    mt = np.repeat(np.array(depart, dtype=np.uint32)[:, None], len(cles), axis=1)
+    temp = np.empty(len(cles), dtype=np.uint32)
+
+    def melanger(i, multiplicateur, ajout):
+        precedent = mt[i - 1]
+        np.right_shift(precedent, 30, out=temp)
+        np.bitwise_xor(temp, precedent, out=temp)
+        np.multiply(temp, multiplicateur, out=temp)
+        mt[i] ^= temp
+        mt[i] += ajout
+
+    meme_longueur = bool((longueurs == longueurs[0]).all())
+    i = 1
+    for k in range(_N):
+        if meme_longueur:
+            j = k % int(longueurs[0])
+            mot = cle[j] + np.uint32(j)
+        else:
+            j = k % longueurs
+            mot = cle[j, colonnes] + j.astype(np.uint32)
+        melanger(i, np.uint32(1664525), mot)
+        i += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+    for _ in range(_N - 1):
+        melanger(i, np.uint32(1566083941), np.uint32(-i & _MASQUE))  # - i modulo 2**32
+        i += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+    mt[0] = _BIT_HAUT
+    return mt
+
+
+def _regenerer(mt):
+    """Régénère l'état (twist), en place, par quatre tranches sans dépendance interne."""
+    for debut, fin in ((0, _N - _M), (_N - _M, 2 * (_N - _M)), (2 * (_N - _M), _N - 1)):
+        y = (mt[debut:fin] & _BIT_HAUT) | (mt[debut + 1:fin + 1] & _BITS_BAS)
+        source = mt[debut + _M:fin + _M] if debut == 0 else mt[debut - (_N - _M):fin - (_N - _M)]
+        mt[debut:fin] = source ^ (y >> 1) ^ ((y & 1) * np.uint32(_MATRICE))
+    y = (mt[_N - 1] & _BIT_HAUT) | (mt[0] & _BITS_BAS)
+    mt[_N - 1] = mt[_M - 1] ^ (y >> 1) ^ ((y & 1) * np.uint32(_MATRICE))
+
+
+def _temperer(y):
+    """Sorties (mots de 32 bits) correspondant à une tranche de l'état."""
+    y = y ^ (y >> 11)
+    y ^= (y << 7) & np.uint32(0x9D2C5680)
+    y ^= (y << 15) & np.uint32(0xEFC60000)
+    y ^= y >> 18
+    return y
+
+
+def _melanges(seeds, nombre):
+    """
+    Les nombre premiers rng.shuffle([1, 2, 3, 4]) de random.Random(seed),
+    pour chaque seed, déjà codés en entrées de pile : (N, nombre).
+
+    Chaque mot tiré est soit accepté, soit rejeté, selon l'étape du mélange
+    en cours (j3, j2 ou j1) et ses 3 bits de poids fort : tous les
+    générateurs consomment exactement un mot par pas, et tout le lot avance
+    ensemble. Trois tables indexées par (étape, 3 bits) donnent
+    l'acceptation, la valeur tirée et l'étape suivante ; un mot rejeté est
+    écrit quand même à la place du prochain tirage, qu'un mot accepté
+    remplacera.
+    """
+    total = 3 * nombre
+    mt = _etats_initiaux(seeds)
+    n = mt.shape[1]
+    acceptation, valeur, suivante = (np.array(table, dtype=type_table) for table, type_table
+                                     in zip(_tables_tirage(), (np.int64, np.uint8, np.uint8)))
+    etape = np.zeros(n, dtype=np.uint8)  # étape * 8, pour indexer les tables
+    comptes = np.zeros(n, dtype=np.int64)
+    bases = np.arange(n, dtype=np.int64) * (total + 1)  # +1 : place des tirages en trop
+    tirages = np.zeros(n * (total + 1), dtype=np.uint8)
+    place = np.empty(n, dtype=np.int64)
+    while comptes.min() < total:
+        _regenerer(mt)
+        debut = 0
+        while debut < _N and comptes.min() < total:
+            # Seuls les 3 bits de poids fort servent : getrandbits(k) = mot >> (32 - k)
+            hauts = (_temperer(mt[debut:debut + _TRANCHE_MOTS]) >> 29).astype(np.uint8)
+            for mot in hauts:
+                indices = etape + mot
+                np.minimum(comptes, total, out=place)
+                place += bases
+                tirages.put(place, valeur.take(indices))
+                comptes += acceptation.take(indices)
+                etape = suivante.take(indices)
+            debut += _TRANCHE_MOTS
+
+    tirages = tirages.reshape(n, total + 1)[:, :total].astype(np.int64)
+    j3, j2, j1 = tirages[:, 0::3], tirages[:, 1::3], tirages[:, 2::3]
+    return np.array(_codes_melange(), dtype=np.int64)[j3 * 6 + j2 * 2 + j1]
+
+
+def generer_lot(seeds, taille=16):
+    """
+    Génère un labyrinthe par seed, tous dans un seul tableau.
+
+    Même labyrinthe que generer_labyrinthe(taille, seed) (moteur
+    'iteratif', identique au récursif) : le DFS de creusement de
+    maze._creuser_iteratif tourne pour tout le lot à la fois, une pile par
+    labyrinthe, avec les mélanges de directions tirés d'avance dans le flux
+    de random.Random(seed). Chaque labyrinthe creuse toutes ses cases et
+    chaque case passe exactement 5 fois au sommet de la pile (4 directions
+    puis le retour arrière) : toutes les piles avancent au même rythme.
+
+    Args:
+        seeds: Seeds entières (une par labyrinthe)
+        taille: Dimension commune des labyrinthes
+
+    Returns:
+        Un tableau uint8 (N, taille, taille) de MUR et LIBRE (cases du
+        LabyrintheCompact) ; S est en (1, 1) et G en (taille-2, taille-2).
+        Un lot vide donne un tableau (0, taille, taille).
+
+    Raises:
+        ValueError: si taille < 5 (trop petit pour generer_labyrinthe aussi)
+    """
+    _verifier_numpy()
+    if taille < 5:
+        raise ValueError(f"taille doit valoir au moins 5 (reçu : {taille})")
+    seeds = list(seeds)
+    n = len(seeds)
+    if not n:
+        return np.zeros((0, taille, taille), dtype=np.uint8)
+    cote = taille + 4  # marge de 2 cases de chaque côté
+    surface = cote * cote
+    nb_cases = ((taille - 1) // 2) ** 2  # cases aux positions impaires
+    codes = _melanges(seeds, nb_cases)
+
+    grilles = np.full((n, cote, cote), _BORD, dtype=np.uint8)
+    grilles[:, 3:taille + 1, 3:taille + 1] = _A_CREUSER
+    grilles = grilles.reshape(-1)
+    bases = np.arange(n, dtype=np.int64) * surface
+
+    # Tables indexées par le reste d'une entrée de pile (code en base 5 des
+    # directions pas encore essayées, cf. maze._creuser_iteratif) : reste
+    # après consommation de la direction suivante, déplacement de 2 cases
+    # et déplacement jusqu'au mur intermédiaire (0 = plus aucune direction).
+    # 1 = droite, 2 = bas, 3 = gauche, 4 = haut
+    codes_directions = np.arange(625)
+    pas = np.array([0, 2, 2 * cote, -2, -2 * cote], dtype=np.int64)
+    suivant = (codes_directions // 5).astype(np.int16)
+    deplacement = pas[codes_directions % 5]
+    vers_mur = deplacement // 2
+
+    # Piles à plat : la pile du labyrinthe i occupe [i * profondeur, ...),
+    # sommets = indice plat du sommet de chaque pile. Les cases sont des
+    # indices plats dans grilles (base du labyrinthe comprise).
+    depart = 3 * cote + 3
+    profondeur = nb_cases + 1
+    pile_cases = np.zeros(n * profondeur, dtype=np.int64)
+    pile_restes = np.zeros(n * profondeur, dtype=np.int16)
+    sommets = np.arange(n, dtype=np.int64) * profondeur
+    pile_cases[sommets] = bases + depart
+    pile_restes[sommets] = codes[:, 0]
+    grilles[bases + depart] = _PASSAGE
+    codes = codes.astype(np.int16).reshape(-1)
+    prochains = np.arange(n, dtype=np.int64) * nb_cases + 1  # mélange suivant de chaque labyrinthe
+
+    for _ in range(5 * nb_cases):
+        reste = pile_restes.take(sommets)
+        # Consommer la prochaine direction (reste 0 : la case est finie)
+        pile_restes.put(sommets, suivant.take(reste))
+        case = pile_cases.take(sommets)
+        nouvelle = case + deplacement.take(reste)
+        # Une case finie donne nouvelle == case, déjà creusée : jamais retenue
+        creuse = np.flatnonzero(grilles.take(nouvelle) == _A_CREUSER)
+        sommets -= reste == 0
+
+        if creuse.size:
+            nouvelles = nouvelle.take(creuse)
+            grilles.put(case.take(creuse) + vers_mur.take(reste.take(creuse)), _PASSAGE)
+            grilles.put(nouvelles, _PASSAGE)
+            hauts = sommets.take(creuse) + 1
+            sommets.put(creuse, hauts)
+            pile_cases.put(hauts, nouvelles)
+            suivants = prochains.take(creuse)
+            pile_restes.put(hauts, codes.take(suivants))
+            prochains.put(creuse, suivants + 1)
+
+    labyrinthes = grilles.reshape(n, cote, cote)[:, 2:taille + 2, 2:taille + 2].copy()
+    labyrinthes[labyrinthes == _BORD] = MUR
+    # Accès à G, comme generer_labyrinthe (étape 3)
+    arrivee = taille - 2
+    labyrinthes[:, arrivee, arrivee] = LIBRE
+    labyrinthes[:, arrivee - 1, arrivee] = LIBRE
+    labyrinthes[:, arrivee, arrivee - 1] = LIBRE
+    return labyrinthes
+
+
+def bfs_lot(grilles, chemins=False, depart=None, arrivee=None):
+    """
+    BFS sur tout un lot de labyrinthes de même taille, niveau par niveau.
+
+    Les grilles sont mises bout à bout au format du LabyrintheCompact
+    (lignes et colonne sentinelles) : aucun voisin ne passe d'un
+    labyrinthe à l'autre, et un seul BFS part de tous les S à la fois.
+    Chaque niveau est développé comme dans bfs_numpy (voisins dans l'ordre
+    droite, bas, gauche, haut, première occurrence gardée) : la frontière
+    reste groupée par labyrinthe et, dans chaque labyrinthe, dans l'ordre
+    exact de la file de bfs(). D'où les mêmes noeuds explorés (niveaux
+    avant celui de G, puis les cases de ce niveau sorties avant G) et le
+    même chemin (premier parent de chaque case). Un labyrinthe dont G est
+    atteint quitte la frontière.
+
+    Args:
+        grilles: Tableau (N, lignes, colonnes) de MUR et LIBRE (generer_lot)
+        chemins: Si vrai, rend aussi le chemin de chaque labyrinthe
+        depart, arrivee: Positions (ligne, colonne) de S et G, communes à
+            tout le lot ((1, 1) et (lignes-2, colonnes-2) par défaut)
+
+    Returns:
+        Un dictionnaire : 'longueur' et 'noeuds_explores' (tableaux de N
+        entiers ; longueur 0 si G n'est pas atteignable, noeuds_explores
+        compte alors toutes les cases atteintes), 'temps' (ms, pour tout le
+        lot) et, avec chemins, 'chemins' : liste de N listes de coordonnées
+        (None si G n'est pas atteignable)
+    """
+    _verifier_numpy()
+    debut_temps = time.perf_counter()
+    grilles = np.asarray(grilles, dtype=np.uint8)
+    n, lignes, colonnes = grilles.shape
+    depart = (1, 1) if depart is None else depart
+    arrivee = (lignes - 2, colonnes - 2) if arrivee is None else arrivee
+
+    largeur = colonnes + 1
+    pas = (lignes + 2) * largeur  # cases par labyrinthe, sentinelles comprises
+    cases = np.full((n, lignes + 2, largeur), MUR, dtype=np.uint8)
+    cases[:, 1:-1, :-1] = grilles
+    visites = cases.reshape(-1)  # les murs comptent déjà comme visités
+    parents = np.full(visites.size, -1, dtype=np.int64)
+    deltas = np.array([1, largeur, -1, -largeur], dtype=np.int64)
+
+    bases = np.arange(n, dtype=np.int64) * pas
+    departs = bases + (depart[0] + 1) * largeur + depart[1]
+    arrivees = bases + (arrivee[0] + 1) * largeur + arrivee[1]
+    longueurs = np.zeros(n, dtype=np.int64)
+    explores = np.zeros(n, dtype=np.int64)
+
+    frontiere = departs[visites[departs] == 0]
+    visites[frontiere] = 1
+    niveau = 0
+    while frontiere.size:
+        numeros = frontiere // pas
+        atteintes = np.flatnonzero(frontiere == arrivees[numeros])
+        explores += np.bincount(numeros, minlength=n)
+        if atteintes.size:
+            trouves = numeros[atteintes]
+            # Cases du niveau de G sorties de la file après G : à retirer
+            fins = np.searchsorted(numeros, trouves, side='right')
+            explores[trouves] -= fins - atteintes - 1
+            longueurs[trouves] = niveau + 1
+            garder = longueurs[numeros] == 0
+            frontiere = frontiere[garder]
+
+        candidats = (frontiere[:, None] + deltas).ravel()
+        libres = np.flatnonzero(visites[candidats] == 0)
+        candidats = candidats[libres]
+        # Première occurrence de chaque case = premier parent dans la file
+        _, premiers = np.unique(candidats, return_index=True)
+        premiers.sort()
+        suivants = candidats[premiers]
+        visites[suivants] = 1
+        parents[suivants] = frontiere[libres[premiers] // 4]
+        frontiere = suivants
+        niveau += 1
+
+    resultat = {'longueur': longueurs, 'noeuds_explores': explores}
+    if chemins:
+        resultat['chemins'] = _chemins(parents, departs, arrivees, longueurs, pas, largeur)
+    resultat['temps'] = (time.perf_counter() - debut_temps) * 1000
+    return resultat
+
+
+def _chemins(parents, departs, arrivees, longueurs, pas, largeur):
+    """Remonte les parents de tous les labyrinthes à la fois, de G jusqu'à S."""
+    n = len(longueurs)
+    plus_long = int(longueurs.max()) if n else 0
+    etapes = np.zeros((n, max(plus_long, 1)), dtype=np.int64)
+    position = arrivees.copy()
+    for k in range(plus_long):
+        etapes[:, k] = position
+        position = np.where(position == departs, position, parents[position])
+    locales = etapes - (np.arange(n, dtype=np.int64) * pas)[:, None]
+    lignes_chemin = (locales // largeur - 1).tolist()
+    colonnes_chemin = (locales % largeur).tolist()
+
+    resultat = []
+    for i, longueur in enumerate(longueurs.tolist()):
+        if not longueur:
+            resultat.append(None)
+            continue
+        chemin = list(zip(lignes_chemin[i][:longueur], colonnes_chemin[i][:longueur]))
+        chemin.reverse()
+        resultat.append(chemin)
+    return resultat
+
+
+def resoudre_lot(seeds, taille=16, chemins=False):
+    """
+    generer_lot puis bfs_lot, chronométrés.
+
+    Returns:
+        Le dictionnaire de bfs_lot, plus 'grilles', 'temps_generation' et
+        'temps_bfs' (ms) et 'debit' (labyrinthes générés et résolus par
+        seconde)
+    """
+    debut = time.perf_counter()
+    grilles = generer_lot(seeds, taille)
+    generation = (time.perf_counter() - debut) * 1000
+    resultat = bfs_lot(grilles, chemins)
+    total = generation + resultat['temps']
+    resultat.update(grilles=grilles, temps_generation=generation, temps_bfs=resultat['temps'],
+                    temps=total, debit=len(grilles) / total * 1000 if total else 0.0)
+    return resultat
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    from maze import generer_labyrinthe
+    from bfs import bfs
+
+    if not DISPONIBLE:
+        print("NumPy n'est pas installé : lot_numpy indisponible")
+    else:
+        taille = 16
+        seeds = range(20000)
+
+        # Vérification sur les 500 premières seeds
+        lot = resoudre_lot(seeds[:500], taille, chemins=True)
+        for i, seed in enumerate(seeds[:500]):
+            laby = generer_labyrinthe(taille, seed)
+            compact = laby.compact()
+            grille = np.frombuffer(compact.cases, dtype=np.uint8).reshape(taille + 2, taille + 1)[1:-1, :-1]
+            reference = bfs(laby)
+            assert (grille == lot['grilles'][i]).all(), seed
+            assert lot['longueur'][i] == reference['longueur'], seed
+            assert lot['noeuds_explores'][i] == reference['noeuds_explores'], seed
+            assert lot['chemins'][i] == reference['chemin'], seed
+        print("500 labyrinthes identiques à generer_labyrinthe + bfs()")
+
+        debut = time.perf_counter()
+        for seed in seeds[:2000]:
+            bfs(generer_labyrinthe(taille, seed))
+        scalaire = 2000 / (time.perf_counter() - debut)
+
+        lot = resoudre_lot(seeds, taille)
+        print(f"{taille}x{taille} : un par un {scalaire:.0f} labyrinthes/s ; "
+              f"par lot de {len(seeds)} {lot['debit']:.0f} labyrinthes/s "
+              f"(génération {lot['temps_generation']:.0f} ms, BFS {lot['temps_bfs']:.0f} ms)")
@@ -2,20 +2,47 @@
 main.py - Point d'entrée principal
 Exécute les trois algorithmes (DFS, BFS, A*) sur le même labyrinthe
 et affiche un tableau comparatif des résultats.
+
+Avec --cache, le labyrinthe et les résultats sont gardés dans le cache sur
+disque (cache_disque.py) ; sans cette option, rien n'est écrit sur disque.
 """
 
-from maze import generer_labyrinthe, afficher_labyrinthe
-from dfs import dfs, afficher_exploration as dfs_exploration, afficher_solution as dfs_solution, afficher_chemin as dfs_chemin
-from bfs import bfs, afficher_exploration as bfs_exploration, afficher_solution as bfs_solution, afficher_chemin as bfs_chemin
-from astar import astar, afficher_exploration as astar_exploration, afficher_solution as astar_solution, afficher_chemin as astar_chemin
+import argparse
+
+from maze import afficher_labyrinthe
+from cache_disque import CacheDisque, CHEMIN_PAR_DEFAUT
+from dfs import dfs
+from bfs import bfs
+from astar import astar
+from rendu import afficher_exploration, afficher_solution, afficher_chemin
+from banc_essai import ALGORITHMES
+
+# Variantes qui n'apparaissent que dans le tableau comparatif : nom affiché
+# -> nom dans banc_essai.ALGORITHMES. Le cache est indexé par ce dernier,
+# comme dans cache_disque.prechauffer, qui les remplit donc à l'avance.
+VARIANTES = [
+    ('BFS bidir.', 'bfs_bidir'),
+    ('A* bidir.', 'astar_bidir'),
+    ('A* (ALT)', 'astar_alt'),
+    ('A* JPS', 'astar_jps'),
+    ('A* jonctions', 'astar_jonctions'),
+    ('A* hiérarchique', 'astar_hierarchique'),
+]
 
 
-def main():
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Compare DFS, BFS et A* sur un labyrinthe 16x16")
+    parseur.add_argument('--cache', nargs='?', const=CHEMIN_PAR_DEFAUT, metavar='FICHIER',
+                         help=f"utiliser le cache sur disque (par défaut {CHEMIN_PAR_DEFAUT})")
+    options = parseur.parse_args(arguments)
+    cache = CacheDisque(options.cache or CHEMIN_PAR_DEFAUT, actif=options.cache is not None)
+
     # Générer le labyrinthe avec une seed fixe pour la reproductibilité
     seed = 42
     print(f"Génération du labyrinthe 16x16 (seed={seed})")
     print("=" * 50)
-    laby = generer_labyrinthe(taille=16, seed=seed)
+    laby = cache.labyrinthe(16, seed)
+    print(f"Départ {laby.depart}, arrivée {laby.arrivee}, empreinte {laby.empreinte()[:16]}")
     afficher_labyrinthe(laby)
 
     # Stocker les résultats pour le tableau comparatif
@@ -25,52 +52,76 @@ def main():
     print("\n" + "=" * 50)
     print("DFS (Depth-First Search)")
     print("=" * 50)
-    res_dfs = dfs(laby)
+    res_dfs = cache.resultat(laby, 'dfs', dfs)
     if res_dfs:
         resultats['DFS'] = res_dfs
         print(f"\nExploration ({res_dfs['noeuds_explores']} noeuds) :")
-        dfs_exploration(laby, res_dfs['explores'])
+        afficher_exploration(laby, res_dfs['explores'])
         print(f"\nSolution (longueur {res_dfs['longueur']}) :")
-        dfs_solution(laby, res_dfs['chemin'])
+        afficher_solution(laby, res_dfs['chemin'])
         print()
-        dfs_chemin(res_dfs['chemin'])
+        afficher_chemin(res_dfs['chemin'])
 
     # ========== BFS ==========
     print("\n" + "=" * 50)
     print("BFS (Breadth-First Search)")
     print("=" * 50)
-    res_bfs = bfs(laby)
+    res_bfs = cache.resultat(laby, 'bfs', bfs)
     if res_bfs:
         resultats['BFS'] = res_bfs
         print(f"\nExploration ({res_bfs['noeuds_explores']} noeuds) :")
-        bfs_exploration(laby, res_bfs['explores'])
+        afficher_exploration(laby, res_bfs['explores'])
         print(f"\nSolution (longueur {res_bfs['longueur']}) :")
-        bfs_solution(laby, res_bfs['chemin'])
+        afficher_solution(laby, res_bfs['chemin'])
         print()
-        bfs_chemin(res_bfs['chemin'])
+        afficher_chemin(res_bfs['chemin'])
 
     # ========== A* ==========
     print("\n" + "=" * 50)
     print("A* (A-Star avec heuristique Manhattan)")
     print("=" * 50)
-    res_astar = astar(laby)
+    res_astar = cache.resultat(laby, 'astar', astar)
     if res_astar:
         resultats['A* (manhattan)'] = res_astar
         print(f"\nExploration ({res_astar['noeuds_explores']} noeuds) :")
-        astar_exploration(laby, res_astar['explores'])
+        afficher_exploration(laby, res_astar['explores'])
         print(f"\nSolution (longueur {res_astar['longueur']}) :")
-        astar_solution(laby, res_astar['chemin'])
+        afficher_solution(laby, res_astar['chemin'])
         print()
-        astar_chemin(res_astar['chemin'])
+        afficher_chemin(res_astar['chemin'])
+
+    # ========== Variantes ==========
+    for affichage, nom in VARIANTES:
+        res = cache.resultat(laby, nom, ALGORITHMES[nom][0])
+        if res:
+            resultats[affichage] = res
+
+    # Instrumentation (appel séparé : elle ralentit la recherche)
+    mesures = {}
+    for nom, recherche in (('DFS', dfs), ('BFS', bfs), ('A* (manhattan)', astar)):
+        res = recherche(laby, instrumentation=True)
+        if res:
+            mesures[nom] = res['instrumentation']
 
     # ========== Tableau Comparatif ==========
     print("\n" + "=" * 50)
     print("TABLEAU COMPARATIF")
     print("=" * 50)
-    print(f"{'Algorithme':<20} {'Noeuds':<10} {'Longueur':<12} {'Temps (ms)':<10}")
-    print("-" * 52)
+    print(f"{'Algorithme':<20} {'Noeuds':<10} {'Longueur':<12} {'Temps (ms)':<12}"
+          f"{'Ajouts':<8} {'Retraits':<10} {'Périmés':<9} {'Pic front.':<11} {'Mémoire (Kio)':<13}")
+    print("-" * 108)
     for nom, res in resultats.items():
-        print(f"{nom:<20} {res['noeuds_explores']:<10} {res['longueur']:<12} {res['temps']:.3f}")
+        ligne = f"{nom:<20} {res['noeuds_explores']:<10} {res['longueur']:<12} {res['temps']:<12.3f}"
+        if nom in mesures:
+            m = mesures[nom]
+            ligne += (f"{m['ajouts']:<8} {m['retraits']:<10} {m['retraits_perimes']:<9} "
+                      f"{m['pic_frontiere']:<11} {m['octets_alloues'] / 1024:<13.1f}")
+        else:
+            ligne += f"{'-':<8} {'-':<10} {'-':<9} {'-':<11} {'-':<13}"
+        print(ligne.rstrip())
+    if cache.succes:
+        print(f"\n({cache.succes} éléments lus dans le cache {options.cache} : leur temps est celui du calcul d'origine)")
+    cache.fermer()
 
 
 if __name__ == '__main__':
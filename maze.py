@@ -3,10 +3,52 @@ maze.py - Génération et gestion du labyrinthe
 Ce module crée un labyrinthe 16x16 et garantit qu'un chemin existe entre S et G.
 """
 
+import hashlib
+import mmap
 import random
+import struct
+from array import array
 
 
-def generer_labyrinthe(taille=16, seed=None):
+# Moteurs de creusement disponibles pour generer_labyrinthe
+MOTEURS = ('iteratif', 'recursif', 'eller')
+
+# Version de la génération : à augmenter dès qu'une même (taille, seed) peut
+# donner un autre labyrinthe, pour que les caches sur disque (cache_disque.py)
+# ne rendent plus les anciens
+VERSION_GENERATEUR = 1
+
+# Valeurs des cases dans la grille de travail du moteur itératif
+_A_CREUSER = 0  # mur intérieur qui peut encore être creusé
+_PASSAGE = 1    # case creusée
+_BORD = 2       # mur du bord (ou marge autour de la grille), jamais creusé
+
+# Conversion de la grille de travail vers les caractères du labyrinthe
+_VERS_CARACTERES = bytes.maketrans(bytes([_A_CREUSER, _PASSAGE, _BORD]), b'#.#')
+
+# Valeurs des cases d'un LabyrintheCompact
+LIBRE = 0
+MUR = 1
+
+# Conversion caractère -> case compacte : '#' devient MUR, tout le reste LIBRE
+_VERS_CASES = bytes(MUR if octet == ord('#') else LIBRE for octet in range(256))
+_VERS_TEXTE = bytes.maketrans(bytes([LIBRE, MUR]), b'.#')
+
+# Format binaire (sauver_labyrinthe / charger_labyrinthe) : un en-tête fixe
+# suivi des cases du LabyrintheCompact telles quelles (un octet par case,
+# sentinelles comprises). Champs de l'en-tête, en petit-boutiste : signature,
+# version, drapeaux, lignes, colonnes, seed (entier signé de 64 bits, valable
+# si le drapeau _AVEC_SEED est mis), S et G (indices plats, -1 = absent),
+# empreinte SHA-256 brute, puis du remplissage jusqu'à 96 octets.
+# Version 1 : pas de drapeaux, seed négative = absente (toujours lisible).
+SIGNATURE = b'LABY'
+VERSION_FORMAT = 2
+_ENTETE = struct.Struct('<4sHHIIqqq32s')
+TAILLE_ENTETE = 96
+_AVEC_SEED = 1
+
+
+def generer_labyrinthe(taille=16, seed=None, moteur='iteratif'):
     """
     Génère un labyrinthe de taille donnée.
     
@@ -15,23 +57,52 @@ def generer_labyrinthe(taille=16, seed=None):
     2. On "creuse" des passages avec un DFS aléatoire
     3. Cela garantit qu'un chemin existe entre S et G
     
+    Deux moteurs de creusement donnent exactement le même labyrinthe pour
+    une même seed :
+    - 'iteratif' (par défaut) : pile explicite, aucune limite de taille
+    - 'recursif' : version d'origine, limitée par la profondeur de récursion
+      de Python (vers 45x45)
+    Le moteur 'eller' construit un autre labyrinthe, ligne par ligne
+    (voir generer_lignes_eller pour la version en flux).
+    
     Args:
         taille: Dimension du labyrinthe (16 par défaut)
         seed: Graine aléatoire pour la reproductibilité
+        moteur: Moteur de creusement ('iteratif', 'recursif' ou 'eller')
     
     Returns:
-        Une matrice 2D (liste de listes) représentant le labyrinthe
+        Un Labyrinthe : la matrice 2D (liste de listes) qui connaît aussi
+        les positions de S et G, sa taille, sa seed et son empreinte
     """
-    # Initialiser le générateur aléatoire avec la seed
-    if seed is not None:
-        random.seed(seed)
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur inconnu : {moteur!r} (choix : {', '.join(MOTEURS)})")
 
-    # Étape 1 : Créer une grille remplie de murs
-    labyrinthe = [['#' for _ in range(taille)] for _ in range(taille)]
+    depart = (1, 1)
+    arrivee = (taille - 2, taille - 2)
 
-    # Étape 2 : Creuser des passages avec un DFS aléatoire
-    # On commence au point de départ (1, 1)
-    _creuser(labyrinthe, 1, 1, taille)
+    if moteur == 'eller':
+        # Le flux place déjà S et G : il suffit de garder toutes les lignes
+        labyrinthe = Labyrinthe(generer_lignes_eller(taille, seed), depart, arrivee, seed)
+        labyrinthe.compact()
+        return labyrinthe
+
+    # Générateur aléatoire propre à cet appel : l'état global du module
+    # random n'est pas touché (plusieurs générations peuvent avoir lieu en
+    # même temps). Random(seed) donne la même suite que random.seed(seed) :
+    # les labyrinthes sont inchangés. Sans seed, on garde le générateur global.
+    rng = random.Random(seed) if seed is not None else random
+
+    if moteur == 'recursif':
+        # Étape 1 : Créer une grille remplie de murs
+        labyrinthe = [['#' for _ in range(taille)] for _ in range(taille)]
+
+        # Étape 2 : Creuser des passages avec un DFS aléatoire
+        # On commence au point de départ (1, 1)
+        _creuser(labyrinthe, 1, 1, taille, rng)
+    else:
+        # Étapes 1 et 2 dans une grille compacte (un octet par case),
+        # convertie en liste de listes une fois le creusement terminé
+        labyrinthe = _creuser_iteratif(taille, rng)
 
     # Étape 3 : Garantir l'accès à la position d'arrivée
     # L'algorithme de creusement visite les positions impaires (1,3,5...)
@@ -47,10 +118,15 @@ def generer_labyrinthe(taille=16, seed=None):
     labyrinthe[1][1] = 'S'
     labyrinthe[arrivee_ligne][arrivee_colonne] = 'G'
 
+    # On connaît déjà S et G : les recherches n'ont pas à les chercher.
+    # La version compacte est préparée tout de suite pour que le temps
+    # mesuré par les recherches ne compte que la recherche elle-même.
+    labyrinthe = Labyrinthe(labyrinthe, depart, arrivee, seed)
+    labyrinthe.compact()
     return labyrinthe
 
 
-def _creuser(labyrinthe, ligne, colonne, taille):
+def _creuser(labyrinthe, ligne, colonne, taille, rng=random):
     """
     Creuse des passages dans le labyrinthe avec un DFS aléatoire.
     
@@ -66,7 +142,7 @@ def _creuser(labyrinthe, ligne, colonne, taille):
 
     # Les 4 directions possibles : (delta_ligne, delta_colonne)
     directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]  # droite, bas, gauche, haut
-    random.shuffle(directions)  # Mélanger pour que le labyrinthe soit aléatoire
+    rng.shuffle(directions)  # Mélanger pour que le labyrinthe soit aléatoire
 
     for delta_ligne, delta_colonne in directions:
         # Calculer la position à 2 pas
@@ -83,15 +159,709 @@ def _creuser(labyrinthe, ligne, colonne, taille):
             labyrinthe[ligne + delta_ligne // 2][colonne + delta_colonne // 2] = '.'
             
             # Continuer à creuser depuis la nouvelle case (récursion)
-            _creuser(labyrinthe, nouvelle_ligne, nouvelle_colonne, taille)
+            _creuser(labyrinthe, nouvelle_ligne, nouvelle_colonne, taille, rng)
+
+
+def _creuser_iteratif(taille, rng=random):
+    """
+    Version itérative de _creuser : même DFS aléatoire, sans récursion.
+    
+    La grille de travail est un bytearray (un octet par case) entouré d'une
+    marge de 2 cases marquées _BORD : une case à 2 pas est creusable si et
+    seulement si elle vaut _A_CREUSER, sans aucun test de limites.
+    
+    La pile est un array d'entiers. Chaque entrée code la case (indice plat)
+    et les directions qu'il lui reste à essayer, en base 5 :
+        entree = case * 625 + d1 + 5 * d2 + 25 * d3 + 125 * d4
+    avec d1..d4 dans 1..4 (0 = plus de direction). Le mélange des directions
+    appelle rng.shuffle une fois par case, dans le même ordre que la
+    version récursive : le labyrinthe obtenu est identique pour une même seed.
+    
+    Mémoire : un octet par case pour la grille et au plus 8 octets par case
+    pour la pile, donc linéaire en nombre de cases.
+    
+    Returns:
+        Une matrice 2D (liste de listes) remplie de '#' et de '.'
+    """
+    largeur = taille + 4  # marge de 2 cases de chaque côté
+    cases = bytearray([_BORD]) * (largeur * largeur)
+    interieur = bytes([_A_CREUSER]) * (taille - 2)
+    for ligne in range(1, taille - 1):
+        debut = (ligne + 2) * largeur + 3
+        cases[debut:debut + taille - 2] = interieur
+
+    # Déplacements de 2 cases, indexés comme les chiffres d1..d4 :
+    # 1 = droite, 2 = bas, 3 = gauche, 4 = haut (même ordre que _creuser)
+    deltas = (0, 2, 2 * largeur, -2, -2 * largeur)
+    melanger = rng.shuffle
+
+    # On commence au point de départ (1, 1)
+    depart = 3 * largeur + 3
+    cases[depart] = _PASSAGE
+    ordre = [1, 2, 3, 4]
+    melanger(ordre)
+    pile = array('q', [depart * 625 + ordre[0] + 5 * ordre[1] + 25 * ordre[2] + 125 * ordre[3]])
+
+    while pile:
+        entree = pile[-1]
+        reste = entree % 625
+        if not reste:
+            # Toutes les directions ont été essayées : on revient en arrière
+            pile.pop()
+            continue
+
+        # Consommer la prochaine direction de la case au sommet de la pile
+        pile[-1] = entree - reste + reste // 5
+        delta = deltas[reste % 5]
+        case = entree // 625
+        nouvelle_case = case + delta
+
+        if cases[nouvelle_case] == _A_CREUSER:
+            # Creuser le mur entre les deux cases puis la nouvelle case
+            cases[case + delta // 2] = _PASSAGE
+            cases[nouvelle_case] = _PASSAGE
+            ordre = [1, 2, 3, 4]
+            melanger(ordre)
+            pile.append(nouvelle_case * 625 + ordre[0] + 5 * ordre[1] + 25 * ordre[2] + 125 * ordre[3])
+
+    # Conversion ligne par ligne (sans la marge) en liste de caractères
+    labyrinthe = []
+    for ligne in range(taille):
+        debut = (ligne + 2) * largeur + 2
+        labyrinthe.append(list(cases[debut:debut + taille].translate(_VERS_CARACTERES).decode('ascii')))
+    return labyrinthe
+
+
+def generer_lignes_eller(taille=16, seed=None):
+    """
+    Génère un labyrinthe ligne par ligne avec l'algorithme d'Eller.
+    
+    C'est un générateur : chaque ligne (liste de caractères, comme une ligne
+    de generer_labyrinthe) est produite puis oubliée. Seul l'état de la ligne
+    de cases courante est gardé en mémoire, donc la mémoire est
+    proportionnelle à la largeur et non à la surface.
+    
+    Principe (les cases sont aux positions impaires, comme pour _creuser) :
+    1. Chaque case de la ligne appartient à un ensemble (cases reliées)
+    2. On relie au hasard des cases voisines d'ensembles différents
+    3. Chaque ensemble descend au moins une fois vers la ligne suivante
+    4. Sur la dernière ligne, on relie tous les ensembles restants
+    Le labyrinthe obtenu est parfait : toutes les cases sont reliées, donc
+    S (1, 1) et G (taille-2, taille-2) sont connectés.
+    
+    Args:
+        taille: Dimension du labyrinthe (16 par défaut)
+        seed: Graine aléatoire pour la reproductibilité
+    
+    Yields:
+        Les lignes du labyrinthe, de haut en bas
+    """
+    # Générateur local : le flux peut être consommé lentement sans
+    # dépendre de l'état global du module random
+    rng = random.Random(seed)
+    arrivee = taille - 2
+    nb_cases = (taille - 1) // 2  # cases par ligne (et lignes de cases)
+
+    def finaliser(indice, ligne):
+        # Mêmes retouches que generer_labyrinthe (étapes 3 et 4)
+        if indice == arrivee - 1:
+            ligne[arrivee] = '.'
+        if indice == arrivee:
+            ligne[arrivee] = '.'
+            ligne[arrivee - 1] = '.'
+        if indice == 1:
+            ligne[1] = 'S'
+        if indice == arrivee:
+            ligne[arrivee] = 'G'
+        return ligne
+
+    yield finaliser(0, ['#'] * taille)
+
+    # Ensemble de chaque case de la ligne courante, numérotés de 0 à nb_cases-1
+    ensembles = list(range(nb_cases))
+
+    for rang in range(nb_cases):
+        derniere = rang == nb_cases - 1
+        ligne = ['#'] * taille
+
+        # Étape 2 : union-find local à la ligne pour relier les voisines
+        racines = list(range(nb_cases))
+
+        def trouver(x):
+            while racines[x] != x:
+                racines[x] = racines[racines[x]]
+                x = racines[x]
+            return x
+
+        for j in range(nb_cases):
+            ligne[2 * j + 1] = '.'
+            if j + 1 < nb_cases:
+                a = trouver(ensembles[j])
+                b = trouver(ensembles[j + 1])
+                # Étape 4 : sur la dernière ligne, on relie tout
+                if a != b and (derniere or rng.random() < 0.5):
+                    racines[b] = a
+                    ligne[2 * j + 2] = '.'
+        yield finaliser(2 * rang + 1, ligne)
+
+        if derniere:
+            break
+
+        # Étape 3 : chaque ensemble descend au moins une fois
+        ensembles = [trouver(e) for e in ensembles]
+        colonnes_par_ensemble = {}
+        for j, e in enumerate(ensembles):
+            colonnes_par_ensemble.setdefault(e, []).append(j)
+
+        ligne = ['#'] * taille
+        suivants = [-1] * nb_cases
+        for e, colonnes in colonnes_par_ensemble.items():
+            descentes = [j for j in colonnes if rng.random() < 0.5]
+            if not descentes:
+                descentes = [rng.choice(colonnes)]
+            for j in descentes:
+                suivants[j] = e
+                ligne[2 * j + 1] = '.'
+        yield finaliser(2 * rang + 2, ligne)
+
+        # Les cases qui ne descendent pas commencent un nouvel ensemble ;
+        # on renumérote tout de 0 à nb_cases-1 pour garder des indices compacts
+        numeros = {}
+        nouveau = nb_cases
+        for j in range(nb_cases):
+            if suivants[j] < 0:
+                suivants[j] = nouveau
+                nouveau += 1
+            suivants[j] = numeros.setdefault(suivants[j], len(numeros))
+        ensembles = suivants
+
+    # Lignes de murs restantes sous la dernière ligne de cases
+    for indice in range(2 * nb_cases, taille):
+        yield finaliser(indice, ['#'] * taille)
 
 
 def afficher_labyrinthe(labyrinthe):
-    """Affiche le labyrinthe dans le terminal."""
+    """Affiche le labyrinthe dans le terminal (accepte aussi un flux de lignes)."""
     for ligne in labyrinthe:
         print(' '.join(ligne))
 
 
+def ecrire_labyrinthe(labyrinthe, fichier):
+    """
+    Écrit le labyrinthe dans un fichier texte ouvert, au même format
+    qu'afficher_labyrinthe.
+    
+    Accepte une liste de lignes ou un flux (generer_lignes_eller) :
+    chaque ligne est écrite dès qu'elle est produite.
+    """
+    for ligne in labyrinthe:
+        fichier.write(' '.join(ligne))
+        fichier.write('\n')
+
+
+def _debut_empreinte(lignes, colonnes, depart, arrivee):
+    """SHA-256 déjà nourri de l'en-tête de l'empreinte ; il reste les cases à y ajouter."""
+    h = hashlib.sha256()
+    h.update(f"{lignes}x{colonnes}:{depart}:{arrivee}:".encode('ascii'))
+    return h
+
+
+class LabyrintheCompact:
+    """
+    Représentation compacte d'un labyrinthe pour les algorithmes de recherche.
+    
+    Les cases sont rangées dans un seul bytearray (un octet par case, MUR ou
+    LIBRE) et repérées par un indice plat. La grille est entourée de cases
+    sentinelles MUR : une ligne au-dessus, une ligne en dessous et une
+    colonne à droite (qui sert aussi de bord gauche à la ligne suivante).
+    Les 4 voisins d'une case sont donc toujours case + delta, avec les
+    deltas précalculés (droite, bas, gauche, haut), sans test de limites.
+    
+        indice = (ligne + 1) * largeur + colonne,  avec largeur = colonnes + 1
+    
+    Mémoire : 1 octet par case pour la grille, plus, pendant une recherche,
+    1 octet par case pour les visites (copie de la grille : les murs sont
+    déjà marqués visités) et 4 octets par case pour les parents, soit environ
+    6 octets par case, contre 8 octets de pointeur par case pour la liste
+    de listes et plus de 100 octets par case visitée pour un set de tuples.
+    
+    Attributs:
+        cases: Octets de la grille (bytearray, ou tout tampon indexable)
+        lignes, colonnes: Dimensions de la grille d'origine
+        largeur: Nombre d'octets par ligne (colonnes + 1)
+        depart, arrivee: Indices plats de S et G (None si absents)
+        deltas: Décalages des 4 voisins : droite, bas, gauche, haut
+        seed: Seed de génération, si connue (None sinon)
+    """
+
+    def __init__(self, cases, lignes, colonnes, depart=None, arrivee=None, seed=None):
+        self.cases = cases
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.largeur = colonnes + 1
+        self.depart = depart
+        self.arrivee = arrivee
+        self.deltas = (1, self.largeur, -1, -self.largeur)
+        self.seed = seed
+
+    @classmethod
+    def depuis_grille(cls, labyrinthe, depart=None, arrivee=None):
+        """
+        Construit la version compacte d'une grille (liste de listes).
+        
+        Si les positions (ligne, colonne) de S et G ne sont pas fournies,
+        elles sont cherchées ligne par ligne pendant la conversion.
+        """
+        lignes = len(labyrinthe)
+        colonnes = len(labyrinthe[0]) if lignes else 0
+        largeur = colonnes + 1
+        chercher = depart is None or arrivee is None
+
+        morceaux = [bytes([MUR]) * largeur]  # ligne sentinelle du haut
+        for i, ligne in enumerate(labyrinthe):
+            texte = ''.join(ligne)
+            if chercher:
+                j = texte.find('S')
+                if j >= 0:
+                    depart = (i, j)
+                j = texte.find('G')
+                if j >= 0:
+                    arrivee = (i, j)
+            morceaux.append(texte.encode('latin-1', 'replace').translate(_VERS_CASES))
+            morceaux.append(bytes([MUR]))  # colonne sentinelle de droite
+        morceaux.append(bytes([MUR]) * largeur)  # ligne sentinelle du bas
+
+        compact = cls(bytearray(b''.join(morceaux)), lignes, colonnes)
+        if depart is not None:
+            compact.depart = compact.indice(*depart)
+        if arrivee is not None:
+            compact.arrivee = compact.indice(*arrivee)
+        return compact
+
+    def indice(self, ligne, colonne):
+        """Indice plat de la case (ligne, colonne)."""
+        return (ligne + 1) * self.largeur + colonne
+
+    def indice_verifie(self, ligne, colonne):
+        """
+        Indice plat de la case (ligne, colonne), pour des coordonnées venues
+        de l'utilisateur : hors de la grille, indice() tomberait sur une
+        sentinelle ou sur une autre case, d'où une ValueError.
+        """
+        if not (0 <= ligne < self.lignes and 0 <= colonne < self.colonnes):
+            raise ValueError(f"Case ({ligne}, {colonne}) hors du labyrinthe "
+                             f"({self.lignes} lignes, {self.colonnes} colonnes)")
+        return self.indice(ligne, colonne)
+
+    def coordonnees(self, indice):
+        """Coordonnées (ligne, colonne) de l'indice plat."""
+        ligne, colonne = divmod(indice, self.largeur)
+        return (ligne - 1, colonne)
+
+    def ensemble_coordonnees(self, indices):
+        """Ensemble des coordonnées d'une suite d'indices plats."""
+        largeur = self.largeur
+        return {(i // largeur - 1, i % largeur) for i in indices}
+
+    def tableau_indices(self, valeur=0):
+        """Tableau d'entiers (un par case, initialisé à valeur) pour stocker des indices."""
+        code = 'i' if len(self.cases) < 2 ** 31 else 'q'
+        return array(code, [valeur]) * len(self.cases)
+
+    def reconstruire_chemin(self, parents, arrivee):
+        """
+        Reconstruit le chemin du départ jusqu'à l'arrivée en remontant les parents.
+        
+        Args:
+            parents: Tableau (tableau_indices) du parent de chaque case visitée
+            arrivee: Indice plat de la case d'arrivée
+        
+        Returns:
+            La liste des coordonnées du départ jusqu'à l'arrivée
+        """
+        largeur = self.largeur
+        depart = self.depart
+        position = arrivee
+        chemin = [(position // largeur - 1, position % largeur)]
+        while position != depart:
+            position = parents[position]
+            chemin.append((position // largeur - 1, position % largeur))
+        chemin.reverse()
+        return chemin
+
+    def en_grille(self):
+        """Reconstruit la grille (liste de listes) avec S et G."""
+        largeur = self.largeur
+        grille = []
+        for i in range(self.lignes):
+            debut = (i + 1) * largeur
+            grille.append(list(bytes(self.cases[debut:debut + self.colonnes]).translate(_VERS_TEXTE).decode('ascii')))
+        if self.depart is not None:
+            ligne, colonne = self.coordonnees(self.depart)
+            grille[ligne][colonne] = 'S'
+        if self.arrivee is not None:
+            ligne, colonne = self.coordonnees(self.arrivee)
+            grille[ligne][colonne] = 'G'
+        return grille
+
+    def empreinte(self):
+        """Empreinte SHA-256 (hexadécimale) des dimensions, de S, de G et des cases."""
+        h = _debut_empreinte(self.lignes, self.colonnes, self.depart, self.arrivee)
+        h.update(self.cases)
+        return h.hexdigest()
+
+
+class GrapheJonctions:
+    """
+    Graphe des jonctions d'un labyrinthe : les couloirs sont compressés.
+    
+    Une case libre qui a exactement 2 voisins libres est une case de couloir.
+    Toutes les autres cases libres (carrefours, impasses, cases isolées),
+    plus S et G, sont des noeuds du graphe. Chaque couloir qui relie deux
+    noeuds devient une arête pondérée par sa longueur en pas.
+    
+    Les cases du couloir ne sont pas stockées : une arête garde seulement le
+    premier pas (delta) depuis son noeud d'origine, et couloir() refait le
+    chemin à la demande (dans un couloir il n'y a qu'une seule suite possible).
+    
+    Attributs:
+        laby: LabyrintheCompact d'origine
+        cellules: Indice plat de chaque noeud (array, indexé par numéro de noeud)
+        numeros: Numéro de noeud de chaque indice plat (dict)
+        aretes: Pour chaque noeud, liste de (noeud voisin, poids, premier pas)
+        depart, arrivee: Numéros des noeuds de S et G
+    """
+
+    def __init__(self, laby):
+        self.laby = laby
+        cases = laby.cases
+        deltas = laby.deltas
+        depart = laby.depart
+        arrivee = laby.arrivee
+
+        # Étape 1 : repérer les noeuds (degré différent de 2, ou S, ou G)
+        est_noeud = bytearray(len(cases))
+        cellules = array('q')
+        numeros = {}
+        for case in range(len(cases)):
+            if cases[case]:
+                continue
+            degre = (not cases[case + 1]) + (not cases[case - 1]) + \
+                    (not cases[case + laby.largeur]) + (not cases[case - laby.largeur])
+            if degre != 2 or case == depart or case == arrivee:
+                est_noeud[case] = 1
+                numeros[case] = len(cellules)
+                cellules.append(case)
+
+        # Étape 2 : suivre chaque couloir depuis chaque noeud
+        aretes = []
+        for case in cellules:
+            sortantes = []
+            for delta in deltas:
+                precedente = case
+                courante = case + delta
+                if cases[courante]:
+                    continue
+                poids = 1
+                while not est_noeud[courante]:
+                    # Case de couloir : une seule suite possible
+                    for pas in deltas:
+                        suivante = courante + pas
+                        if suivante != precedente and not cases[suivante]:
+                            break
+                    precedente, courante = courante, suivante
+                    poids += 1
+                if courante != case:  # un couloir qui revient sur son noeud ne sert à rien
+                    sortantes.append((numeros[courante], poids, delta))
+            aretes.append(sortantes)
+
+        self.cellules = cellules
+        self.numeros = numeros
+        self.aretes = aretes
+        self.depart = numeros.get(depart)
+        self.arrivee = numeros.get(arrivee)
+
+    def __len__(self):
+        return len(self.cellules)
+
+    def couloir(self, noeud, delta):
+        """
+        Indices plats des cases d'une arête, depuis le noeud (exclu) dans la
+        direction delta jusqu'au noeud suivant (inclus).
+        """
+        cases = self.laby.cases
+        deltas = self.laby.deltas
+        numeros = self.numeros
+        precedente = self.cellules[noeud]
+        courante = precedente + delta
+        indices = [courante]
+        while courante not in numeros:
+            for pas in deltas:
+                suivante = courante + pas
+                if suivante != precedente and not cases[suivante]:
+                    break
+            precedente, courante = courante, suivante
+            indices.append(courante)
+        return indices
+
+
+class Labyrinthe(list):
+    """
+    Labyrinthe produit par generer_labyrinthe : la grille et ses métadonnées.
+    
+    C'est toujours une liste de lignes (l'affichage et l'accès
+    labyrinthe[i][j] ne changent pas), qui connaît en plus :
+    - depart, arrivee : positions (ligne, colonne) de S et G
+    - taille, seed : paramètres de génération
+    - empreinte() : empreinte du contenu (SHA-256 de la version compacte)
+    
+    Les données dérivées (version compacte, empreinte...) sont calculées
+    une seule fois et gardées dans un cache. Pour modifier une case, passer
+    par modifier_case, qui vide ce cache.
+    """
+
+    def __init__(self, lignes, depart, arrivee, seed=None):
+        super().__init__(lignes)
+        self.taille = len(self)
+        self.depart = depart
+        self.arrivee = arrivee
+        self.seed = seed
+        self._caches = {}
+
+    @classmethod
+    def depuis_compact(cls, compact):
+        """
+        Labyrinthe reconstruit depuis sa version compacte, qui devient sa
+        version compacte en cache (aucune conversion dans l'autre sens).
+        """
+        depart = compact.coordonnees(compact.depart) if compact.depart is not None else None
+        arrivee = compact.coordonnees(compact.arrivee) if compact.arrivee is not None else None
+        labyrinthe = cls(compact.en_grille(), depart, arrivee, compact.seed)
+        labyrinthe._caches['compact'] = compact
+        return labyrinthe
+
+    def en_cache(self, cle, fabrique):
+        """Retourne fabrique(self), calculé au premier appel puis gardé sous cle."""
+        try:
+            return self._caches[cle]
+        except KeyError:
+            valeur = self._caches[cle] = fabrique(self)
+            return valeur
+
+    def invalider_caches(self):
+        """Oublie toutes les données dérivées (après une modification de la grille)."""
+        self._caches.clear()
+
+    def modifier_case(self, ligne, colonne, valeur):
+        """Change une case de la grille et invalide les caches."""
+        self[ligne][colonne] = valeur
+        self.invalider_caches()
+
+    def compact(self):
+        """Version compacte (LabyrintheCompact), construite sans rechercher S et G."""
+        return self.en_cache('compact', lambda laby: LabyrintheCompact.depuis_grille(laby, laby.depart, laby.arrivee))
+
+    def empreinte(self):
+        """Empreinte SHA-256 (hexadécimale) du contenu."""
+        return self.en_cache('empreinte', lambda laby: laby.compact().empreinte())
+
+    def jonctions(self):
+        """Graphe des jonctions (GrapheJonctions), construit une seule fois."""
+        return self.en_cache('jonctions', lambda laby: GrapheJonctions(laby.compact()))
+
+
+def en_compact(labyrinthe):
+    """
+    Retourne le LabyrintheCompact à donner aux recherches.
+    
+    - LabyrintheCompact : retourné tel quel
+    - Labyrinthe : version compacte en cache (S et G déjà connus)
+    - grille brute (liste de listes) : conversion, avec recherche de S et G
+    """
+    if isinstance(labyrinthe, LabyrintheCompact):
+        return labyrinthe
+    if isinstance(labyrinthe, Labyrinthe):
+        return labyrinthe.compact()
+    return LabyrintheCompact.depuis_grille(labyrinthe)
+
+
+def en_jonctions(labyrinthe):
+    """
+    Retourne le GrapheJonctions du labyrinthe.
+    
+    Pour un Labyrinthe, le graphe est gardé en cache avec les autres données
+    dérivées ; sinon il est construit à chaque appel.
+    """
+    if isinstance(labyrinthe, Labyrinthe):
+        return labyrinthe.jonctions()
+    return GrapheJonctions(en_compact(labyrinthe))
+
+
+def entete_binaire(labyrinthe):
+    """En-tête du format binaire (TAILLE_ENTETE octets) pour ce labyrinthe."""
+    laby = en_compact(labyrinthe)
+    return _entete(laby.lignes, laby.colonnes, getattr(labyrinthe, 'seed', None),
+                   laby.depart, laby.arrivee, laby.empreinte())
+
+
+def _verifier_seed(seed):
+    """Lève ValueError si la seed ne tient pas dans l'en-tête (None ou entier de 64 bits signé)."""
+    if seed is None:
+        return
+    if not isinstance(seed, int) or not -2 ** 63 <= seed < 2 ** 63:
+        raise ValueError(f"Seed {seed!r} impossible à enregistrer dans le format binaire "
+                         "(entier de -2**63 à 2**63 - 1, ou None)")
+
+
+def _entete(lignes, colonnes, seed, depart, arrivee, empreinte):
+    _verifier_seed(seed)
+    entete = _ENTETE.pack(
+        SIGNATURE, VERSION_FORMAT, 0 if seed is None else _AVEC_SEED, lignes, colonnes,
+        0 if seed is None else seed,
+        -1 if depart is None else depart,
+        -1 if arrivee is None else arrivee,
+        bytes.fromhex(empreinte),
+    )
+    return entete.ljust(TAILLE_ENTETE, b'\0')
+
+
+def sauver_labyrinthe(labyrinthe, chemin):
+    """
+    Écrit le labyrinthe au format binaire (voir _ENTETE) : l'en-tête puis
+    les cases compactes, sans conversion, pour que charger_labyrinthe
+    puisse les projeter en mémoire telles quelles.
+    
+    Args:
+        labyrinthe: Labyrinthe, LabyrintheCompact ou grille brute
+        chemin: Fichier à écrire
+    
+    Raises:
+        ValueError: si la seed n'est ni None ni un entier de 64 bits signé
+    """
+    with open(chemin, 'wb') as fichier:
+        fichier.write(entete_binaire(labyrinthe))
+        fichier.write(en_compact(labyrinthe).cases)
+
+
+def sauver_lignes(lignes, chemin, seed=None):
+    """
+    Écrit au format binaire un labyrinthe donné ligne par ligne (par exemple
+    le flux de generer_lignes_eller), sans jamais le garder en mémoire : les
+    cases sont écrites au fil du flux, S et G repérés au passage, puis
+    l'empreinte est calculée en relisant le fichier par blocs et l'en-tête
+    est écrit en dernier.
+    
+    Args:
+        lignes: Lignes du labyrinthe (listes de caractères ou chaînes)
+        chemin: Fichier à écrire
+        seed: Seed à enregistrer dans l'en-tête (entier de 64 bits signé ou None)
+    """
+    _verifier_seed(seed)  # avant d'écrire tout le flux
+    mur = bytes([MUR])
+    colonnes = None
+    nombre = 0
+    depart = arrivee = None
+    with open(chemin, 'w+b') as fichier:
+        fichier.write(bytes(TAILLE_ENTETE))  # en-tête réservé, écrit à la fin
+        for ligne in lignes:
+            texte = ''.join(ligne)
+            if colonnes is None:
+                colonnes = len(texte)
+                fichier.write(mur * (colonnes + 1))  # ligne sentinelle du haut
+            elif len(texte) != colonnes:
+                raise ValueError("Toutes les lignes doivent avoir la même longueur")
+            debut = (nombre + 1) * (colonnes + 1)
+            j = texte.find('S')
+            if j >= 0:
+                depart = debut + j
+            j = texte.find('G')
+            if j >= 0:
+                arrivee = debut + j
+            fichier.write(texte.encode('latin-1', 'replace').translate(_VERS_CASES))
+            fichier.write(mur)  # colonne sentinelle de droite
+            nombre += 1
+        if colonnes is None:
+            colonnes = 0
+            fichier.write(mur)
+        fichier.write(mur * (colonnes + 1))  # ligne sentinelle du bas
+
+        h = _debut_empreinte(nombre, colonnes, depart, arrivee)
+        fichier.seek(TAILLE_ENTETE)
+        for bloc in iter(lambda: fichier.read(1 << 20), b''):
+            h.update(bloc)
+        fichier.seek(0)
+        fichier.write(_entete(nombre, colonnes, seed, depart, arrivee, h.hexdigest()))
+
+
+def lire_entete(tampon):
+    """
+    Décode l'en-tête d'un fichier binaire (octets ou tampon projeté).
+    
+    Returns:
+        Un dictionnaire : lignes, colonnes, seed, depart, arrivee (indices
+        plats ou None) et empreinte (hexadécimale)
+    """
+    if len(tampon) < TAILLE_ENTETE:
+        raise ValueError("Fichier de labyrinthe tronqué")
+    signature, version, drapeaux, lignes, colonnes, seed, depart, arrivee, empreinte = _ENTETE.unpack_from(tampon)
+    if signature != SIGNATURE:
+        raise ValueError("Ce fichier n'est pas un labyrinthe binaire")
+    if version == 1:
+        avec_seed = seed >= 0
+    elif version == VERSION_FORMAT:
+        avec_seed = drapeaux & _AVEC_SEED
+    else:
+        raise ValueError(f"Version de format non prise en charge : {version}")
+    return {
+        'lignes': lignes,
+        'colonnes': colonnes,
+        'seed': seed if avec_seed else None,
+        'depart': None if depart < 0 else depart,
+        'arrivee': None if arrivee < 0 else arrivee,
+        'empreinte': empreinte.hex(),
+    }
+
+
+def charger_labyrinthe(chemin, verifier=False):
+    """
+    Charge un labyrinthe binaire en le projetant en mémoire (mmap).
+    
+    Rien n'est copié : les cases du LabyrintheCompact sont une vue en
+    lecture seule sur le fichier, et les pages sont lues à la demande. Les
+    recherches fonctionnent directement dessus (elles ne font que lire les
+    cases). Plusieurs processus qui chargent le même fichier partagent les
+    mêmes pages du cache du système.
+    
+    Args:
+        chemin: Fichier écrit par sauver_labyrinthe
+        verifier: Si vrai, recalcule l'empreinte et la compare à l'en-tête
+            (lit tout le fichier)
+    
+    Returns:
+        Un LabyrintheCompact (avec sa seed)
+    """
+    with open(chemin, 'rb') as fichier:
+        projection = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+    return labyrinthe_depuis_tampon(projection, verifier)
+
+
+def labyrinthe_depuis_tampon(tampon, verifier=False):
+    """
+    LabyrintheCompact dont les cases sont une vue (sans copie) sur un tampon
+    au format binaire : octets, bytearray ou projection mmap.
+    """
+    entete = lire_entete(tampon)
+    cases = memoryview(tampon)[TAILLE_ENTETE:]
+    if len(cases) != (entete['lignes'] + 2) * (entete['colonnes'] + 1):
+        raise ValueError("Taille des cases incohérente avec l'en-tête")
+
+    laby = LabyrintheCompact(cases, entete['lignes'], entete['colonnes'],
+                             entete['depart'], entete['arrivee'], entete['seed'])
+    if verifier and laby.empreinte() != entete['empreinte']:
+        raise ValueError("Empreinte invalide : fichier de labyrinthe corrompu")
+    return laby
+
+
 # --- Test rapide ---
 if __name__ == '__main__':
     laby = generer_labyrinthe(taille=16, seed=42)
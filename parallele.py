@@ -0,0 +1,201 @@
+"""
+parallele.py - Exécution en lot de nombreux labyrinthes sur plusieurs processus
+Les travaux (taille, seed, algorithme) sont répartis sur un
+ProcessPoolExecutor. Aucune grille ne traverse les processus : chaque
+processus régénère le labyrinthe à partir de sa seed (generer_labyrinthe
+utilise un random.Random local, sans toucher à l'état global), et ne renvoie
+que quelques nombres par recherche. Les résultats remontent au fil de l'eau
+et sont agrégés par (taille, algorithme).
+
+Les labyrinthes peuvent aussi venir de fichiers binaires (--fichiers, voir
+maze.sauver_labyrinthe) : chaque processus projette le fichier en lecture
+seule, et tous partagent les mêmes pages en mémoire.
+
+Exemple :
+    python parallele.py --tailles 16 64 --seeds 2000 --processus 8
+    python parallele.py --fichiers grand.laby --algorithmes bfs astar astar_alt
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from maze import generer_labyrinthe, charger_labyrinthe
+
+# Nombre de seeds envoyées à un processus en une fois : assez pour que le
+# coût d'envoi soit négligeable, assez peu pour bien répartir la charge
+SEEDS_PAR_PAQUET = 50
+
+
+def _algorithmes():
+    # Import tardif : chaque processus construit lui-même son registre
+    from banc_essai import ALGORITHMES
+    return ALGORITHMES
+
+
+def resoudre_paquet(taille, seeds, algorithmes):
+    """
+    Travail exécuté dans un processus : génère chaque labyrinthe depuis sa
+    seed et le résout avec chaque algorithme.
+
+    Returns:
+        Une liste de petits dictionnaires (taille, seed, algorithme,
+        noeuds_explores, longueur, temps) : ni grille ni chemin
+    """
+    resultats = []
+    for seed in seeds:
+        laby = generer_labyrinthe(taille=taille, seed=seed)
+        resultats.extend(_resoudre(laby, taille, seed, algorithmes))
+    return resultats
+
+
+def resoudre_fichier(chemin, algorithmes):
+    """
+    Travail exécuté dans un processus : projette un labyrinthe binaire en
+    lecture seule (sans copie) et le résout avec chaque algorithme.
+    """
+    laby = charger_labyrinthe(chemin)
+    return _resoudre(laby, laby.lignes, laby.seed, algorithmes)
+
+
+def _resoudre(laby, taille, seed, algorithmes):
+    registre = _algorithmes()
+    resultats = []
+    for nom in algorithmes:
+        resultat = registre[nom][0](laby)
+        resultats.append({
+            'taille': taille,
+            'seed': seed,
+            'algorithme': nom,
+            'noeuds_explores': resultat['noeuds_explores'] if resultat else None,
+            'longueur': resultat['longueur'] if resultat else None,
+            'temps': resultat['temps'] if resultat else None,
+        })
+    return resultats
+
+
+class Agregat:
+    """Statistiques cumulées par (taille, algorithme), mises à jour au fil des résultats."""
+
+    def __init__(self):
+        self.groupes = {}
+
+    def ajouter(self, resultat):
+        cle = (resultat['taille'], resultat['algorithme'])
+        groupe = self.groupes.setdefault(cle, {'nombre': 0, 'echecs': 0, 'noeuds': 0, 'longueur': 0,
+                                               'temps': 0.0, 'temps_max': 0.0})
+        groupe['nombre'] += 1
+        if resultat['longueur'] is None:
+            groupe['echecs'] += 1
+            return
+        groupe['noeuds'] += resultat['noeuds_explores']
+        groupe['longueur'] += resultat['longueur']
+        groupe['temps'] += resultat['temps']
+        groupe['temps_max'] = max(groupe['temps_max'], resultat['temps'])
+
+    def afficher(self, fichier=sys.stdout):
+        print(f"{'Taille':>6} {'Algorithme':<20} {'Résolus':>8} {'Noeuds moy.':>12} "
+              f"{'Longueur moy.':>14} {'Temps moy. (ms)':>16} {'Temps max (ms)':>15}", file=fichier)
+        for (taille, nom), groupe in sorted(self.groupes.items()):
+            resolus = groupe['nombre'] - groupe['echecs']
+            diviseur = max(resolus, 1)
+            print(f"{taille:>6} {nom:<20} {resolus:>8} {groupe['noeuds'] / diviseur:>12.1f} "
+                  f"{groupe['longueur'] / diviseur:>14.1f} {groupe['temps'] / diviseur:>16.3f} "
+                  f"{groupe['temps_max']:>15.3f}", file=fichier)
+
+
+def executer_lot(tailles, seeds, algorithmes, processus=None, seeds_par_paquet=SEEDS_PAR_PAQUET):
+    """
+    Répartit les travaux sur un pool de processus et rend les résultats
+    au fur et à mesure qu'ils arrivent (dans un ordre quelconque).
+
+    Args:
+        tailles: Tailles de labyrinthe
+        seeds: Seeds à résoudre pour chaque taille
+        algorithmes: Noms de banc_essai.ALGORITHMES
+        processus: Nombre de processus (None = nombre de coeurs ;
+            1 = tout dans le processus courant, sans pool)
+        seeds_par_paquet: Nombre de seeds par travail envoyé
+
+    Yields:
+        Un dictionnaire par (taille, seed, algorithme), comme resoudre_paquet
+    """
+    algorithmes = _verifier(algorithmes)
+    seeds = list(seeds)
+    paquets = [(taille, seeds[i:i + seeds_par_paquet], algorithmes)
+               for taille in tailles for i in range(0, len(seeds), seeds_par_paquet)]
+    yield from _repartir(resoudre_paquet, paquets, processus)
+
+
+def executer_fichiers(chemins, algorithmes, processus=None):
+    """
+    Comme executer_lot, pour des labyrinthes binaires : un travail par
+    (fichier, algorithme). Seul le chemin du fichier traverse les processus.
+    """
+    algorithmes = _verifier(algorithmes)
+    travaux = [(chemin, [nom]) for chemin in chemins for nom in algorithmes]
+    yield from _repartir(resoudre_fichier, travaux, processus)
+
+
+def _verifier(algorithmes):
+    algorithmes = list(algorithmes)
+    inconnus = [nom for nom in algorithmes if nom not in _algorithmes()]
+    if inconnus:
+        raise ValueError(f"Algorithme inconnu : {', '.join(inconnus)}")
+    return algorithmes
+
+
+def _repartir(fonction, travaux, processus):
+    if processus == 1:
+        for arguments in travaux:
+            yield from fonction(*arguments)
+        return
+
+    with ProcessPoolExecutor(max_workers=processus) as executeur:
+        futurs = [executeur.submit(fonction, *arguments) for arguments in travaux]
+        for futur in as_completed(futurs):
+            yield from futur.result()
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Résolution en lot sur plusieurs processus")
+    parseur.add_argument('--tailles', type=int, nargs='+', default=[16])
+    parseur.add_argument('--seeds', type=int, default=1000, help="nombre de seeds par taille")
+    parseur.add_argument('--fichiers', nargs='+',
+                         help="labyrinthes binaires à résoudre (au lieu de --tailles et --seeds)")
+    parseur.add_argument('--algorithmes', nargs='+', default=['dfs', 'bfs', 'astar'])
+    parseur.add_argument('--processus', type=int, default=os.cpu_count(),
+                         help="nombre de processus (1 = sans pool)")
+    parseur.add_argument('--echelle', action='store_true',
+                         help="mesurer le débit avec 1, 2, 4... processus jusqu'à --processus")
+    options = parseur.parse_args(arguments)
+
+    nombres = [options.processus]
+    if options.echelle:
+        nombres = sorted({min(2 ** i, options.processus) for i in range(options.processus.bit_length() + 1)})
+
+    debit_seul = None
+    for nombre in nombres:
+        agregat = Agregat()
+        debut = time.perf_counter()
+        total = 0
+        if options.fichiers:
+            resultats = executer_fichiers(options.fichiers, options.algorithmes, nombre)
+        else:
+            resultats = executer_lot(options.tailles, range(options.seeds), options.algorithmes, nombre)
+        for resultat in resultats:
+            agregat.ajouter(resultat)
+            total += 1
+        duree = time.perf_counter() - debut
+        debit = total / duree
+        if debit_seul is None:
+            debit_seul = debit
+        print(f"{nombre} processus : {total} recherches en {duree:.2f} s, "
+              f"{debit:.0f} recherches/s (x{debit / debit_seul:.2f})")
+    agregat.afficher()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""
+rendu.py - Affichage et export des labyrinthes, des explorations et des chemins
+Le texte est construit dans un seul tampon par opérations sur des octets
+(aucune copie de la grille case par case, aucun print par ligne) puis écrit
+en une fois. Pour les très grands labyrinthes, les lignes sont produites et
+écrites par blocs, et la grille peut être réduite (une case affichée pour
+facteur x facteur cases). Les mêmes vues s'exportent en images PPM ou PNG
+(bibliothèque standard seulement : zlib et struct).
+"""
+
+import shutil
+import struct
+import sys
+import zlib
+
+from maze import en_compact
+
+# Marques d'une case dans l'état de rendu : des bits, pour pouvoir combiner
+# plusieurs cases par un OU lors de la réduction. Le bit 0 est la case
+# compacte elle-même (maze.MUR = 1, maze.LIBRE = 0).
+_MUR = 1
+_EXPLOREE = 2
+_CHEMIN = 4
+_DEPART = 8
+_ARRIVEE = 16
+_MARQUES = 0xFE
+
+# Caractère et couleur (R, V, B) de chaque marque, par priorité décroissante
+_PRIORITES = (
+    (_ARRIVEE, 'G', (230, 120, 0)),
+    (_DEPART, 'S', (0, 170, 0)),
+    (_CHEMIN, '*', (220, 0, 0)),
+    (_EXPLOREE, 'p', (140, 180, 255)),
+    (_MUR, '#', (0, 0, 0)),
+)
+_LIBRE = ('.', (255, 255, 255))
+
+
+def _table(choisir):
+    """Table de traduction des 256 états possibles (marque la plus prioritaire)."""
+    table = []
+    for etat in range(256):
+        for bit, caractere, couleur in _PRIORITES:
+            if etat & bit:
+                table.append(choisir(caractere, couleur))
+                break
+        else:
+            table.append(choisir(*_LIBRE))
+    return table
+
+
+_VERS_TEXTE = bytes(ord(caractere) for caractere in _table(lambda caractere, couleur: caractere))
+_VERS_ROUGE, _VERS_VERT, _VERS_BLEU = (
+    bytes(_table(lambda caractere, couleur, canal=canal: couleur[canal])) for canal in range(3))
+
+# Nombre de lignes de la grille traitées par bloc en flux
+LIGNES_PAR_BLOC = 256
+
+
+class Rendu:
+    """
+    État de rendu d'un labyrinthe : une copie des cases compactes (un octet
+    par case) où les cases explorées, le chemin, S et G sont marqués par des
+    bits. Seul le marquage parcourt les cases une par une ; tout le reste
+    (texte, réduction, images) se fait par tranches d'octets.
+
+    Attributs:
+        laby: LabyrintheCompact
+        etat: Marques de chaque case (même disposition que laby.cases)
+        facteur: Côté du bloc de cases réduit à un seul caractère ou pixel
+        lignes, colonnes: Dimensions après réduction
+    """
+
+    def __init__(self, labyrinthe, explores=(), chemin=(), facteur=1):
+        laby = self.laby = en_compact(labyrinthe)
+        largeur = laby.largeur
+        etat = self.etat = bytearray(laby.cases)
+        # Cases explorées et chemin sont des passages (état 0) : une simple
+        # affectation suffit, et le chemin l'emporte sur l'exploration
+        marque = _EXPLOREE
+        for ligne, colonne in explores:
+            etat[(ligne + 1) * largeur + colonne] = marque
+        marque = _CHEMIN
+        for ligne, colonne in chemin:
+            etat[(ligne + 1) * largeur + colonne] = marque
+        if laby.depart is not None:
+            etat[laby.depart] |= _DEPART
+        if laby.arrivee is not None:
+            etat[laby.arrivee] |= _ARRIVEE
+
+        self.facteur = max(1, facteur)
+        self.lignes = -(-laby.lignes // self.facteur)
+        self.colonnes = -(-laby.colonnes // self.facteur)
+
+    def ligne(self, i):
+        """
+        États de la ligne i (après réduction). Un bloc réduit garde toutes
+        ses marques (OU des cases) et prend le mur ou le passage de sa case
+        en haut à gauche.
+        """
+        laby = self.laby
+        f = self.facteur
+        debut = (i * f + 1) * laby.largeur
+        if f == 1:
+            return self.etat[debut:debut + laby.colonnes]
+
+        n = self.colonnes
+        masque_murs = int.from_bytes(bytes([_MUR]) * n, 'big')
+        marques = 0
+        premier = None
+        for dl in range(min(f, laby.lignes - i * f)):
+            base = debut + dl * laby.largeur
+            for dc in range(f):
+                morceau = self.etat[base + dc:base + laby.colonnes:f].ljust(n, b'\0')
+                valeur = int.from_bytes(morceau, 'big')
+                marques |= valeur
+                if premier is None:
+                    premier = valeur
+        combine = (marques & int.from_bytes(bytes([_MARQUES]) * n, 'big')) | (premier & masque_murs)
+        return combine.to_bytes(n, 'big')
+
+    def blocs_texte(self, espaces=True, lignes_par_bloc=LIGNES_PAR_BLOC):
+        """
+        Texte du rendu, par blocs de lignes (chaque bloc se termine par '\\n').
+        Avec espaces, le format est celui d'afficher_labyrinthe.
+        """
+        n = self.colonnes
+        pas = 2 * n if espaces else n + 1
+        for premiere in range(0, self.lignes, lignes_par_bloc):
+            nombre = min(lignes_par_bloc, self.lignes - premiere)
+            if self.facteur == 1:
+                # Les lignes sont déjà contiguës : la colonne sentinelle
+                # devient le saut de ligne, retiré ensuite si besoin
+                largeur = self.laby.largeur
+                debut = (premiere + 1) * largeur
+                lignes = self.etat[debut:debut + nombre * largeur].translate(_VERS_TEXTE)
+                lignes[n::largeur] = b'\n' * nombre
+            else:
+                lignes = b'\n'.join(self.ligne(i).translate(_VERS_TEXTE)
+                                    for i in range(premiere, premiere + nombre)) + b'\n'
+            if espaces:
+                cases = lignes.replace(b'\n', b'')
+                texte = bytearray(b' ') * (pas * nombre)
+                texte[0::2] = cases
+                texte[pas - 1::pas] = b'\n' * nombre
+            else:
+                texte = lignes
+            yield texte.decode('ascii')
+
+    def texte(self, espaces=True):
+        """Tout le rendu en une seule chaîne."""
+        return ''.join(self.blocs_texte(espaces, lignes_par_bloc=max(self.lignes, 1)))
+
+    def ecrire(self, fichier=None, espaces=True, lignes_par_bloc=LIGNES_PAR_BLOC):
+        """Écrit le rendu bloc par bloc (sys.stdout par défaut)."""
+        fichier = sys.stdout if fichier is None else fichier
+        for bloc in self.blocs_texte(espaces, lignes_par_bloc):
+            fichier.write(bloc)
+
+    def _lignes_rgb(self, echelle):
+        """Pixels RGB de chaque ligne d'image (chaque case fait echelle x echelle pixels)."""
+        for i in range(self.lignes):
+            etats = self.ligne(i)
+            if echelle > 1:
+                agrandie = bytearray(len(etats) * echelle)
+                for k in range(echelle):
+                    agrandie[k::echelle] = etats
+                etats = agrandie
+            rgb = bytearray(3 * len(etats))
+            rgb[0::3] = etats.translate(_VERS_ROUGE)
+            rgb[1::3] = etats.translate(_VERS_VERT)
+            rgb[2::3] = etats.translate(_VERS_BLEU)
+            for _ in range(echelle):
+                yield rgb
+
+    def exporter_ppm(self, chemin, echelle=1):
+        """Image PPM binaire (P6), écrite ligne par ligne."""
+        with open(chemin, 'wb') as fichier:
+            fichier.write(f"P6\n{self.colonnes * echelle} {self.lignes * echelle}\n255\n".encode('ascii'))
+            for rgb in self._lignes_rgb(echelle):
+                fichier.write(rgb)
+
+    def exporter_png(self, chemin, echelle=1, niveau=6):
+        """Image PNG (RGB 8 bits), compressée en flux : une ligne à la fois en mémoire."""
+        def morceau(fichier, type_morceau, donnees):
+            fichier.write(struct.pack('>I', len(donnees)))
+            fichier.write(type_morceau)
+            fichier.write(donnees)
+            fichier.write(struct.pack('>I', zlib.crc32(donnees, zlib.crc32(type_morceau))))
+
+        compresseur = zlib.compressobj(niveau)
+        with open(chemin, 'wb') as fichier:
+            fichier.write(b'\x89PNG\r\n\x1a\n')
+            morceau(fichier, b'IHDR', struct.pack('>IIBBBBB', self.colonnes * echelle,
+                                                  self.lignes * echelle, 8, 2, 0, 0, 0))
+            for rgb in self._lignes_rgb(echelle):
+                compresse = compresseur.compress(b'\0' + rgb)  # filtre 0 : aucun
+                if compresse:
+                    morceau(fichier, b'IDAT', compresse)
+            morceau(fichier, b'IDAT', compresseur.flush())
+            morceau(fichier, b'IEND', b'')
+
+
+def facteur_terminal(labyrinthe, espaces=True):
+    """Plus petit facteur de réduction pour que le rendu tienne dans la largeur du terminal."""
+    laby = en_compact(labyrinthe)
+    colonnes = shutil.get_terminal_size().columns
+    par_case = 2 if espaces else 1
+    return max(1, -(-laby.colonnes * par_case // colonnes))
+
+
+def exporter_image(labyrinthe, chemin_image, explores=(), chemin=(), facteur=1, echelle=1):
+    """
+    Exporte le labyrinthe (et ses marques) en image ; le format suit
+    l'extension : .png ou .ppm.
+
+    Args:
+        facteur: Réduction (une case de l'image pour facteur x facteur cases)
+        echelle: Agrandissement (echelle x echelle pixels par case de l'image)
+    """
+    rendu = Rendu(labyrinthe, explores, chemin, facteur)
+    if chemin_image.lower().endswith('.png'):
+        rendu.exporter_png(chemin_image, echelle)
+    elif chemin_image.lower().endswith('.ppm'):
+        rendu.exporter_ppm(chemin_image, echelle)
+    else:
+        raise ValueError(f"Format d'image inconnu : {chemin_image!r} (choix : .png, .ppm)")
+
+
+def afficher_exploration(labyrinthe, explores, facteur=1):
+    """Affiche le labyrinthe avec les cases explorées marquées 'p'."""
+    Rendu(labyrinthe, explores=explores, facteur=facteur).ecrire()
+
+
+def afficher_solution(labyrinthe, chemin, facteur=1):
+    """Affiche le labyrinthe avec le chemin solution marqué '*'."""
+    Rendu(labyrinthe, chemin=chemin, facteur=facteur).ecrire()
+
+
+def afficher_chemin(chemin):
+    """Affiche le chemin sous forme de coordonnées."""
+    parties = []
+    for i, (ligne, colonne) in enumerate(chemin):
+        if i == 0:
+            parties.append(f"S ({ligne},{colonne})")
+        elif i == len(chemin) - 1:
+            parties.append(f"G ({ligne},{colonne})")
+        else:
+            parties.append(f"({ligne},{colonne})")
+    print("Chemin : " + " -> ".join(parties))
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    import io
+    import os
+    import tempfile
+    import time
+
+    from maze import generer_labyrinthe
+    from bfs import bfs
+
+    laby = generer_labyrinthe(taille=16, seed=42)
+    resultat = bfs(laby)
+    afficher_exploration(laby, resultat['explores'])
+    print()
+    afficher_solution(laby, resultat['chemin'])
+
+    print(f"\n{'Taille':>6} {'Recherche (ms)':>15} {'Texte (ms)':>11} {'Réduit x8 (ms)':>15} {'PNG (ms)':>9}")
+    for taille in (256, 1024):
+        laby = generer_labyrinthe(taille=taille, seed=42)
+        resultat = bfs(laby)
+        debut = time.perf_counter()
+        Rendu(laby, resultat['explores'], resultat['chemin']).ecrire(io.StringIO())
+        texte = (time.perf_counter() - debut) * 1000
+        debut = time.perf_counter()
+        Rendu(laby, resultat['explores'], resultat['chemin'], facteur=8).ecrire(io.StringIO())
+        reduit = (time.perf_counter() - debut) * 1000
+        debut = time.perf_counter()
+        exporter_image(laby, os.path.join(tempfile.gettempdir(), f'labyrinthe_{taille}.png'), resultat['explores'], resultat['chemin'])
+        png = (time.perf_counter() - debut) * 1000
+        print(f"{taille:>6} {resultat['temps']:>15.1f} {texte:>11.1f} {reduit:>15.1f} {png:>9.1f}")
@@ -0,0 +1,150 @@
+"""
+reperes.py - Heuristique ALT (A*, Landmarks, inégalité Triangulaire)
+Dans un labyrinthe, la vraie distance est souvent dix fois la distance de
+Manhattan : A* explore alors presque autant que BFS. On choisit quelques
+cases repères, on calcule une fois leur distance à toutes les cases, et
+l'inégalité triangulaire donne une borne inférieure bien plus serrée.
+"""
+
+from collections import deque
+
+from maze import en_compact
+
+# Nombre de repères par défaut
+NB_REPERES = 8
+
+
+class Reperes:
+    """
+    Repères d'un labyrinthe et leurs tables de distances.
+
+    Pour un repère L, une case n et l'arrivée G, l'inégalité triangulaire
+    donne d(n, G) >= |d(L, G) - d(L, n)|. L'heuristique ALT prend le
+    maximum de ces bornes sur tous les repères : elle reste admissible et
+    cohérente, donc A* rend toujours un plus court chemin.
+
+    Les repères sont choisis « le plus loin possible » : le premier est la
+    case la plus éloignée de S, chaque suivant la case la plus éloignée de
+    tous les repères déjà choisis. Chaque table est un tableau d'entiers
+    (4 octets par case, -1 = case non atteinte).
+
+    Attributs:
+        laby: LabyrintheCompact
+        reperes: Indices plats des repères
+        distances: Une table de distances par repère
+    """
+
+    def __init__(self, labyrinthe, nombre=NB_REPERES):
+        self.laby = en_compact(labyrinthe)
+        self.reperes = []
+        self.distances = []
+
+        # Distance au repère le plus proche, pour choisir le suivant
+        plus_proche = self._distances_depuis(self.laby.depart)
+        for _ in range(nombre):
+            repere = max(range(len(plus_proche)), key=plus_proche.__getitem__)
+            if plus_proche[repere] <= 0:
+                break  # toutes les cases atteignables sont déjà des repères
+            table = self._distances_depuis(repere)
+            self.reperes.append(repere)
+            self.distances.append(table)
+            for case, distance in enumerate(table):
+                if 0 <= distance < plus_proche[case]:
+                    plus_proche[case] = distance
+
+    def _distances_depuis(self, source):
+        """BFS complet depuis source : distance de chaque case (-1 si non atteinte)."""
+        laby = self.laby
+        distances = laby.tableau_indices(-1)
+        distances[source] = 0
+        visites = bytearray(laby.cases)  # les murs comptent déjà comme visités
+        visites[source] = 1
+
+        file = deque([source])
+        enfiler = file.append
+        defiler = file.popleft
+        deltas = laby.deltas
+        while file:
+            position = defiler()
+            suivante = distances[position] + 1
+            for delta in deltas:
+                voisin = position + delta
+                if not visites[voisin]:
+                    visites[voisin] = 1
+                    distances[voisin] = suivante
+                    enfiler(voisin)
+        return distances
+
+    def heuristique(self, cible):
+        """
+        Heuristique ALT vers cible (indice plat) : une fonction indice -> borne.
+
+        Seuls les repères qui atteignent la cible servent ; une case qu'un
+        tel repère n'atteint pas n'est pas reliée à la cible (borne 0).
+        """
+        bornes = [(table[cible], table) for table in self.distances if table[cible] >= 0]
+
+        def h(indice):
+            meilleure = 0
+            for distance_cible, table in bornes:
+                distance = table[indice]
+                if distance >= 0:
+                    ecart = distance_cible - distance
+                    if ecart < 0:
+                        ecart = -ecart
+                    if ecart > meilleure:
+                        meilleure = ecart
+            return meilleure
+
+        return h
+
+
+def reperes_du_labyrinthe(labyrinthe, nombre=NB_REPERES):
+    """
+    Repères du labyrinthe. Pour un Labyrinthe, ils sont calculés une seule
+    fois et gardés en cache avec les autres données dérivées.
+    """
+    if hasattr(labyrinthe, 'en_cache'):
+        return labyrinthe.en_cache(('reperes', nombre), lambda laby: Reperes(laby, nombre))
+    return Reperes(labyrinthe, nombre)
+
+
+def heuristique_alt(labyrinthe, nombre=NB_REPERES):
+    """
+    Heuristique ALT à donner à astar(labyrinthe, heuristique=...) :
+    une fabrique laby -> (indice -> borne vers laby.arrivee).
+    """
+    reperes = reperes_du_labyrinthe(labyrinthe, nombre)
+    return lambda laby: reperes.heuristique(laby.arrivee)
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    import random
+    import time
+
+    from maze import generer_labyrinthe
+    from astar import astar
+
+    def ouvrir(laby, proportion, seed):
+        # Enlève une proportion des murs intérieurs (labyrinthe « tressé »)
+        rng = random.Random(seed)
+        for i in range(1, len(laby) - 1):
+            for j in range(1, len(laby) - 1):
+                if laby[i][j] == '#' and rng.random() < proportion:
+                    laby[i][j] = '.'
+        laby.invalider_caches()
+        return laby
+
+    print(f"{'Labyrinthe':<22} {'Préparation (ms)':>16} {'Manhattan':>10} {'ALT':>10} {'Réduction':>10}")
+    for taille in (256, 1024):
+        for nom, proportion in (('parfait', 0), ('tressé 10 %', 0.1)):
+            laby = ouvrir(generer_labyrinthe(taille=taille, seed=42), proportion, 42)
+            debut = time.perf_counter()
+            reperes_du_labyrinthe(laby)
+            preparation = (time.perf_counter() - debut) * 1000
+            manhattan = astar(laby)
+            alt = astar(laby, heuristique='alt')
+            assert alt['longueur'] == manhattan['longueur']
+            print(f"{f'{nom} {taille}x{taille}':<22} {preparation:>16.0f} {manhattan['noeuds_explores']:>10} "
+                  f"{alt['noeuds_explores']:>10} {manhattan['noeuds_explores'] / alt['noeuds_explores']:>9.1f}x")
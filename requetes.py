@@ -0,0 +1,170 @@
+"""
+requetes.py - Résolution de nombreuses requêtes (départ, arrivée) sur un même labyrinthe
+Pour chaque départ, on calcule une seule fois l'arbre des prédécesseurs d'un
+BFS complet. Toutes les requêtes qui partent de la même case (ou y arrivent,
+le labyrinthe n'étant pas orienté) sont ensuite résolues en remontant
+l'arbre, en O(longueur du chemin).
+"""
+
+from collections import OrderedDict, deque
+
+from maze import en_compact
+
+# Budget mémoire par défaut pour les arbres gardés en cache (en octets)
+BUDGET_PAR_DEFAUT = 256 * 1024 * 1024
+
+
+class SolveurRequetes:
+    """
+    Solveur multi-requêtes avec cache LRU d'arbres de plus courts chemins.
+
+    Un arbre coûte un entier par case (4 octets, voir
+    LabyrintheCompact.tableau_indices). Quand la somme des arbres dépasse
+    budget_octets, les arbres les moins récemment utilisés sont oubliés
+    (le plus récent est toujours gardé).
+
+    Exemple :
+        solveur = SolveurRequetes(laby)
+        chemins = solveur.resoudre([((1, 1), (14, 14)), ((1, 1), (5, 7))])
+    """
+
+    def __init__(self, labyrinthe, budget_octets=BUDGET_PAR_DEFAUT):
+        self.laby = en_compact(labyrinthe)
+        self.budget_octets = budget_octets
+        self.memoire_utilisee = 0
+        self.succes_cache = 0
+        self.echecs_cache = 0
+        self._arbres = OrderedDict()  # indice de la source -> parents
+
+    def _construire_arbre(self, source):
+        """BFS complet depuis source : parent de chaque case (-1 si non atteinte)."""
+        laby = self.laby
+        parents = laby.tableau_indices(-1)  # -1 = case non atteinte
+        parents[source] = source
+        visites = bytearray(laby.cases)  # les murs comptent déjà comme visités
+        visites[source] = 1
+
+        file = deque([source])
+        enfiler = file.append
+        defiler = file.popleft
+        deltas = laby.deltas
+        while file:
+            position = defiler()
+            for delta in deltas:
+                voisin = position + delta
+                if not visites[voisin]:
+                    visites[voisin] = 1
+                    parents[voisin] = position
+                    enfiler(voisin)
+        return parents
+
+    def arbre(self, source):
+        """
+        Arbre des prédécesseurs depuis source (indice plat), construit au
+        besoin puis gardé en cache.
+        """
+        parents = self._arbres.get(source)
+        if parents is not None:
+            self.succes_cache += 1
+            self._arbres.move_to_end(source)
+            return parents
+
+        self.echecs_cache += 1
+        parents = self._construire_arbre(source)
+        self._arbres[source] = parents
+        self.memoire_utilisee += parents.itemsize * len(parents)
+
+        # Éviction LRU sous le budget mémoire
+        while self.memoire_utilisee > self.budget_octets and len(self._arbres) > 1:
+            _, ancien = self._arbres.popitem(last=False)
+            self.memoire_utilisee -= ancien.itemsize * len(ancien)
+        return parents
+
+    def _remonter(self, parents, source, cible):
+        """Indices de cible jusqu'à source en suivant l'arbre (None si non atteinte)."""
+        if parents[cible] < 0:
+            return None
+        indices = [cible]
+        position = cible
+        while position != source:
+            position = parents[position]
+            indices.append(position)
+        return indices
+
+    def chemin(self, depart, arrivee):
+        """
+        Plus court chemin entre deux cases.
+
+        Args:
+            depart, arrivee: Positions (ligne, colonne)
+
+        Returns:
+            La liste des coordonnées de depart à arrivee, ou None s'il n'y a
+            pas de chemin (ou si une des cases est un mur)
+
+        Raises:
+            ValueError: si une des positions est hors du labyrinthe
+        """
+        laby = self.laby
+        source = laby.indice_verifie(*depart)
+        cible = laby.indice_verifie(*arrivee)
+        if laby.cases[source] or laby.cases[cible]:
+            return None
+
+        # Un arbre déjà calculé depuis l'arrivée sert aussi (chemin inversé)
+        if source not in self._arbres and cible in self._arbres:
+            indices = self._remonter(self.arbre(cible), cible, source)
+        else:
+            indices = self._remonter(self.arbre(source), source, cible)
+            if indices is not None:
+                indices.reverse()
+
+        if indices is None:
+            return None
+        return [laby.coordonnees(indice) for indice in indices]
+
+    def resoudre(self, requetes):
+        """
+        Résout un lot de requêtes (depart, arrivee).
+
+        Les requêtes sont regroupées par départ pour construire chaque arbre
+        une seule fois, puis les chemins sont rendus dans l'ordre du lot.
+
+        Returns:
+            La liste des chemins (ou None), dans le même ordre que requetes
+        """
+        requetes = list(requetes)
+        ordre = sorted(range(len(requetes)), key=lambda i: requetes[i][0])
+        chemins = [None] * len(requetes)
+        for i in ordre:
+            depart, arrivee = requetes[i]
+            chemins[i] = self.chemin(depart, arrivee)
+        return chemins
+
+
+# --- Test rapide ---
+if __name__ == '__main__':
+    import random
+    import time
+
+    from maze import generer_labyrinthe
+    from bfs import bfs
+
+    laby = generer_labyrinthe(taille=256, seed=42)
+    compact = en_compact(laby)
+    libres = [compact.coordonnees(i) for i in range(len(compact.cases)) if not compact.cases[i]]
+    rng = random.Random(0)
+    departs = rng.sample(libres, 10)
+    requetes = [(rng.choice(departs), rng.choice(libres)) for _ in range(1000)]
+
+    solveur = SolveurRequetes(laby)
+    debut = time.perf_counter()
+    chemins = solveur.resoudre(requetes)
+    duree = (time.perf_counter() - debut) * 1000
+    print(f"{len(requetes)} requêtes en {duree:.1f} ms "
+          f"({solveur.echecs_cache} arbres construits, {solveur.succes_cache} réutilisés, "
+          f"{solveur.memoire_utilisee / 1024:.0f} Kio en cache)")
+
+    # Vérification : même longueur que bfs() pour la requête S -> G
+    chemin = solveur.chemin(laby.depart, laby.arrivee)
+    print(f"S -> G : longueur {len(chemin)} (bfs : {bfs(laby)['longueur']})")
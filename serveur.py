@@ -0,0 +1,343 @@
+"""
+serveur.py - Service local de génération et de résolution (asyncio, JSON lines)
+Les services qui ont besoin d'un chemin envoient une requête par ligne JSON
+au lieu d'importer les solveurs et de régénérer eux-mêmes les labyrinthes.
+Le calcul se fait dans un pool de processus ; deux requêtes identiques en
+cours n'en font qu'un (la seconde attend le résultat de la première), et les
+labyrinthes et résultats récents restent dans des caches LRU indexés par
+l'empreinte du contenu du labyrinthe.
+
+Requêtes (une par ligne, réponse sur une ligne avec le même 'id') :
+    {"id": 1, "op": "generer", "taille": 64, "seed": 3}
+    {"id": 2, "op": "resoudre", "taille": 64, "seed": 3, "algorithme": "astar"}
+    {"id": 3, "op": "resoudre", "grille": ["#####", "#S.G#", "#####"], "algorithme": "bfs",
+     "chemin": true}
+    {"id": 4, "op": "stats"}
+Réponses : {"id": ..., "ok": true, ...} ou {"id": ..., "ok": false, "erreur": "..."}
+
+Exemple :
+    python serveur.py --port 8765 --processus 4
+    python serveur.py --socket /tmp/labyrinthes.sock
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from maze import generer_labyrinthe, en_compact
+
+PORT = 8765
+TAILLE_CACHE_LABYRINTHES = 64
+TAILLE_CACHE_RESULTATS = 4096
+# Longueur maximale d'une ligne de requête (une grille envoyée y tient)
+LIGNE_MAX = 64 * 1024 * 1024
+# Taille maximale des labyrinthes générés à la demande
+TAILLE_MAX = 8192
+
+
+class CacheLRU:
+    """Dictionnaire borné en nombre d'entrées : la moins récemment utilisée sort la première."""
+
+    def __init__(self, capacite):
+        self.capacite = capacite
+        self.succes = 0
+        self.echecs = 0
+        self._entrees = OrderedDict()
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def get(self, cle):
+        try:
+            valeur = self._entrees[cle]
+        except KeyError:
+            self.echecs += 1
+            return None
+        self._entrees.move_to_end(cle)
+        self.succes += 1
+        return valeur
+
+    def put(self, cle, valeur):
+        self._entrees[cle] = valeur
+        self._entrees.move_to_end(cle)
+        while len(self._entrees) > self.capacite:
+            self._entrees.popitem(last=False)
+
+
+# --- Travail exécuté dans les processus du pool ---
+
+@functools.lru_cache(maxsize=16)
+def _labyrinthe(taille, seed, grille):
+    """Labyrinthe d'un processus, gardé pour les requêtes suivantes (autres algorithmes)."""
+    if grille is not None:
+        return en_compact([list(ligne) for ligne in grille])
+    return generer_labyrinthe(taille=taille, seed=seed)
+
+
+def travail_generer(taille, seed):
+    """Génère un labyrinthe : (empreinte, lignes de texte)."""
+    laby = _labyrinthe(taille, seed, None)
+    return laby.empreinte(), [''.join(ligne) for ligne in laby]
+
+
+def travail_resoudre(taille, seed, grille, algorithme, avec_chemin):
+    """
+    Résout un labyrinthe donné par (taille, seed) ou par sa grille (tuple
+    de lignes). Ne renvoie que des nombres (et le chemin si demandé) :
+    l'ensemble des cases explorées ne traverse pas les processus.
+    """
+    from banc_essai import ALGORITHMES  # import tardif, comme dans parallele.py
+
+    laby = _labyrinthe(taille, seed, grille)
+    if laby.depart is None or laby.arrivee is None:
+        raise ValueError("la grille doit contenir S et G")
+    resultat = ALGORITHMES[algorithme][0](laby)
+    reponse = {
+        'trouve': resultat is not None,
+        'noeuds_explores': resultat['noeuds_explores'] if resultat else None,
+        'longueur': resultat['longueur'] if resultat else None,
+        'temps': resultat['temps'] if resultat else None,
+    }
+    if avec_chemin and resultat:
+        reponse['chemin'] = resultat['chemin']
+    return laby.empreinte(), reponse
+
+
+# --- Serveur ---
+
+class ServiceLabyrinthes:
+    """
+    État du service : pool de processus, caches et requêtes en cours.
+
+    Les caches sont indexés par l'empreinte du labyrinthe (SHA-256 du
+    contenu) : un même labyrinthe envoyé par (taille, seed) puis par sa
+    grille ne se résout qu'une fois. Un petit cache d'alias retient
+    l'empreinte de chaque (taille, seed) et de chaque grille déjà vue.
+
+    Attributs:
+        labyrinthes: empreinte -> lignes de texte
+        resultats: (empreinte, algorithme, avec chemin) -> réponse
+        alias: ('seed', taille, seed) ou ('grille', sha256 du texte) -> empreinte
+        en_cours: clé de calcul -> Future partagée par les requêtes identiques
+    """
+
+    def __init__(self, processus=None, taille_cache_labyrinthes=TAILLE_CACHE_LABYRINTHES,
+                 taille_cache_resultats=TAILLE_CACHE_RESULTATS):
+        self.executeur = ProcessPoolExecutor(max_workers=processus)
+        self.labyrinthes = CacheLRU(taille_cache_labyrinthes)
+        self.resultats = CacheLRU(taille_cache_resultats)
+        self.alias = CacheLRU(taille_cache_resultats)
+        self.en_cours = {}
+        self.requetes = 0
+        self.calculs = 0
+        self.fusionnees = 0
+
+    def fermer(self):
+        self.executeur.shutdown(cancel_futures=True)
+
+    async def _calculer(self, cle, fonction, *arguments):
+        """
+        Lance fonction dans le pool, sauf si le même calcul est déjà en cours.
+
+        Tous les demandeurs, le premier compris, attendent le Future partagé
+        à travers asyncio.shield : l'annulation de l'un d'eux (client
+        déconnecté) ne l'annule pas pour les autres. Le calcul quitte
+        en_cours à sa fin, quel que soit le demandeur encore là.
+        """
+        futur = self.en_cours.get(cle)
+        if futur is not None:
+            self.fusionnees += 1
+            return await asyncio.shield(futur)
+        boucle = asyncio.get_running_loop()
+        futur = boucle.run_in_executor(self.executeur, fonction, *arguments)
+        self.en_cours[cle] = futur
+        self.calculs += 1
+
+        def terminer(fini):
+            if self.en_cours.get(cle) is fini:
+                del self.en_cours[cle]
+            if not fini.cancelled():
+                fini.exception()  # erreur déjà rendue aux demandeurs : pas d'avertissement si tous sont partis
+
+        futur.add_done_callback(terminer)
+        return await asyncio.shield(futur)
+
+    async def generer(self, requete):
+        taille, seed = _entier(requete, 'taille'), _entier(requete, 'seed')
+        if not 5 <= taille <= TAILLE_MAX:
+            raise ValueError(f"taille hors limites (5 à {TAILLE_MAX})")
+        alias = ('seed', taille, seed)
+        empreinte = self.alias.get(alias)
+        lignes = self.labyrinthes.get(empreinte) if empreinte else None
+        if lignes is None:
+            empreinte, lignes = await self._calculer(alias, travail_generer, taille, seed)
+            self.alias.put(alias, empreinte)
+            self.labyrinthes.put(empreinte, lignes)
+        return {'empreinte': empreinte, 'grille': lignes}
+
+    async def resoudre(self, requete):
+        from banc_essai import ALGORITHMES
+
+        algorithme = requete.get('algorithme', 'bfs')
+        if algorithme not in ALGORITHMES:
+            raise ValueError(f"algorithme inconnu : {algorithme!r} (choix : {', '.join(ALGORITHMES)})")
+        avec_chemin = bool(requete.get('chemin', False))
+
+        if 'grille' in requete:
+            grille = _grille(requete)
+            taille = seed = None
+            texte = '\n'.join(grille).encode('utf-8')
+            alias = ('grille', hashlib.sha256(texte).hexdigest())
+        else:
+            taille, seed = _entier(requete, 'taille'), _entier(requete, 'seed')
+            if not 5 <= taille <= TAILLE_MAX:
+                raise ValueError(f"taille hors limites (5 à {TAILLE_MAX})")
+            grille = None
+            alias = ('seed', taille, seed)
+
+        empreinte = self.alias.get(alias)
+        if empreinte is None:
+            self.resultats.echecs += 1  # labyrinthe jamais vu : résultat absent aussi
+        else:
+            reponse = self.resultats.get((empreinte, algorithme, avec_chemin))
+            if reponse is not None:
+                return dict(reponse, empreinte=empreinte, cache=True)
+
+        empreinte, reponse = await self._calculer(
+            (alias, algorithme, avec_chemin), travail_resoudre, taille, seed, grille, algorithme, avec_chemin)
+        self.alias.put(alias, empreinte)
+        self.resultats.put((empreinte, algorithme, avec_chemin), reponse)
+        return dict(reponse, empreinte=empreinte, cache=False)
+
+    def stats(self):
+        return {
+            'requetes': self.requetes,
+            'calculs': self.calculs,
+            'fusionnees': self.fusionnees,
+            'en_cours': len(self.en_cours),
+            'cache_labyrinthes': {'entrees': len(self.labyrinthes), 'succes': self.labyrinthes.succes,
+                                  'echecs': self.labyrinthes.echecs},
+            'cache_resultats': {'entrees': len(self.resultats), 'succes': self.resultats.succes,
+                                'echecs': self.resultats.echecs},
+        }
+
+    async def traiter(self, ligne):
+        """Traite une ligne de requête et retourne la réponse (dictionnaire)."""
+        self.requetes += 1
+        identifiant = None
+        try:
+            requete = json.loads(ligne)
+            if not isinstance(requete, dict):
+                raise ValueError("la requête doit être un objet JSON")
+            identifiant = requete.get('id')
+            operations = {'generer': self.generer, 'resoudre': self.resoudre}
+            op = requete.get('op')
+            if op == 'stats':
+                reponse = self.stats()
+            elif op in operations:
+                reponse = await operations[op](requete)
+            else:
+                raise ValueError(f"opération inconnue : {op!r} (choix : generer, resoudre, stats)")
+        except Exception as erreur:  # une requête invalide ne doit pas arrêter le service
+            return {'id': identifiant, 'ok': False, 'erreur': f"{type(erreur).__name__}: {erreur}"}
+        return dict(reponse, id=identifiant, ok=True)
+
+    async def connexion(self, lecteur, ecrivain):
+        """
+        Une connexion : chaque ligne est traitée dans sa propre tâche, et les
+        réponses partent dans l'ordre où elles sont prêtes (suivre 'id').
+        """
+        taches = set()
+
+        async def repondre(ligne):
+            reponse = await self.traiter(ligne)
+            ecrivain.write(json.dumps(reponse, ensure_ascii=False).encode('utf-8') + b'\n')
+            await ecrivain.drain()
+
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                if ligne.strip():
+                    tache = asyncio.create_task(repondre(ligne))
+                    taches.add(tache)
+                    tache.add_done_callback(taches.discard)
+            if taches:
+                await asyncio.gather(*taches, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # client parti, ou ligne trop longue : on ferme la connexion
+        finally:
+            ecrivain.close()
+
+
+def _entier(requete, champ):
+    valeur = requete.get(champ)
+    if not isinstance(valeur, int) or isinstance(valeur, bool):
+        raise ValueError(f"'{champ}' doit être un entier")
+    return valeur
+
+
+def _grille(requete):
+    """Grille envoyée : lignes de même longueur en '#.SG', un seul S et un seul G."""
+    grille = requete['grille']
+    if not isinstance(grille, list) or not all(isinstance(ligne, str) for ligne in grille):
+        raise ValueError("'grille' doit être une liste de chaînes")
+    if len({len(ligne) for ligne in grille}) > 1:
+        raise ValueError("'grille' : toutes les lignes doivent avoir la même longueur")
+    texte = ''.join(grille)
+    if not set(texte) <= set('#.SG'):
+        raise ValueError("'grille' : seuls les caractères '#', '.', 'S' et 'G' sont permis")
+    if texte.count('S') != 1 or texte.count('G') != 1:
+        raise ValueError("'grille' doit contenir exactement un S et un G")
+    return tuple(grille)
+
+
+async def servir(hote='127.0.0.1', port=PORT, socket_unix=None, processus=None, pret=None):
+    """
+    Lance le service jusqu'à annulation.
+
+    Args:
+        hote, port: Adresse TCP (ignorée si socket_unix est donné)
+        socket_unix: Chemin d'un socket Unix
+        processus: Taille du pool (None = nombre de coeurs)
+        pret: asyncio.Event signalé quand le serveur écoute
+    """
+    service = ServiceLabyrinthes(processus)
+    if socket_unix:
+        serveur = await asyncio.start_unix_server(service.connexion, socket_unix, limit=LIGNE_MAX)
+    else:
+        serveur = await asyncio.start_server(service.connexion, hote, port, limit=LIGNE_MAX)
+    try:
+        async with serveur:
+            if pret is not None:
+                pret.set()
+            await serveur.serve_forever()
+    finally:
+        service.fermer()
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Service local de génération et de résolution de labyrinthes")
+    parseur.add_argument('--hote', default='127.0.0.1')
+    parseur.add_argument('--port', type=int, default=PORT)
+    parseur.add_argument('--socket', help="écouter sur ce socket Unix plutôt qu'en TCP")
+    parseur.add_argument('--processus', type=int, default=os.cpu_count(), help="taille du pool de processus")
+    options = parseur.parse_args(arguments)
+
+    adresse = options.socket or f"{options.hote}:{options.port}"
+    print(f"Service en écoute sur {adresse} ({options.processus} processus)", file=sys.stderr)
+    try:
+        asyncio.run(servir(options.hote, options.port, options.socket, options.processus))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()